@@ -38,6 +38,10 @@ HOST = Config.HOST
 PSW = Config.PSW
 REGION = Config.REGION
 PORT = Config.PORT
+# Lavalink 노드 풀. 없으면 HOST/PORT/PSW/REGION 단일 노드
+LAVALINK_NODES = getattr(Config, "LAVALINK_NODES", None) or [
+    {"host": HOST, "port": PORT, "password": PSW, "region": REGION, "name": "default-node"}
+]
 MESSAGE_CONTENT_INTENT = Config.MESSAGE_CONTENT_INTENT
 
 KOREANBOT_TOKEN = Config.KOREANBOT_TOKEN
@@ -23,8 +23,27 @@ from tapi import (
     KOREANBOT_TOKEN,
     MESSAGE_CONTENT_INTENT,
 )
+from tapi.utils.database import AsyncDatabase
 from tapi.utils.redis_manager import redis_manager
+from tapi.utils.settings_store import settings_store
 from tapi.utils.stats_updater import BotStatsUpdater
+from tapi.utils.panel_scheduler import panel_scheduler
+from tapi.utils.loop_monitor import loop_monitor
+from tapi.utils.metrics import (
+    metrics_registry,
+    SLASH_COMMANDS,
+    SLASH_COMMAND_SECONDS,
+    SHARD_GUILDS,
+    SHARD_PLAYERS,
+    SHARD_LATENCY_SECONDS,
+)
+from tapi.utils.player_registry import player_registry
+from tapi.utils.node_pool import node_pool
+from tapi.utils.player_migration import player_migrator
+from tapi.utils.player_state_stream import player_state_stream
+from tapi.utils.track_cache import track_cache
+from tapi.utils.command_stream import command_stream
+from tapi.utils.track_resolver import resolve_in_order
 from tapi.utils.embed import get_track_thumbnail
 from tapi.modules.audio_connection import AudioConnection
 from discord import ui
@@ -61,12 +80,21 @@ class TapiBot(commands.Bot):
         self.stats_updater = None  # 봇 통계 업데이터
 
     async def setup_hook(self):
+        # 이벤트 루프 지연 / 느린 콜백 모니터
+        loop_monitor.start(self.loop)
+
+        # Prometheus /metrics 엔드포인트
+        await metrics_registry.start()
+
         # Cog 로드
         for extension in EXTENSIONS:
             await self.load_extension(f"tapi.modules.{extension}")
 
         # 전역 인터랙션 체크 등록 (봇 전용 채널 제한)
         self.tree.interaction_check = self._global_interaction_check
+        # 슬래시 명령 실패도 지연/결과 지표에 기록 (기본 에러 처리는 그대로)
+        self._default_tree_on_error = self.tree.on_error
+        self.tree.on_error = self._on_app_command_error
 
         # shard 0일 때만 슬래시 동기화
         if getattr(self, "shard_id", None) == 0 or not hasattr(self, "shard_id"):
@@ -77,6 +105,8 @@ class TapiBot(commands.Bot):
 
     async def _global_interaction_check(self, interaction: discord.Interaction) -> bool:
         """전역 인터랙션 체크: 봇 전용 채널이 설정된 경우 해당 채널에서만 명령어 허용"""
+        interaction.extras["started_at"] = time.perf_counter()
+
         # DM은 그대로 허용
         if interaction.guild is None:
             return True
@@ -86,9 +116,7 @@ class TapiBot(commands.Bot):
             return True
 
         # DB에서 봇 전용 채널 조회
-        from tapi.utils.database import Database
-
-        bot_channel_id = Database().get_channel(interaction.guild.id)
+        bot_channel_id = await AsyncDatabase().get_channel(interaction.guild.id)
 
         if bot_channel_id and interaction.channel_id != bot_channel_id:
             bot_channel = interaction.guild.get_channel(bot_channel_id)
@@ -103,14 +131,33 @@ class TapiBot(commands.Bot):
                 ),
                 ephemeral=True,
             )
+            self._observe_slash_command(interaction, "restricted")
             return False
 
         return True
 
+    def _observe_slash_command(self, interaction: discord.Interaction, outcome: str):
+        command = (
+            interaction.command.qualified_name if interaction.command else "unknown"
+        )
+        SLASH_COMMANDS.inc(command=command, outcome=outcome)
+        started = interaction.extras.get("started_at")
+        if started is not None and outcome != "restricted":
+            SLASH_COMMAND_SECONDS.observe(
+                time.perf_counter() - started, command=command
+            )
+
+    async def on_app_command_completion(self, interaction, command):
+        self._observe_slash_command(interaction, "ok")
+
+    async def _on_app_command_error(self, interaction, error):
+        self._observe_slash_command(interaction, "error")
+        await self._default_tree_on_error(interaction, error)
+
     async def on_ready(self):
         if self.lavalink is None:
             self.lavalink = lavalink.Client(self.user.id)
-            self.lavalink.add_node(HOST, PORT, PSW, "eu", "default-node")
+            node_pool.register(self.lavalink)
             LOGGER.info("Lavalink client initialized")
 
         # 통계 업데이터 초기화 (config의 CLIENT_ID 사용)
@@ -141,9 +188,23 @@ class TapiBot(commands.Bot):
         )
 
         # Redis 연결 및 샤드 정보 업데이트
-        redis_manager.connect()
+        await redis_manager.connect()
         await self.update_shard_status()
 
+        # 담당 길드 설정 일괄 로드 (인터랙션 경로에서 DB 조회 제거)
+        if not settings_store.preloaded:
+            if await AsyncDatabase().preload_guild_settings(g.id for g in self.guilds):
+                settings_store.preloaded = True
+                LOGGER.info(
+                    f"Preloaded guild settings for {len(settings_store)} guilds"
+                )
+
+        # 최근 투표 기록 캐시 동기화 (재생 명령 앞단의 DB 조회 제거)
+        self.loop.create_task(AsyncDatabase().sync_votes())
+
+        # 재생 통계 백그라운드 플러셔 (남은 스풀도 재전송)
+        AsyncDatabase().start_statistics()
+
         self.loop.create_task(self.status_task())
         self.loop.create_task(self.redis_update_task())
         self.loop.create_task(self.voice_cleanup_task())
@@ -153,6 +214,11 @@ class TapiBot(commands.Bot):
 
         self.loop.create_task(start_command_listener(self))
 
+        # 샤드 간 캐시 동기화 리스너 시작
+        from tapi.utils.redis_event_listener import start_event_listener
+
+        self.loop.create_task(start_event_listener(self))
+
         # 점검 후 재생 상태 복원 (잠시 대기 후 실행)
         self.loop.create_task(self._delayed_restore_playback())
 
@@ -189,6 +255,8 @@ class TapiBot(commands.Bot):
 
     async def on_guild_join(self, guild):
         """봇이 새로운 서버에 초대되었을 때 환영 메시지 전송"""
+        await AsyncDatabase().preload_guild_settings([guild.id])
+
         try:
             # 서버에서 봇이 메시지를 보낼 수 있는 첫 번째 채널 찾기
             channel = None
@@ -245,8 +313,7 @@ class TapiBot(commands.Bot):
             active_players = []
 
             if self.lavalink:
-                for guild in self.guilds:
-                    player = self.lavalink.player_manager.get(guild.id)
+                for guild, player in player_registry.players(self):
                     if player and player.is_connected:
                         player_count += 1
 
@@ -309,23 +376,36 @@ class TapiBot(commands.Bot):
             latency = self.latency
             latency_ms = round(latency * 1000) if latency != float("inf") else -1
 
+            SHARD_GUILDS.set(len(self.guilds))
+            SHARD_PLAYERS.set(player_count)
+            if latency != float("inf"):
+                SHARD_LATENCY_SECONDS.set(latency)
+
             shard_data = {
                 "guild_count": len(self.guilds),
                 "latency": latency_ms,
                 "memory_usage": memory_info.rss,  # Resident Set Size in bytes
                 "player_count": player_count,
+                "db": AsyncDatabase().metrics(),
+                "track_cache": track_cache.metrics(),
+                "player_updates": player_state_stream.metrics(),
+                "panel_edits": panel_scheduler.metrics(),
+                "player_registry": player_registry.metrics(),
+                "loop": loop_monitor.metrics(),
+                "redis": redis_manager.metrics(),
+                "commands": command_stream.metrics(),
+                "lavalink_nodes": node_pool.metrics(),
+                "search_tier": node_pool.search_metrics(),
+                "migrations": player_migrator.metrics(),
                 "timestamp": datetime.datetime.now(timezone(timedelta(hours=9)))
                 .replace(microsecond=0)
                 .isoformat(),
             }
-            redis_manager.update_shard_status(shard_id, shard_data)
-
-            # 활성 플레이어 상세 정보도 Redis에 업데이트
-            redis_manager.update_active_players(shard_id, active_players)
-
-            # 봇이 속한 길드 ID 목록 업데이트
+            # 샤드 상태 / 활성 플레이어 / 길드 목록을 한 번의 왕복으로 기록
             guild_ids = [str(g.id) for g in self.guilds]
-            redis_manager.update_bot_guilds(shard_id, guild_ids)
+            await redis_manager.publish_shard_heartbeat(
+                shard_id, shard_data, active_players, guild_ids
+            )
 
             LOGGER.debug(f"Updated shard {shard_id} status: {shard_data}")
         except Exception as e:
@@ -353,13 +433,19 @@ class TapiBot(commands.Bot):
                 music_cog = self.get_cog("Music")
                 handlers = getattr(music_cog, "handlers", None) if music_cog else None
 
-                for guild in list(self.guilds):
+                # 이벤트가 빠져 레지스트리에 없는 연결도 정리 대상에 포함
+                missing = player_registry.reconcile(self)
+                if missing:
+                    LOGGER.warning(
+                        f"[voice_cleanup] {missing} players were missing from registry"
+                    )
+
+                for guild, player in player_registry.players(self):
                     try:
                         voice_client = guild.voice_client
                         if not voice_client or not voice_client.channel:
                             continue
 
-                        player = self.lavalink.player_manager.get(guild.id)
                         is_active = bool(
                             player and (player.is_playing or player.paused)
                         )
@@ -406,7 +492,7 @@ class TapiBot(commands.Bot):
                 # 샤딩 사용 시 모든 샤드의 길드 수 합산
                 if hasattr(self, "shard_count") and self.shard_count:
                     # Redis에서 모든 샤드의 길드 수 한 번에 가져오기
-                    all_shards = redis_manager.get_all_shard_statuses()
+                    all_shards = await redis_manager.get_all_shard_statuses()
                     total_guilds = sum(
                         shard_data.get("guild_count", 0)
                         for shard_data in all_shards.values()
@@ -450,7 +536,7 @@ class TapiBot(commands.Bot):
                 check_index = (now.hour * 60 + now.minute) // 5  # 0-287
 
                 # 샤드 상태 체크 (Redis 타임스탬프 45초 이내)
-                shard_statuses = redis_manager.get_all_shard_statuses()
+                shard_statuses = await redis_manager.get_all_shard_statuses()
                 shard_up = {}
                 for sid in range(getattr(self, "shard_count", 1)):
                     shard_data = shard_statuses.get(sid)
@@ -496,24 +582,28 @@ class TapiBot(commands.Bot):
                 except Exception:
                     results["api"] = False
 
-                # Redis 비트맵에 기록
-                for service in SERVICES:
-                    is_up = results.get(service, False)
-                    redis_manager.record_uptime_check(service, date_str, check_index, is_up)
+                # Redis 비트맵에 기록 (전체 서비스를 한 번에)
+                await redis_manager.record_uptime_checks(
+                    date_str,
+                    check_index,
+                    {service: results.get(service, False) for service in SERVICES},
+                )
 
                 LOGGER.debug(f"Uptime check recorded: {results}")
 
                 # 전날 집계 시도
                 yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
-                if not redis_manager.is_uptime_aggregated(yesterday):
-                    from tapi.utils.database import Database
-                    db = Database()
+                if not await redis_manager.is_uptime_aggregated(yesterday):
+                    db = AsyncDatabase()
                     all_success = True
                     inserted_count = 0
+                    summaries = await redis_manager.get_uptime_summaries(
+                        SERVICES, [yesterday]
+                    )
                     for service in SERVICES:
-                        summary = redis_manager.get_uptime_summary(service, yesterday)
+                        summary = summaries[yesterday][service]
                         if summary["total_checks"] > 0:
-                            success = db.insert_uptime_history(
+                            success = await db.insert_uptime_history(
                                 service, yesterday,
                                 summary["total_checks"], summary["up_checks"]
                             )
@@ -522,7 +612,7 @@ class TapiBot(commands.Bot):
                             else:
                                 all_success = False
                     if all_success and inserted_count > 0:
-                        redis_manager.mark_uptime_aggregated(yesterday)
+                        await redis_manager.mark_uptime_aggregated(yesterday)
                         LOGGER.info(f"Uptime aggregated for {yesterday}: {inserted_count} services")
                     elif inserted_count == 0:
                         LOGGER.warning(f"No uptime data to aggregate for {yesterday}")
@@ -550,9 +640,7 @@ class TapiBot(commands.Bot):
             # 현재 샤드의 활성 플레이어에게 직접 전송
             if self.lavalink:
                 sent_count = 0
-                for guild in self.guilds:
-                    player = self.lavalink.player_manager.get(guild.id)
-
+                for guild, player in player_registry.players(self):
                     if player and player.is_connected:
                         channel_id = player.fetch("channel")
                         if channel_id:
@@ -605,11 +693,9 @@ class TapiBot(commands.Bot):
                         f"Shard {shard_id} deleted {deleted_count} music control messages"
                     )
 
-            # 통계 buffer flush (Python 종료 전에 명시적으로 실행)
+            # 통계 큐 flush (Python 종료 전에 명시적으로 실행, 실패분은 스풀에 보관)
             try:
-                from tapi.utils.database import Database
-
-                Database().flush_statistics()
+                await AsyncDatabase().flush_statistics()
             except Exception as e:
                 LOGGER.error(f"Failed to flush statistics on shutdown: {e}")
 
@@ -617,6 +703,12 @@ class TapiBot(commands.Bot):
             if self.stats_updater:
                 await self.stats_updater.close()
 
+            # Redis 커넥션 풀 정리
+            await redis_manager.close()
+
+            loop_monitor.stop()
+            await metrics_registry.stop()
+
         await super().close()
 
     async def _save_playback_states(self):
@@ -627,9 +719,8 @@ class TapiBot(commands.Bot):
         shard_id = getattr(self, "shard_id", 0)
         playback_states = []
 
-        for guild in self.guilds:
+        for guild, player in player_registry.players(self):
             try:
-                player = self.lavalink.player_manager.get(guild.id)
                 if not player or not player.is_connected:
                     continue
 
@@ -649,6 +740,7 @@ class TapiBot(commands.Bot):
                         "title": player.current.title,
                         "author": player.current.author,
                         "requester": player.current.requester,
+                        "encoded": player.current.track,
                     }
 
                 # 큐 정보 (최대 50곡)
@@ -662,6 +754,7 @@ class TapiBot(commands.Bot):
                             "title": track.title,
                             "author": track.author,
                             "requester": track.requester,
+                            "encoded": track.track,
                         }
                     )
 
@@ -688,7 +781,7 @@ class TapiBot(commands.Bot):
                 LOGGER.error(f"Error saving playback state for guild {guild.id}: {e}")
 
         if playback_states:
-            redis_manager.save_playback_state(shard_id, playback_states)
+            await redis_manager.save_playback_state(shard_id, playback_states)
             LOGGER.info(
                 f"Saved {len(playback_states)} playback states for shard {shard_id}"
             )
@@ -710,7 +803,7 @@ class TapiBot(commands.Bot):
     async def restore_playback_states(self):
         """점검 후 조건부 자동 재생 복원"""
         shard_id = getattr(self, "shard_id", 0)
-        states = redis_manager.get_playback_states(shard_id)
+        states = await redis_manager.get_playback_states(shard_id)
 
         if not states:
             LOGGER.debug(f"No playback states to restore for shard {shard_id}")
@@ -757,7 +850,7 @@ class TapiBot(commands.Bot):
                 )
 
         # 복원 완료 후 Redis에서 상태 삭제
-        redis_manager.clear_playback_state(shard_id)
+        await redis_manager.clear_playback_state(shard_id)
         LOGGER.info(
             f"Restored {restored_count}/{len(states)} playback states for shard {shard_id}"
         )
@@ -813,37 +906,23 @@ class TapiBot(commands.Bot):
 
             tracks_added = 0
 
-            # 현재 곡 복원
+            # 현재 곡 + 큐 복원 (동시에 해석, 첫 곡이 준비되면 바로 재생)
+            saved_tracks = state.get("queue", [])
             if state.get("current_track"):
-                try:
-                    results = await player.node.get_tracks(
-                        state["current_track"]["uri"]
-                    )
-                    if results and results.tracks:
-                        track = results.tracks[0]
-                        track.requester = state["current_track"].get(
-                            "requester", self.user.id
-                        )
-                        player.add(track=track, requester=track.requester)
-                        tracks_added += 1
-                except Exception as e:
-                    LOGGER.warning(f"Failed to restore current track: {e}")
+                saved_tracks = [state["current_track"]] + saved_tracks
 
-            # 큐 복원
-            for track_data in state.get("queue", []):
-                try:
-                    results = await player.node.get_tracks(track_data["uri"])
-                    if results and results.tracks:
-                        track = results.tracks[0]
-                        track.requester = track_data.get("requester", self.user.id)
-                        player.add(track=track, requester=track.requester)
-                        tracks_added += 1
-                except Exception as e:
-                    LOGGER.warning(f"Failed to restore queued track: {e}")
+            async for track_data, track in resolve_in_order(
+                player.node, saved_tracks, search_fallback=False
+            ):
+                if not track:
+                    LOGGER.warning(f"Failed to restore track: {track_data.get('uri')}")
+                    continue
 
-            # 재생 시작
-            if tracks_added > 0 and not player.is_playing:
-                await player.play()
+                track.requester = track_data.get("requester", self.user.id)
+                player.add(track=track, requester=track.requester)
+                tracks_added += 1
+                if not player.is_playing:
+                    await player.play()
 
             # 복원 알림
             if text_channel and tracks_added > 0:
@@ -877,34 +956,38 @@ class TapiBot(commands.Bot):
 
 
 # ────── 실행부 ──────
-shard_id = os.getenv("SHARD_ID")
-shard_count = os.getenv("SHARD_COUNT")
+def main():
+    shard_id = os.getenv("SHARD_ID")
+    shard_count = os.getenv("SHARD_COUNT")
 
-if shard_id is not None and shard_count is not None:
-    shard_id = int(shard_id)
-    shard_count = int(shard_count)
-    LOGGER.info(f"Starting bot with shard {shard_id}/{shard_count}")
+    if shard_id is not None and shard_count is not None:
+        shard_id = int(shard_id)
+        shard_count = int(shard_count)
+        LOGGER.info(f"Starting bot with shard {shard_id}/{shard_count}")
 
-    IDENTIFY_DELAY = 5
-    time.sleep(shard_id * IDENTIFY_DELAY)
+        IDENTIFY_DELAY = 5
+        time.sleep(shard_id * IDENTIFY_DELAY)
 
-    bot = TapiBot(shard_id=shard_id, shard_count=shard_count)
-else:
-    LOGGER.info("Starting bot without sharding")
-    bot = TapiBot()
+        bot = TapiBot(shard_id=shard_id, shard_count=shard_count)
+    else:
+        LOGGER.info("Starting bot without sharding")
+        bot = TapiBot()
 
+    # Signal handler 설정 (Linux/Docker 환경)
+    def handle_shutdown(signum, frame):
+        """SIGTERM/SIGINT 받았을 때 graceful shutdown"""
+        _ = frame  # unused parameter
+        LOGGER.info(f"Received signal {signum}, initiating graceful shutdown...")
+        asyncio.create_task(bot.close())
 
-# Signal handler 설정 (Linux/Docker 환경)
-def handle_shutdown(signum, frame):
-    """SIGTERM/SIGINT 받았을 때 graceful shutdown"""
-    _ = frame  # unused parameter
-    LOGGER.info(f"Received signal {signum}, initiating graceful shutdown...")
-    asyncio.create_task(bot.close())
+    # Docker에서는 Linux이므로 항상 등록
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    signal.signal(signal.SIGINT, handle_shutdown)
+    LOGGER.info("Signal handlers registered for graceful shutdown")
 
+    bot.run(TOKEN)
 
-# Docker에서는 Linux이므로 항상 등록
-signal.signal(signal.SIGTERM, handle_shutdown)
-signal.signal(signal.SIGINT, handle_shutdown)
-LOGGER.info("Signal handlers registered for graceful shutdown")
 
-bot.run(TOKEN)
+# python -m tapi 로 실행할 때만 봇을 띄운다 (import 시에는 TapiBot만 정의)
+if __name__ == "__main__":
+    main()
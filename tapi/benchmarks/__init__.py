@@ -0,0 +1,4 @@
+"""성능 벤치마크 스크립트
+
+봇 컨테이너 안에서 실행한다. 예) python -m tapi.benchmarks.uptime
+"""
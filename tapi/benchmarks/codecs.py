@@ -0,0 +1,87 @@
+"""Redis 페이로드 코덱 벤치마크
+
+큐 50곡짜리 get_player_state 결과를 코덱별로 인코딩/디코딩하는 시간과 크기를 비교한다.
+Redis 없이 실행된다. 설치되지 않은 코덱(orjson, msgpack)은 건너뛴다.
+
+    python -m tapi.benchmarks.codecs --tracks 50 --rounds 5000
+"""
+
+import time
+import argparse
+from types import SimpleNamespace
+
+from tapi.utils.redis_codec import available_codecs, decode
+from tapi.utils.web_command_handler import get_player_state
+
+
+def _track(i: int):
+    return SimpleNamespace(
+        title=f"Track title number {i} (Official Music Video)",
+        author=f"Artist {i % 7}",
+        uri=f"https://www.youtube.com/watch?v=video{i:06d}",
+        identifier=f"video{i:06d}",
+        duration=180000 + i * 1000,
+        artwork_url=f"https://i.ytimg.com/vi/video{i:06d}/hqdefault.jpg",
+        plugin_info={},
+        source_name="youtube",
+    )
+
+
+def make_bot(tracks: int, guild_id: int = 123456789012345678):
+    """get_player_state가 읽는 속성만 가진 가짜 봇"""
+    player = SimpleNamespace(
+        current=_track(0),
+        position=42000,
+        queue=[_track(i) for i in range(1, tracks + 1)],
+        is_connected=True,
+        is_playing=True,
+        paused=False,
+        volume=50,
+        loop=0,
+        shuffle=False,
+    )
+    channel = SimpleNamespace(name="music")
+    guild = SimpleNamespace(voice_client=SimpleNamespace(channel=channel))
+    return (
+        SimpleNamespace(
+            get_guild=lambda _id: guild,
+            lavalink=SimpleNamespace(
+                player_manager=SimpleNamespace(get=lambda _id: player)
+            ),
+        ),
+        guild_id,
+    )
+
+
+def measure(rounds: int, func) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1_000_000  # us
+
+
+def run(tracks: int, rounds: int):
+    bot, guild_id = make_bot(tracks)
+    state = get_player_state(bot, guild_id)
+
+    print(f"get_player_state with {tracks} queued tracks, {rounds} rounds")
+    print(f"{'codec':<10}{'bytes':>10}{'encode us':>12}{'decode us':>12}")
+    for name, codec in available_codecs().items():
+        payload = codec.encode(state)
+        assert decode(payload) == state
+        encode_us = measure(rounds, lambda: codec.encode(state))
+        decode_us = measure(rounds, lambda: decode(payload))
+        size = len(payload.encode() if isinstance(payload, str) else payload)
+        print(f"{name:<10}{size:>10}{encode_us:>12.2f}{decode_us:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+    run(args.tracks, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""벤치마크용 가짜 Discord 클라이언트 / 길드 모델
+
+게이트웨이 연결 없이 봇 코드가 읽는 속성과 호출하는 메서드만 흉내 낸다.
+- FakeBot: get_guild/get_channel/get_user/get_cog, guilds, voice_clients, latency
+- FakeGuild.change_voice_state: 게이트웨이 대신 VOICE_STATE_UPDATE / VOICE_SERVER_UPDATE를
+  음성 프로토콜(AudioConnection)에 바로 전달해 Lavalink 플레이어가 연결 상태가 된다
+- 메시지 전송/편집/삭제는 네트워크 없이 FakeBot.api_calls 에 횟수만 센다
+"""
+
+import itertools
+from collections import Counter
+from types import SimpleNamespace
+
+GUILD_ID_BASE = 10**17
+BOT_USER_ID = 1157593204682657933
+
+_snowflakes = itertools.count(2 * 10**17)
+
+
+def snowflake() -> int:
+    return next(_snowflakes)
+
+
+def guild_id_for(index: int) -> int:
+    return GUILD_ID_BASE + index
+
+
+def listener_id(guild_id: int, n: int = 0) -> int:
+    """길드 음성 채널의 n번째 청취자 ID (외부 부하 생성기도 같은 ID를 쓴다)"""
+    return guild_id * 10 + n
+
+
+class FakePermissions:
+    """모든 권한 허용"""
+
+    connect = speak = send_messages = move_members = True
+
+
+PERMISSIONS = FakePermissions()
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str, bot: bool = False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+        self.voice = None
+        self.guild_permissions = PERMISSIONS
+
+    async def send(self, **_kwargs):
+        return None
+
+
+class FakeMessage:
+    def __init__(self, bot, channel, message_id: int = None):
+        self._bot = bot
+        self.channel = channel
+        self.id = message_id or snowflake()
+
+    async def edit(self, **_kwargs):
+        self._bot.api_calls["message.edit"] += 1
+        return self
+
+    async def delete(self, delay: float = None):
+        self._bot.api_calls["message.delete"] += 1
+
+
+class FakeTextChannel:
+    def __init__(self, bot, guild, name: str):
+        self._bot = bot
+        self.guild = guild
+        self.id = snowflake()
+        self.name = name
+        self.mention = f"<#{self.id}>"
+
+    def permissions_for(self, _member):
+        return PERMISSIONS
+
+    async def send(self, **_kwargs):
+        self._bot.api_calls["channel.send"] += 1
+        return FakeMessage(self._bot, self)
+
+    async def fetch_message(self, message_id: int):
+        self._bot.api_calls["channel.fetch_message"] += 1
+        return FakeMessage(self._bot, self, message_id)
+
+
+class FakeVoiceChannel:
+    def __init__(self, bot, guild, name: str, members: list):
+        self._bot = bot
+        self.guild = guild
+        self.id = snowflake()
+        self.name = name
+        self.members = members
+        self.user_limit = 0
+        self.mention = f"<#{self.id}>"
+
+    def permissions_for(self, _member):
+        return PERMISSIONS
+
+    def _get_voice_client_key(self):
+        return self.guild.id, "guild_id"
+
+    async def connect(
+        self, *, cls, timeout: float = 60.0, reconnect: bool = True, **kwargs
+    ):
+        """discord.abc.Connectable.connect 와 같은 순서: 등록 후 protocol.connect"""
+        voice_client = cls(self._bot, self)
+        self.guild.voice_client = voice_client
+        await voice_client.connect(timeout=timeout, reconnect=reconnect, **kwargs)
+        return voice_client
+
+
+class FakeGuild:
+    def __init__(self, bot, index: int, members: int = 3):
+        self._bot = bot
+        self.id = guild_id_for(index)
+        self.name = f"Bench Guild {index}"
+        self.me = bot.user
+        self.voice_client = None
+
+        self.listeners = [
+            FakeUser(listener_id(self.id, n), f"listener-{index}-{n}")
+            for n in range(members)
+        ]
+        text = FakeTextChannel(bot, self, "music")
+        voice = FakeVoiceChannel(bot, self, "Music", [*self.listeners, bot.user])
+        for member in self.listeners:
+            member.voice = SimpleNamespace(channel=voice)
+
+        self.text_channels = [text]
+        self.voice_channels = [voice]
+        self.system_channel = text
+        self._channels = {text.id: text, voice.id: voice}
+        self._members = {member.id: member for member in self.listeners}
+        self._members[bot.user.id] = bot.user
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_member(self, user_id):
+        return self._members.get(user_id)
+
+    async def change_voice_state(
+        self, *, channel, self_mute: bool = False, self_deaf: bool = False
+    ):
+        """게이트웨이 op 4 대신 음성 이벤트를 바로 전달"""
+        self._bot.api_calls["voice_state"] += 1
+        voice_client = self.voice_client
+        if voice_client is None:
+            return
+
+        await voice_client.on_voice_state_update(
+            {
+                "guild_id": str(self.id),
+                "channel_id": str(channel.id) if channel else None,
+                "user_id": str(self._bot.user.id),
+                "session_id": f"bench-{self.id}",
+                "self_mute": self_mute,
+                "self_deaf": self_deaf,
+            }
+        )
+        if channel is not None:
+            await voice_client.on_voice_server_update(
+                {
+                    "guild_id": str(self.id),
+                    "token": "bench-token",
+                    "endpoint": "bench.discord.media:443",
+                }
+            )
+
+
+class _ConnectionState:
+    def __init__(self, bot):
+        self._bot = bot
+
+    def _remove_voice_client(self, guild_id):
+        guild = self._bot.get_guild(guild_id)
+        if guild is not None:
+            guild.voice_client = None
+
+
+class FakeBot:
+    """TapiBot 대신 쓰는 스텁 클라이언트"""
+
+    def __init__(self, guild_count: int, members: int = 3, shard_id: int = 0):
+        self.user = FakeUser(BOT_USER_ID, "TAPI", bot=True)
+        self.shard_id = shard_id
+        self.shard_count = 1
+        self.latency = 0.042
+        self.lavalink = None
+        self.api_calls = Counter()
+        self._connection = _ConnectionState(self)
+        self._cogs = {}
+
+        self.guilds = [FakeGuild(self, i, members) for i in range(guild_count)]
+        self._guilds = {guild.id: guild for guild in self.guilds}
+        self._channels = {}
+        self._users = {self.user.id: self.user}
+        for guild in self.guilds:
+            self._channels.update(guild._channels)
+            self._users.update({member.id: member for member in guild.listeners})
+
+    @property
+    def voice_clients(self):
+        return [guild.voice_client for guild in self.guilds if guild.voice_client]
+
+    def get_guild(self, guild_id):
+        return self._guilds.get(guild_id)
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_user(self, user_id):
+        return self._users.get(user_id)
+
+    def add_cog(self, cog):
+        self._cogs[cog.__cog_name__] = cog
+
+    def get_cog(self, name):
+        return self._cogs.get(name)
+
+    def is_closed(self):
+        return False
+
+    async def wait_until_ready(self):
+        return None
+
+
+class _InteractionResponse:
+    def __init__(self):
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, **_kwargs):
+        self._done = True
+
+    async def defer(self, **_kwargs):
+        self._done = True
+
+
+class _Followup:
+    def __init__(self, bot, channel):
+        self._bot = bot
+        self._channel = channel
+
+    async def send(self, **_kwargs):
+        self._bot.api_calls["followup.send"] += 1
+        return FakeMessage(self._bot, self._channel)
+
+
+class FakeInteraction:
+    """슬래시 명령 interaction (응답 후 followup 경로)"""
+
+    def __init__(self, bot, guild, user, command: str = "play", locale: str = "en-US"):
+        self.client = bot
+        self.guild = guild
+        self.user = user
+        self.channel = guild.text_channels[0]
+        self.channel_id = self.channel.id
+        self.command = SimpleNamespace(name=command, qualified_name=command)
+        self.locale = locale
+        self.extras = {}
+        self.response = _InteractionResponse()
+        self.followup = _Followup(bot, self.channel)
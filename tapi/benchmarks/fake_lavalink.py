@@ -0,0 +1,274 @@
+"""벤치마크용 인프로세스 가짜 Lavalink v4 서버
+
+실제 lavalink.Client가 붙을 수 있도록 v4 REST + 웹소켓의 필요한 부분만 구현한다.
+- GET  /v4/websocket: ready, stats 전송. 트랙 재생 시 TrackStartEvent 전송
+- GET  /v4/loadtracks: 검색(ytsearch: 등) -> SEARCH, list= -> PLAYLIST, 그 외 URL -> TRACK
+- POST /v4/decodetracks, GET /v4/decodetrack
+- PATCH/DELETE /v4/sessions/{session}/players/{guild}, PATCH /v4/sessions/{session}
+- GET  /v4/info, /v4/stats, /version
+
+트랙은 lavalink.encode_track으로 만든 진짜 encoded 값을 돌려주므로
+로컬 디코드 경로(track_resolver)도 실제와 같이 동작한다.
+"""
+
+import asyncio
+import hashlib
+from collections import Counter
+
+from aiohttp import web
+import lavalink
+
+PASSWORD = "youshallnotpass"
+SESSION_ID = "bench-session"
+
+
+def make_track(identifier: str, title: str = None, author: str = None) -> dict:
+    """v4 트랙 객체 (encoded + info)"""
+    info = {
+        "identifier": identifier,
+        "isSeekable": True,
+        "author": author or f"Artist {identifier[:4]}",
+        "length": 180000 + int(hashlib.md5(identifier.encode()).hexdigest()[:4], 16),
+        "isStream": False,
+        "position": 0,
+        "title": title or f"Track {identifier}",
+        "uri": f"https://www.youtube.com/watch?v={identifier}",
+        "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/hqdefault.jpg",
+        "isrc": None,
+        "sourceName": "youtube",
+    }
+    _, encoded = lavalink.encode_track(info)
+    return {"encoded": encoded, "info": info, "pluginInfo": {}, "userData": {}}
+
+
+def _identifier(query: str, index: int = 0) -> str:
+    return hashlib.sha1(f"{query}#{index}".encode()).hexdigest()[:11]
+
+
+class FakeLavalink:
+    """aiohttp 기반 가짜 Lavalink 노드"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        load_latency: float = 0.0,
+        search_results: int = 10,
+        playlist_size: int = 20,
+    ):
+        self.host = host
+        self.port = port
+        self.load_latency = load_latency  # loadtracks 응답 지연 (초)
+        self.search_results = search_results
+        self.playlist_size = playlist_size
+
+        self.requests = Counter()  # 라우트별 요청 수
+        self.players: dict[str, dict] = {}  # guild_id -> 마지막 PATCH 상태
+        self._sockets: list[web.WebSocketResponse] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._runner = None
+
+    # --- 수명 주기 ---
+
+    async def start(self) -> int:
+        """서버 시작 후 실제 포트 반환"""
+        app = web.Application()
+        app.router.add_get("/v4/websocket", self._websocket)
+        app.router.add_get("/v4/loadtracks", self._load_tracks)
+        app.router.add_get("/v4/decodetrack", self._decode_track)
+        app.router.add_post("/v4/decodetracks", self._decode_tracks)
+        app.router.add_patch(
+            "/v4/sessions/{session_id}/players/{guild_id}", self._update_player
+        )
+        app.router.add_delete(
+            "/v4/sessions/{session_id}/players/{guild_id}", self._destroy_player
+        )
+        app.router.add_patch("/v4/sessions/{session_id}", self._update_session)
+        app.router.add_get("/v4/info", self._info)
+        app.router.add_get("/v4/stats", self._stats_route)
+        app.router.add_get("/version", self._version)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        for socket in list(self._sockets):
+            await socket.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # --- 웹소켓 ---
+
+    def _stats(self) -> dict:
+        return {
+            "players": len(self.players),
+            "playingPlayers": sum(1 for p in self.players.values() if p.get("track")),
+            "uptime": 1000,
+            "memory": {"free": 1, "used": 1, "allocated": 2, "reservable": 4},
+            "cpu": {"cores": 4, "systemLoad": 0.1, "lavalinkLoad": 0.05},
+            "frameStats": None,
+        }
+
+    async def _websocket(self, request):
+        if request.headers.get("Authorization") != PASSWORD:
+            raise web.HTTPUnauthorized()
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self._sockets.append(socket)
+        await socket.send_json(
+            {"op": "ready", "resumed": False, "sessionId": SESSION_ID}
+        )
+        await socket.send_json({"op": "stats", **self._stats()})
+        try:
+            async for _ in socket:
+                pass  # v4 클라이언트는 웹소켓으로 보내는 것이 없다
+        finally:
+            self._sockets.remove(socket)
+        return socket
+
+    async def _broadcast(self, payload: dict):
+        for socket in list(self._sockets):
+            if not socket.closed:
+                await socket.send_json(payload)
+
+    # --- REST ---
+
+    def _check_auth(self, request, route: str):
+        if request.headers.get("Authorization") != PASSWORD:
+            raise web.HTTPUnauthorized()
+        self.requests[route] += 1
+
+    async def _load_tracks(self, request):
+        self._check_auth(request, "loadtracks")
+        query = request.query.get("identifier", "")
+        if self.load_latency:
+            await asyncio.sleep(self.load_latency)
+
+        prefix, sep, term = query.partition(":")
+        if sep and prefix.endswith("search"):
+            if term.startswith("empty"):
+                return web.json_response({"loadType": "empty", "data": {}})
+            tracks = [
+                make_track(_identifier(query, i), title=f"{term} #{i}")
+                for i in range(self.search_results)
+            ]
+            return web.json_response({"loadType": "search", "data": tracks})
+
+        if "list=" in query:
+            tracks = [
+                make_track(_identifier(query, i)) for i in range(self.playlist_size)
+            ]
+            return web.json_response(
+                {
+                    "loadType": "playlist",
+                    "data": {
+                        "info": {"name": "Bench playlist", "selectedTrack": -1},
+                        "pluginInfo": {},
+                        "tracks": tracks,
+                    },
+                }
+            )
+
+        # 단일 URL: watch?v= 의 ID를 그대로 쓴다 (복원 시 같은 트랙)
+        identifier = query.rsplit("v=", 1)[-1][:11] if "v=" in query else None
+        return web.json_response(
+            {"loadType": "track", "data": make_track(identifier or _identifier(query))}
+        )
+
+    async def _decode_track(self, request):
+        self._check_auth(request, "decodetrack")
+        track = lavalink.decode_track(request.query["encodedTrack"])
+        return web.json_response(
+            make_track(track.identifier, track.title, track.author)
+        )
+
+    async def _decode_tracks(self, request):
+        self._check_auth(request, "decodetracks")
+        result = []
+        for encoded in await request.json():
+            track = lavalink.decode_track(encoded)
+            result.append(make_track(track.identifier, track.title, track.author))
+        return web.json_response(result)
+
+    async def _update_player(self, request):
+        self._check_auth(request, "update_player")
+        guild_id = request.match_info["guild_id"]
+        body = await request.json()
+        state = self.players.setdefault(guild_id, {"volume": 100, "paused": False})
+
+        track = body.get("track")
+        if track is not None and (
+            request.query.get("noReplace") != "true" or not state.get("track")
+        ):
+            encoded = track.get("encoded")
+            state["track"] = encoded
+            if encoded:
+                decoded = lavalink.decode_track(encoded)
+                # 실제 서버처럼 응답과 별개로 웹소켓으로 TrackStartEvent
+                task = asyncio.get_running_loop().create_task(
+                    self._broadcast(
+                        {
+                            "op": "event",
+                            "type": "TrackStartEvent",
+                            "guildId": guild_id,
+                            "track": make_track(
+                                decoded.identifier, decoded.title, decoded.author
+                            ),
+                        }
+                    )
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        for key in ("volume", "paused", "voice", "filters", "position"):
+            if key in body:
+                state[key] = body[key]
+
+        return web.json_response(
+            {
+                "guildId": guild_id,
+                "track": None,
+                "volume": state["volume"],
+                "paused": state["paused"],
+                "state": {"time": 0, "position": 0, "connected": True, "ping": 1},
+                "voice": state.get("voice", {}),
+                "filters": state.get("filters", {}),
+            }
+        )
+
+    async def _destroy_player(self, request):
+        self._check_auth(request, "destroy_player")
+        self.players.pop(request.match_info["guild_id"], None)
+        return web.Response(status=204)
+
+    async def _update_session(self, request):
+        self._check_auth(request, "update_session")
+        body = await request.json()
+        return web.json_response({"resuming": False, "timeout": 60, **body})
+
+    async def _info(self, request):
+        self._check_auth(request, "info")
+        return web.json_response(
+            {
+                "version": {"semver": "4.2.2", "major": 4, "minor": 2, "patch": 2},
+                "buildTime": 0,
+                "git": {"branch": "bench", "commit": "0", "commitTime": 0},
+                "jvm": "fake",
+                "lavaplayer": "fake",
+                "sourceManagers": ["youtube", "soundcloud", "http"],
+                "filters": [],
+                "plugins": [],
+            }
+        )
+
+    async def _stats_route(self, request):
+        self._check_auth(request, "stats")
+        return web.json_response(self._stats())
+
+    async def _version(self, request):
+        self._check_auth(request, "version")
+        return web.Response(text="4.2.2")
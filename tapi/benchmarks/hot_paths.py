@@ -0,0 +1,463 @@
+"""오프라인 핫패스 벤치마크
+
+Discord 토큰과 Lavalink 없이 인프로세스 가짜 Lavalink v4 서버(fake_lavalink)와
+가짜 Discord 클라이언트(fake_discord)에 실제 lavalink.Client와 Music 코그를 붙여서
+다음 경로를 길드/플레이어 수를 바꿔 가며 측정한다.
+
+- play: Music._execute_play (검색 -> 큐 추가 -> 응답 -> 재생 시작)
+- track_start: MusicHandlers.on_track_start (통계, 패널 레이아웃, 웹 발행, 메시지 편집)
+- web_command: web_command_handler.dispatch_command (get_state/volume/search/play 순환)
+- shard_status: TapiBot.update_shard_status
+- restore: TapiBot.restore_playback_states (연결된 플레이어 전부를 저장 -> 끊기 -> 복원)
+- migrate: PlayerMigrator.migrate_player (플레이어 하나를 다른 노드로, --nodes 2 이상)
+
+처리량(ops/s), p50/p99 지연, 연산당 메모리(tracemalloc 별도 패스: 피크, 남은 바이트/블록)를 출력한다.
+--nodes 로 가짜 Lavalink 노드 수를 정하면 node_pool 배치 규칙으로 플레이어가 나뉜다.
+--search-nodes 는 검색 전용 노드를 따로 띄운다 (loadtracks가 재생 노드 대신 이쪽으로 간다).
+REDIS_HOST의 Redis를 쓰려면 --redis (기본은 Redis 없이, 재생 상태만 메모리에 보관).
+
+    python -m tapi.benchmarks.hot_paths --guilds 1000 --players 100 --ops 500
+"""
+
+import sys
+import json
+import time
+import types
+import inspect
+import asyncio
+import logging
+import argparse
+import tracemalloc
+from collections import Counter
+
+import lavalink
+from lavalink.events import TrackStartEvent
+
+from tapi import LOGGER
+from tapi.benchmarks.fake_discord import FakeBot, FakeInteraction
+from tapi.benchmarks.fake_lavalink import FakeLavalink, PASSWORD
+from tapi.modules.audio_connection import AudioConnection
+from tapi.modules.player import Music
+from tapi.utils.node_pool import node_pool
+from tapi.utils.player_migration import player_migrator
+from tapi.utils.redis_manager import redis_manager
+from tapi.utils.settings_store import settings_store
+from tapi.utils.track_cache import track_cache
+from tapi.utils.web_command_handler import dispatch_command
+
+SCENARIOS = (
+    "play",
+    "track_start",
+    "web_command",
+    "shard_status",
+    "restore",
+    "migrate",
+)
+WEB_COMMANDS = ("get_state", "volume", "search", "play")
+QUEUE_RESET = (
+    40  # 큐가 이만큼 차면 비운다 (MAX_QUEUE_SIZE 도달로 빠른 실패 경로만 재는 것 방지)
+)
+
+
+def load_bot_class():
+    """TapiBot (tapi/__main__.py 는 python -m tapi 로 실행할 때만 봇을 띄운다)"""
+    from tapi.__main__ import TapiBot
+
+    return TapiBot
+
+
+def bind_bot_methods(bot, bot_class):
+    """TapiBot 메서드를 FakeBot 인스턴스에 묶는다 (self._restore_player 등 내부 호출용)"""
+    for name, value in vars(bot_class).items():
+        if name.startswith("__") or not inspect.isfunction(value):
+            continue
+        if not hasattr(type(bot), name):
+            setattr(bot, name, types.MethodType(value, bot))
+
+
+class MemoryPlaybackStore:
+    """Redis 없이 실행할 때 재생 상태 저장/조회 대체"""
+
+    def __init__(self):
+        self.states = {}
+
+    async def save_playback_state(self, shard_id, playback_states):
+        self.states[shard_id] = playback_states
+
+    async def get_playback_states(self, shard_id):
+        return self.states.get(shard_id, [])
+
+    async def clear_playback_state(self, shard_id):
+        self.states.pop(shard_id, None)
+
+    def install(self, manager):
+        manager.save_playback_state = self.save_playback_state
+        manager.get_playback_states = self.get_playback_states
+        manager.clear_playback_state = self.clear_playback_state
+
+
+class World:
+    """가짜 Lavalink + 가짜 봇 + 실제 Music 코그"""
+
+    def __init__(self, args):
+        self.args = args
+        self.lavalink_servers = [
+            FakeLavalink(load_latency=args.lavalink_latency / 1000)
+            for _ in range(args.nodes + args.search_nodes)
+        ]
+        self.bot = FakeBot(args.guilds, members=args.members)
+        self.music = None
+        self.players = []  # (guild, listener)
+
+    async def start(self):
+        node_pool.configs = [
+            {
+                "host": "127.0.0.1",
+                "port": await server.start(),
+                "password": PASSWORD,
+                "region": "eu",
+                "name": f"bench-node-{i}",
+                "role": "search" if i >= self.args.nodes else "playback",
+            }
+            for i, server in enumerate(self.lavalink_servers)
+        ]
+        bot = self.bot
+        bot.lavalink = lavalink.Client(bot.user.id)
+        node_pool.register(bot.lavalink)
+        nodes = bot.lavalink.node_manager.nodes
+        for _ in range(100):
+            if all(node.available and node._transport.session_id for node in nodes):
+                break
+            await asyncio.sleep(0.05)
+        else:
+            raise RuntimeError("Fake Lavalink node did not become ready")
+
+        self.music = Music(bot)
+        bot.add_cog(self.music)
+        bot.lavalink.add_event_hooks(self.music.handlers)
+
+        # 샤드 시작 시 preload 한 것과 같은 상태 (전부 기본 설정)
+        settings_store.load([guild.id for guild in bot.guilds], [])
+        if not self.args.redis:
+            redis_manager.available = False
+            MemoryPlaybackStore().install(redis_manager)
+        else:
+            await redis_manager.connect()
+
+        await self.connect_players()
+
+    async def connect_players(self):
+        """앞쪽 길드 --players 개에 음성 연결 + 재생 중인 곡 + 큐"""
+        self.players = []
+        for guild in self.bot.guilds[: self.args.players]:
+            listener = guild.listeners[0]
+            await guild.voice_channels[0].connect(cls=AudioConnection, self_deaf=True)
+            player = self.bot.lavalink.player_manager.get(guild.id)
+            player.store("channel", guild.text_channels[0].id)
+            results = await track_cache.get_tracks(
+                player.node, f"ytsearch:warmup {guild.id}"
+            )
+            for track in results.tracks[: self.args.queue + 1]:
+                player.add(requester=listener.id, track=track)
+            await player.play()
+            self.players.append((guild, listener))
+        await self.settle()
+
+    async def settle(self, timeout: float = 5.0):
+        """TrackStartEvent 등 백그라운드 처리가 끝날 때까지 대기"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            players = self.bot.lavalink.player_manager.players.values()
+            if all(player.current for player in players):
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+
+    async def disconnect_players(self):
+        for guild, _ in self.players:
+            if guild.voice_client:
+                await guild.voice_client.disconnect(force=True)
+
+    async def close(self):
+        await self.disconnect_players()
+        await self.bot.lavalink.close()
+        for server in self.lavalink_servers:
+            await server.stop()
+        if self.args.redis:
+            await redis_manager.close()
+
+    def player(self, index):
+        guild, listener = self.players[index % len(self.players)]
+        player = self.bot.lavalink.player_manager.get(guild.id)
+        if player and len(player.queue) >= QUEUE_RESET:
+            player.queue.clear()
+        return guild, listener, player
+
+
+def make_scenario(name: str, world: World):
+    """시나리오 이름 -> prepare(i). prepare는 측정할 코루틴 함수를 돌려준다."""
+    bot = world.bot
+
+    if name == "play":
+
+        def prepare(i):
+            guild, listener, _ = world.player(i)
+            interaction = FakeInteraction(bot, guild, listener, "play")
+            return lambda: world.music._execute_play(
+                interaction, f"ytsearch:bench song {i}"
+            )
+
+    elif name == "track_start":
+
+        def prepare(i):
+            _, _, player = world.player(i)
+            event = TrackStartEvent(player, player.current)
+            return lambda: world.music.handlers.on_track_start(event)
+
+    elif name == "web_command":
+
+        def prepare(i):
+            guild, listener, _ = world.player(i)
+            command = WEB_COMMANDS[i % len(WEB_COMMANDS)]
+            params = {
+                "get_state": {},
+                "volume": {"volume": 10 + i % 90},
+                "search": {"query": f"bench search {i}"},
+                "play": {"query": f"bench web {i}"},
+            }[command]
+
+            async def op():
+                result = await dispatch_command(
+                    bot, command, guild.id, listener.id, params
+                )
+                if not result.get("success"):
+                    raise RuntimeError(f"{command}: {result.get('error')}")
+
+            return op
+
+    elif name == "shard_status":
+
+        def prepare(_i):
+            return bot.update_shard_status
+
+    elif name == "restore":
+
+        def prepare(_i):
+            async def op():
+                await bot.restore_playback_states()
+                # 복원 실패는 TapiBot이 로그만 남기므로 연결 수로 확인
+                restored = len(bot.voice_clients)
+                if restored != len(world.players):
+                    raise RuntimeError(
+                        f"restored {restored}/{len(world.players)} players"
+                    )
+
+            return op
+
+    elif name == "migrate":
+
+        def prepare(i):
+            _, _, player = world.player(i)
+            target = node_pool.placement_node(bot.lavalink, exclude=[player.node])
+
+            async def op():
+                if target is None:
+                    raise RuntimeError("migrate needs --nodes 2 or more")
+                if (
+                    await player_migrator.migrate_player(player, target, "bench")
+                    is None
+                ):
+                    raise RuntimeError(f"migration to {target.name} failed")
+
+            return op
+
+    else:
+        raise ValueError(f"Unknown scenario: {name}")
+
+    return prepare
+
+
+async def run_ops(prepare, ops: int, concurrency: int):
+    """지연 목록, 경과 시간, 실패 수"""
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal failures
+        op = prepare(i)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await op()
+            except Exception as e:
+                failures += 1
+                if failures <= 3:
+                    LOGGER.warning(f"Benchmark op failed: {e}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        for i in range(ops):
+            await one(i)
+    else:
+        await asyncio.gather(*(one(i) for i in range(ops)))
+    return latencies, time.perf_counter() - started, failures
+
+
+async def measure_allocations(prepare, ops: int) -> dict:
+    """tracemalloc으로 연산당 피크/잔존 메모리 (시간 측정과 별도 패스)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    peak_total = 0
+    for i in range(ops):
+        op = prepare(i)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            await op()
+        except Exception:
+            pass
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    retained = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return {
+        "peak_kib_per_op": round(peak_total / ops / 1024, 1),
+        "retained_b_per_op": round(retained / ops),
+        "blocks_per_op": round(blocks / ops, 1),
+    }
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * p), len(values) - 1)] if values else 0.0
+
+
+async def run_scenario(name: str, world: World, args) -> dict:
+    prepare = make_scenario(name, world)
+    ops = args.ops
+    concurrency = args.concurrency
+
+    if name == "restore":
+        # 한 번 = 플레이어 전부 복원. 라운드마다 저장 -> 끊기 후 측정
+        ops = args.restore_rounds
+        concurrency = 1
+        latencies, elapsed, failures = [], 0.0, 0
+        for i in range(ops):
+            await world.bot._save_playback_states()
+            await world.disconnect_players()
+            result = await run_ops(lambda _i: prepare(i), 1, 1)
+            latencies += result[0]
+            elapsed += result[1]
+            failures += result[2]
+            await world.settle()
+        allocations = {}
+    else:
+        # 워밍업 (캐시, 레이아웃 첫 생성 등)
+        await run_ops(prepare, min(ops, 10), 1)
+        latencies, elapsed, failures = await run_ops(prepare, ops, concurrency)
+        await world.settle()
+        allocations = await measure_allocations(prepare, min(ops, args.alloc_ops))
+        await world.settle()
+
+    return {
+        "scenario": name,
+        "ops": ops,
+        "concurrency": concurrency,
+        "failures": failures,
+        "ops_per_s": round(ops / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        **allocations,
+    }
+
+
+def print_report(results: list, args, world: World):
+    print(
+        f"guilds={args.guilds} players={args.players} queue={args.queue} "
+        f"concurrency={args.concurrency} lavalink_latency={args.lavalink_latency}ms "
+        f"redis={'on' if args.redis else 'off'}"
+    )
+    header = (
+        f"{'scenario':<14}{'ops':>6}{'fail':>6}{'ops/s':>10}{'p50 ms':>10}"
+        f"{'p99 ms':>10}{'peak KiB':>10}{'kept B':>9}{'blocks':>8}"
+    )
+    print(header)
+    for r in results:
+        print(
+            f"{r['scenario']:<14}{r['ops']:>6}{r['failures']:>6}{r['ops_per_s']:>10}"
+            f"{r['p50_ms']:>10}{r['p99_ms']:>10}"
+            f"{r.get('peak_kib_per_op', '-'):>10}{r.get('retained_b_per_op', '-'):>9}"
+            f"{r.get('blocks_per_op', '-'):>8}"
+        )
+    requests = sum((server.requests for server in world.lavalink_servers), Counter())
+    print(f"lavalink requests: {dict(requests)}")
+    if len(world.lavalink_servers) > 1:
+        for node in node_pool.metrics():
+            print(
+                f"  {node['name']} ({node['role']}): placements={node['placements']} "
+                f"searches={node['searches']}"
+            )
+    print(f"discord api calls: {dict(world.bot.api_calls)}")
+
+
+async def main_async(args):
+    world = World(args)
+    bind_bot_methods(world.bot, load_bot_class())
+    await world.start()
+    try:
+        results = []
+        for name in args.scenarios:
+            results.append(await run_scenario(name, world, args))
+    finally:
+        await world.close()
+
+    print_report(results, args, world)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--members", type=int, default=3, help="음성 채널당 청취자")
+    parser.add_argument("--queue", type=int, default=10, help="플레이어당 초기 큐 길이")
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--alloc-ops", type=int, default=100)
+    parser.add_argument("--restore-rounds", type=int, default=3)
+    parser.add_argument("--nodes", type=int, default=1, help="가짜 Lavalink 노드 수")
+    parser.add_argument(
+        "--search-nodes", type=int, default=0, help="검색 전용 가짜 노드 수"
+    )
+    parser.add_argument(
+        "--lavalink-latency", type=float, default=0.0, help="loadtracks 지연 (ms)"
+    )
+    parser.add_argument("--redis", action="store_true", help="REDIS_HOST 사용")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        LOGGER.setLevel(logging.WARNING)
+        logging.getLogger("lavalink").setLevel(logging.WARNING)
+    if args.players > args.guilds:
+        sys.exit("--players must not exceed --guilds")
+    if args.nodes < 2 and "migrate" in args.scenarios:
+        print("Skipping migrate scenario (needs --nodes 2 or more)")
+        args.scenarios.remove("migrate")
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
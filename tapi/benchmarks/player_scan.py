@@ -0,0 +1,96 @@
+"""활성 플레이어 순회 벤치마크
+
+샤드 길드 수에 따라 self.guilds 전체를 돌며 player_manager.get 하는 기존 방식과
+player_registry 로 활성 플레이어만 도는 방식의 1회 순회 시간을 비교한다.
+Discord/Lavalink 연결 없이 가짜 봇으로 실행된다.
+
+    python -m tapi.benchmarks.player_scan --players 300 --guilds 1000 10000 50000
+"""
+
+import time
+import argparse
+from types import SimpleNamespace
+
+from tapi.utils.player_registry import ActivePlayerRegistry
+
+
+def make_bot(guild_count: int, player_count: int):
+    guilds = [
+        SimpleNamespace(id=guild_id, voice_client=None)
+        for guild_id in range(guild_count)
+    ]
+    # 길드 전체에 고르게 흩어진 활성 플레이어
+    step = max(guild_count // max(player_count, 1), 1)
+    players = {
+        guild.id: SimpleNamespace(guild_id=guild.id, is_connected=True)
+        for guild in guilds[::step][:player_count]
+    }
+    for guild_id in players:
+        guilds[guild_id].voice_client = SimpleNamespace(guild=guilds[guild_id])
+
+    by_id = {guild.id: guild for guild in guilds}
+    return SimpleNamespace(
+        guilds=guilds,
+        get_guild=by_id.get,
+        voice_clients=[guild.voice_client for guild in guilds if guild.voice_client],
+        lavalink=SimpleNamespace(
+            player_manager=SimpleNamespace(get=players.get, players=players)
+        ),
+    )
+
+
+def full_scan(bot) -> int:
+    """기존 방식"""
+    count = 0
+    for guild in bot.guilds:
+        player = bot.lavalink.player_manager.get(guild.id)
+        if player and player.is_connected:
+            count += 1
+    return count
+
+
+def registry_scan(bot, registry) -> int:
+    count = 0
+    for _guild, player in registry.players(bot):
+        if player and player.is_connected:
+            count += 1
+    return count
+
+
+def measure(rounds: int, func) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1000  # ms
+
+
+def run(guild_counts: list, player_count: int, rounds: int):
+    print(f"{player_count} active players, {rounds} rounds")
+    print(f"{'guilds':>10}{'full scan ms':>15}{'registry ms':>15}{'speedup':>10}")
+    for guild_count in guild_counts:
+        bot = make_bot(guild_count, player_count)
+        registry = ActivePlayerRegistry()
+        registry.reconcile(bot)
+        assert full_scan(bot) == registry_scan(bot, registry)
+
+        full_ms = measure(rounds, lambda: full_scan(bot))
+        registry_ms = measure(rounds, lambda: registry_scan(bot, registry))
+        print(
+            f"{guild_count:>10}{full_ms:>15.3f}{registry_ms:>15.3f}"
+            f"{full_ms / registry_ms:>9.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--guilds", type=int, nargs="+", default=[1000, 10000, 50000, 100000]
+    )
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    run(args.guilds, args.players, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
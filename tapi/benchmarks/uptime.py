@@ -0,0 +1,129 @@
+"""업타임 기록/요약 Redis 벤치마크
+
+서비스별로 명령을 하나씩 보내던 기존 방식과
+스크립트 한 번(record_uptime_checks) / 파이프라인 한 번(get_uptime_summaries) 방식을 비교한다.
+bench_ 접두사 서비스 키만 사용하고 끝나면 삭제한다.
+
+    python -m tapi.benchmarks.uptime --rounds 200 --days 7
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+from tapi.utils.redis_manager import redis_manager
+
+SERVICES = [
+    f"bench_{name}" for name in ("shard_0", "shard_1", "bot", "lavalink", "web", "api")
+]
+
+
+async def legacy_record(client, service, date_str, check_index, is_up):
+    """기존 구현: 서비스당 SETBIT, SADD, INCR, TTL/EXPIRE x3"""
+    bitmap_key = f"{redis_manager.UPTIME_CHECK_PREFIX}{service}:{date_str}"
+    count_key = f"{redis_manager.UPTIME_COUNT_PREFIX}{service}:{date_str}"
+    seen_key = f"{redis_manager.UPTIME_SEEN_PREFIX}{service}:{date_str}"
+
+    await client.setbit(bitmap_key, check_index, 1 if is_up else 0)
+    if await client.sadd(seen_key, check_index):
+        await client.incr(count_key)
+    for key in (bitmap_key, count_key, seen_key):
+        if await client.ttl(key) < 0:
+            await client.expire(key, redis_manager.UPTIME_TTL)
+
+
+async def legacy_summary(client, service, date_str):
+    """기존 구현: 서비스/날짜당 BITCOUNT + GET"""
+    up_checks = await client.bitcount(
+        f"{redis_manager.UPTIME_CHECK_PREFIX}{service}:{date_str}"
+    )
+    total_checks = await client.get(
+        f"{redis_manager.UPTIME_COUNT_PREFIX}{service}:{date_str}"
+    )
+    return {"up_checks": up_checks, "total_checks": int(total_checks or 0)}
+
+
+async def measure(rounds, func):
+    timings = []
+    for i in range(rounds):
+        started = time.perf_counter()
+        await func(i)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": statistics.fmean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+async def run(rounds: int, days: int):
+    if not await redis_manager.connect():
+        raise SystemExit("Redis에 연결할 수 없습니다.")
+    client = redis_manager.get_async_client()
+    dates = [f"2000-01-{day + 1:02d}" for day in range(days)]
+
+    async def legacy_cycle(i):
+        for service in SERVICES:
+            await legacy_record(client, service, dates[0], i % 288, i % 2 == 0)
+
+    async def batched_cycle(i):
+        await redis_manager.record_uptime_checks(
+            dates[0], i % 288, {service: i % 2 == 0 for service in SERVICES}
+        )
+
+    async def legacy_read(_):
+        for date_str in dates:
+            for service in SERVICES:
+                await legacy_summary(client, service, date_str)
+
+    async def batched_read(_):
+        await redis_manager.get_uptime_summaries(SERVICES, dates)
+
+    try:
+        results = {
+            "record (legacy)": await measure(rounds, legacy_cycle),
+            "record (script)": await measure(rounds, batched_cycle),
+            f"summary {days}d (legacy)": await measure(rounds, legacy_read),
+            f"summary {days}d (pipeline)": await measure(rounds, batched_read),
+        }
+
+        # 두 방식의 결과가 같은지 확인
+        legacy = {
+            date_str: {
+                service: await legacy_summary(client, service, date_str)
+                for service in SERVICES
+            }
+            for date_str in dates
+        }
+        assert legacy == await redis_manager.get_uptime_summaries(SERVICES, dates)
+    finally:
+        keys = [
+            key
+            for service in SERVICES
+            for date_str in dates
+            for key in redis_manager._uptime_keys(service, date_str)
+        ]
+        await client.delete(*keys)
+        await redis_manager.close()
+
+    print(f"{len(SERVICES)} services, {rounds} rounds")
+    print(f"{'case':<28}{'mean':>10}{'p50':>10}{'p99':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<28}{result['mean_ms']:>10.3f}"
+            f"{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds, args.days))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""웹 대시보드 명령 경로 부하 생성기 (Redis)
+
+대시보드처럼 명령을 발행하고 bot:response:{request_id} 응답이 올 때까지의
+종단 간 지연을 잰다. 경로: bot:command:{shard} (Pub/Sub 브리지) -> 명령 스트림
+-> _process_command -> dispatch_command -> bot:response:{id} + bot:player_update
+
+- 명령 비율(--mix)대로 목표 속도(--rate)로 발행한다. 응답을 기다리지 않는 open-loop이고
+  지연은 예정 발행 시각부터 재므로 봇이 밀려도 지연이 과소 측정되지 않는다.
+- 발행 후 --timeout 안에 응답이 없으면 dropped
+- bot:player_update 는 길드별 버전(v) 건너뜀을 센다
+- --json 보고서는 키가 정렬된 고정 형식이라 CI에서 커밋 간 diff 할 수 있다.
+  --baseline 으로 이전 보고서와 비교하고, --max-regression 을 넘으면 종료 코드 1
+
+모드
+- all (기본): 한 프로세스에서 가짜 Lavalink + 가짜 Discord 봇(hot_paths.World)과
+  명령 리스너를 띄우고 부하를 건다
+- bot: 봇만 띄우고 대기 (다른 프로세스에서 --mode load 로 부하)
+- load: 부하만 건다. 대상 길드/사용자 ID는 fake_discord 규칙(guild_id_for, listener_id)
+
+    python -m tapi.benchmarks.web_load --rate 200 --duration 30 --json web_load.json
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+import argparse
+from collections import Counter, defaultdict
+
+import redis.asyncio as aioredis
+
+from tapi import LOGGER
+from tapi.benchmarks.fake_discord import guild_id_for, listener_id
+from tapi.utils.redis_codec import decode
+from tapi.utils.redis_command_listener import (
+    LEGACY_COMMAND_CHANNEL,
+    command_channel,
+    command_stream_for,
+)
+from tapi.utils.command_stream import COMMAND_STREAM_MAXLEN
+
+DEFAULT_MIX = "get_state=40,volume=15,search=10,play=8,pause=8,skip=7,seek=7,move=5"
+RESPONSE_PREFIX = b"bot:response:"
+PLAYER_UPDATE_CHANNEL = b"bot:player_update"
+REPORT_VERSION = 1
+
+
+def parse_mix(text: str) -> dict:
+    """'get_state=40,play=10' -> {명령: 가중치}"""
+    mix = {}
+    for part in text.split(","):
+        command, _, weight = part.strip().partition("=")
+        if command:
+            mix[command] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError(f"Invalid command mix: {text}")
+    return mix
+
+
+def command_params(command: str, n: int, rng: random.Random) -> dict:
+    """명령별 대시보드와 같은 형태의 파라미터"""
+    if command == "volume":
+        return {"volume": rng.randint(10, 100)}
+    if command == "play":
+        return {"query": f"load play {n}"}
+    if command == "search":
+        return {"query": f"load search {n}"}
+    if command == "seek":
+        return {"position": rng.randint(0, 120000)}
+    if command == "move":
+        return {"from_index": 1, "to_index": 0}
+    return {}
+
+
+def percentile(values: list, p: float) -> float:
+    return values[min(int(len(values) * p), len(values) - 1)] if values else 0.0
+
+
+def summarize(latencies: list) -> dict:
+    values = sorted(latencies)
+    return {
+        "p50_ms": round(percentile(values, 0.5) * 1000, 2),
+        "p90_ms": round(percentile(values, 0.9) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+class LoadGenerator:
+    """명령 발행 + 응답/플레이어 업데이트 수신"""
+
+    def __init__(self, args):
+        self.args = args
+        self.mix = parse_mix(args.mix)
+        self.rng = random.Random(args.seed)
+        self.targets = [
+            (guild_id_for(i), listener_id(guild_id_for(i))) for i in range(args.players)
+        ]
+        self.client = aioredis.Redis(host=args.redis_host, port=args.redis_port)
+        self.pubsub = None
+
+        self.pending: dict[str, tuple] = {}  # request_id -> (명령, 예정 시각)
+        self.sent = Counter()
+        self.ok = Counter()
+        self.errors: dict[str, Counter] = defaultdict(Counter)
+        self.latencies: dict[str, list] = defaultdict(list)
+        self.schedule_lag = []  # 예정 시각보다 늦게 발행한 시간 (생성기 자체 한계)
+        self.updates = Counter()
+        self.update_versions: dict[str, int] = {}
+        self.version_gaps = 0
+        self.elapsed = 0.0
+
+    async def start(self):
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.psubscribe(RESPONSE_PREFIX + b"*")
+        await self.pubsub.subscribe(PLAYER_UPDATE_CHANNEL)
+        self._receiver = asyncio.create_task(self._receive())
+
+    async def close(self):
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except asyncio.CancelledError:
+            pass
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+    async def _receive(self):
+        while True:
+            message = await self.pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=1.0
+            )
+            if message is None:
+                continue
+            received = time.perf_counter()
+            channel = message["channel"]
+            if channel == PLAYER_UPDATE_CHANNEL:
+                self._on_player_update(message["data"])
+            elif channel.startswith(RESPONSE_PREFIX):
+                request_id = channel[len(RESPONSE_PREFIX) :].decode()
+                entry = self.pending.pop(request_id, None)
+                if entry is not None:
+                    self._on_response(entry, message["data"], received)
+
+    def _on_response(self, entry, raw, received: float):
+        command, scheduled = entry
+        self.latencies[command].append(received - scheduled)
+        try:
+            result = decode(raw)
+        except ValueError:
+            result = {"success": False, "error": "Undecodable response"}
+        if result.get("success"):
+            self.ok[command] += 1
+        else:
+            self.errors[command][result.get("error") or "unknown"] += 1
+
+    def _on_player_update(self, raw):
+        try:
+            update = decode(raw)
+        except ValueError:
+            return
+        guild_id = update.get("guild_id")
+        self.updates[update.get("event") or "unknown"] += 1
+        version = update.get("v")
+        if guild_id is None or version is None:
+            return
+        previous = self.update_versions.get(guild_id)
+        if previous is not None and version > previous + 1:
+            self.version_gaps += version - previous - 1
+        self.update_versions[guild_id] = max(version, previous or 0)
+
+    def _message(self, n: int) -> tuple:
+        commands = list(self.mix)
+        command = self.rng.choices(commands, weights=list(self.mix.values()))[0]
+        guild_id, user_id = self.targets[n % len(self.targets)]
+        data = {
+            "request_id": uuid.uuid4().hex,
+            "command": command,
+            "guild_id": str(guild_id),
+            "user_id": str(user_id),
+            "params": command_params(command, n, self.rng),
+        }
+        return command, guild_id, data
+
+    async def _send(self, command: str, guild_id: int, data: dict):
+        raw = json.dumps(data)
+        transport = self.args.transport
+        if transport == "stream":
+            stream = command_stream_for(command, guild_id, self.args.shard_count)
+            await self.client.xadd(
+                stream, {"data": raw}, maxlen=COMMAND_STREAM_MAXLEN, approximate=True
+            )
+        elif transport == "legacy":
+            await self.client.publish(LEGACY_COMMAND_CHANNEL, raw)
+        else:
+            channel = command_channel(command, guild_id, self.args.shard_count)
+            await self.client.publish(channel, raw)
+
+    async def run(self):
+        """목표 속도로 발행 후 남은 응답을 --timeout 까지 기다린다"""
+        total = int(self.args.rate * self.args.duration)
+        interval = 1 / self.args.rate
+        started = time.perf_counter()
+        for n in range(total):
+            scheduled = started + n * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self.schedule_lag.append(-delay)
+
+            command, guild_id, data = self._message(n)
+            self.pending[data["request_id"]] = (command, scheduled)
+            self.sent[command] += 1
+            await self._send(command, guild_id, data)
+
+        deadline = time.perf_counter() + self.args.timeout
+        while self.pending and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        self.elapsed = time.perf_counter() - started
+
+    def report(self) -> dict:
+        dropped = Counter(command for command, _ in self.pending.values())
+        commands = {}
+        for command in sorted(self.sent):
+            commands[command] = {
+                "sent": self.sent[command],
+                "ok": self.ok[command],
+                "errors": dict(sorted(self.errors[command].items())),
+                "dropped": dropped[command],
+                **summarize(self.latencies[command]),
+            }
+
+        all_latencies = [
+            value for values in self.latencies.values() for value in values
+        ]
+        sent = sum(self.sent.values())
+        return {
+            "version": REPORT_VERSION,
+            "config": {
+                "rate": self.args.rate,
+                "duration": self.args.duration,
+                "players": self.args.players,
+                "mix": self.mix,
+                "transport": self.args.transport,
+                "seed": self.args.seed,
+            },
+            "total": {
+                "sent": sent,
+                "ok": sum(self.ok.values()),
+                "errors": sum(sum(c.values()) for c in self.errors.values()),
+                "dropped": sum(dropped.values()),
+                "achieved_rate": round(sent / self.elapsed, 1) if self.elapsed else 0.0,
+                "schedule_lag_max_ms": round(
+                    max(self.schedule_lag, default=0) * 1000, 2
+                ),
+                **summarize(all_latencies),
+            },
+            "commands": commands,
+            "player_updates": {
+                "received": dict(sorted(self.updates.items())),
+                "version_gaps": self.version_gaps,
+            },
+        }
+
+
+def print_report(report: dict, baseline: dict = None):
+    total = report["total"]
+    config = report["config"]
+    print(
+        f"rate={config['rate']}/s duration={config['duration']}s "
+        f"players={config['players']} transport={config['transport']} "
+        f"achieved={total['achieved_rate']}/s"
+    )
+    print(
+        f"{'command':<12}{'sent':>7}{'ok':>7}{'err':>6}{'drop':>6}"
+        f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        + (f"{'Δp50':>9}{'Δp99':>9}" if baseline else "")
+    )
+    rows = [*report["commands"].items(), ("TOTAL", total)]
+    base_rows = {}
+    if baseline:
+        base_rows = {**baseline.get("commands", {}), "TOTAL": baseline.get("total", {})}
+    for name, row in rows:
+        errors = (
+            row["errors"]
+            if isinstance(row["errors"], int)
+            else sum(row["errors"].values())
+        )
+        line = (
+            f"{name:<12}{row['sent']:>7}{row['ok']:>7}{errors:>6}{row['dropped']:>6}"
+            f"{row['p50_ms']:>10}{row['p90_ms']:>10}{row['p99_ms']:>10}"
+            f"{row['max_ms']:>10}"
+        )
+        if baseline:
+            base = base_rows.get(name, {})
+            line += f"{_delta(row['p50_ms'], base.get('p50_ms')):>9}"
+            line += f"{_delta(row['p99_ms'], base.get('p99_ms')):>9}"
+        print(line)
+
+    for name, row in report["commands"].items():
+        for error, count in row["errors"].items():
+            print(f"  {name}: {error} x{count}")
+    updates = report["player_updates"]
+    print(
+        f"player updates: {updates['received']} version gaps={updates['version_gaps']}"
+    )
+    if "bot" in report:
+        print(f"bot: {report['bot']}")
+
+
+def _delta(value: float, base: float) -> str:
+    if not base:
+        return "-"
+    return f"{(value - base) / base * 100:+.0f}%"
+
+
+def regressions(report: dict, baseline: dict, max_regression: float) -> list:
+    """기준 보고서 대비 p99 증가율 초과 / dropped 증가 항목"""
+    problems = []
+    total, base = report["total"], baseline.get("total", {})
+    if base.get("p99_ms") and total["p99_ms"] > base["p99_ms"] * (
+        1 + max_regression / 100
+    ):
+        problems.append(f"p99 {base['p99_ms']}ms -> {total['p99_ms']}ms")
+    if total["dropped"] > base.get("dropped", 0):
+        problems.append(f"dropped {base.get('dropped', 0)} -> {total['dropped']}")
+    return problems
+
+
+class BotProcess:
+    """가짜 Lavalink + 가짜 봇 + Redis 명령 리스너"""
+
+    def __init__(self, args):
+        from tapi.benchmarks.hot_paths import World
+
+        self.world = World(
+            argparse.Namespace(
+                guilds=max(args.guilds, args.players),
+                players=args.players,
+                members=3,
+                queue=args.queue,
+                lavalink_latency=args.lavalink_latency,
+                nodes=1,
+                search_nodes=0,
+                redis=True,
+            )
+        )
+        self._listener = None
+
+    async def start(self):
+        from tapi.utils.redis_manager import redis_manager
+        from tapi.utils.redis_command_listener import (
+            start_command_listener,
+            COMMAND_CHANNEL_PREFIX,
+        )
+
+        await self.world.start()
+        self._listener = asyncio.create_task(start_command_listener(self.world.bot))
+
+        # 브리지가 구독하고 스트림 컨슈머 그룹이 생길 때까지 대기 (그 전 명령은 유실)
+        client = redis_manager.get_async_client()
+        channel = f"{COMMAND_CHANNEL_PREFIX}{self.world.bot.shard_id}"
+        for _ in range(100):
+            subscribed = dict(await client.pubsub_numsub(channel)).get(channel, 0)
+            if subscribed and self._consumer_ready():
+                return
+            await asyncio.sleep(0.05)
+        raise RuntimeError("Web command listener did not start")
+
+    @staticmethod
+    def _consumer_ready() -> bool:
+        from tapi.utils.command_stream import command_stream
+
+        return command_stream.consumer is not None
+
+    def metrics(self) -> dict:
+        from tapi.utils.command_stream import command_stream
+
+        stream = command_stream.metrics()
+        dispatcher = stream.pop("dispatcher")
+        return {
+            "stream_expired": stream["expired"],
+            "stream_failed": stream["failed"],
+            "dispatcher_timeouts": dispatcher["timeouts"],
+            "dispatcher_failed": dispatcher["failed"],
+        }
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+        await self.world.close()
+
+
+async def main_async(args) -> int:
+    bot = None
+    if args.mode in ("all", "bot"):
+        bot = BotProcess(args)
+        await bot.start()
+    try:
+        if args.mode == "bot":
+            print(
+                f"Bot ready: {args.players} players from guild {guild_id_for(0)}, "
+                "run --mode load from another process (Ctrl+C to stop)"
+            )
+            await asyncio.Event().wait()
+
+        generator = LoadGenerator(args)
+        await generator.start()
+        try:
+            await generator.run()
+        finally:
+            await generator.close()
+    finally:
+        if bot is not None:
+            await bot.close()
+
+    report = generator.report()
+    if bot is not None:
+        report["bot"] = bot.metrics()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if baseline is not None:
+        problems = regressions(report, baseline, args.max_regression)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        if problems:
+            return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("all", "bot", "load"), default="all")
+    parser.add_argument("--rate", type=float, default=100, help="초당 명령 수")
+    parser.add_argument("--duration", type=float, default=20, help="발행 시간 (초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="명령=가중치,...")
+    parser.add_argument("--players", type=int, default=50, help="명령 대상 길드 수")
+    parser.add_argument("--guilds", type=int, default=1000, help="봇 길드 수 (bot/all)")
+    parser.add_argument("--queue", type=int, default=10)
+    parser.add_argument(
+        "--lavalink-latency", type=float, default=0.0, help="loadtracks 지연 (ms)"
+    )
+    parser.add_argument(
+        "--transport",
+        choices=("pubsub", "legacy", "stream"),
+        default="pubsub",
+        help="bot:command:{shard} / bot:command / 명령 스트림 직접",
+    )
+    parser.add_argument("--shard-count", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=25, help="응답 대기 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--redis-host", default=os.getenv("REDIS_HOST", "localhost"))
+    parser.add_argument("--redis-port", type=int, default=6379)
+    parser.add_argument("--json", help="보고서를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 이전 보고서 JSON")
+    parser.add_argument(
+        "--max-regression", type=float, default=20, help="허용 p99 증가율 (%%)"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        LOGGER.setLevel(logging.WARNING)
+        logging.getLogger("lavalink").setLevel(logging.WARNING)
+    if args.rate <= 0 or args.players <= 0:
+        sys.exit("--rate and --players must be positive")
+
+    try:
+        sys.exit(asyncio.run(main_async(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,8 @@
 import discord
 import lavalink
-from tapi import (
-    LOGGER,
-    HOST,
-    PSW,
-    REGION,
-    PORT,
-)
+from tapi import LOGGER
+from tapi.utils.node_pool import node_pool
+from tapi.utils.player_registry import player_registry
 
 
 class AudioConnection(discord.VoiceClient):
@@ -27,9 +23,7 @@ class AudioConnection(discord.VoiceClient):
             # We store it in `self.client` so that it may persist across cog reloads,
             # however this is not mandatory.
             self.client.lavalink = lavalink.Client(client.user.id)
-            self.client.lavalink.add_node(
-                host=HOST, port=PORT, password=PSW, region=REGION, name="default-node"
-            )
+            node_pool.register(self.client.lavalink)
 
         # Create a shortcut to the Lavalink client here.
         self.lavalink = self.client.lavalink
@@ -73,7 +67,8 @@ class AudioConnection(discord.VoiceClient):
         if it doesn't exist yet.
         """
         # ensure there is a player_manager when creating a new voice_client
-        self.lavalink.player_manager.create(guild_id=self.channel.guild.id)
+        node_pool.create_player(self.lavalink, self.channel.guild.id)
+        player_registry.add(self.channel.guild.id)
         await self.channel.guild.change_voice_state(
             channel=self.channel, self_mute=self_mute, self_deaf=self_deaf
         )
@@ -116,7 +111,10 @@ class AudioConnection(discord.VoiceClient):
         # 웹 대시보드에 disconnect 상태 전파
         try:
             from tapi.utils.redis_manager import redis_manager
+            from tapi.utils.player_state_stream import player_state_stream
 
+            # 연결 종료는 항상 전체 상태로 보내고 길드 상태를 비움
+            player_state_stream.request_snapshot(self.guild_id)
             await redis_manager.publish_player_update(
                 self.guild_id,
                 "disconnect",
@@ -134,6 +132,7 @@ class AudioConnection(discord.VoiceClient):
                     "channel_name": "",
                 },
             )
+            player_state_stream.reset(self.guild_id)
         except Exception as e:
             LOGGER.debug(f"Failed to publish disconnect state: {e}")
 
@@ -149,3 +148,4 @@ class AudioConnection(discord.VoiceClient):
             await self.lavalink.player_manager.destroy(self.guild_id)
         except lavalink.errors.ClientError:
             pass
+        player_registry.discard(self.guild_id)
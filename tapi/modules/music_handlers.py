@@ -10,7 +10,11 @@ import lavalink
 from lavalink.events import TrackStartEvent, QueueEndEvent, TrackExceptionEvent
 
 from tapi import LOGGER
-from tapi.utils.database import Database
+from tapi.utils.database import AsyncDatabase
+from tapi.utils.panel_scheduler import panel_scheduler
+from tapi.utils.metrics import PANEL_EDITS
+from tapi.utils.player_registry import player_registry
+from tapi.utils.node_pool import node_pool
 from tapi.modules.music_views import MusicControlLayout
 from tapi.utils.v2_components import (
     make_themed_container,
@@ -30,6 +34,9 @@ class MusicHandlers:
 
     async def _cleanup_music_message(self, guild_id: int, reason: str = "cleanup"):
         """음악 메시지 정리 함수"""
+        # 대기 중인 패널 편집은 더 이상 필요 없음
+        panel_scheduler.cancel(guild_id)
+
         if guild_id not in self.music_cog.last_music_messages:
             return
 
@@ -113,6 +120,7 @@ class MusicHandlers:
     @lavalink.listener(TrackStartEvent)
     async def on_track_start(self, event: TrackStartEvent):
         guild_id = event.player.guild_id
+        player_registry.add(guild_id)
         # 새 트랙 시작 시 대기 중인 퇴장 타이머 취소
         self._cancel_disconnect_task(guild_id)
         channel_id = event.player.fetch("channel")
@@ -147,7 +155,7 @@ class MusicHandlers:
             # duration을 밀리초에서 초로 변환
             duration_seconds = track.duration // 1000
 
-            Database().set_statistics(
+            await AsyncDatabase().set_statistics(
                 date=date,
                 time_str=time,
                 guild_id=str(guild.id),
@@ -220,13 +228,20 @@ class MusicHandlers:
             existing_message = self.music_cog.last_music_messages.get(guild_id)
             try:
                 if existing_message is not None:
+                    # 곡 변경 편집이 우선 — 대기 중인 편집(이전 곡 상태)은 버림
+                    panel_scheduler.supersede(guild_id)
                     try:
                         await existing_message.edit(view=control_layout)
+                        PANEL_EDITS.inc(path="track_start", outcome="sent")
                         LOGGER.debug(f"Edited existing music message for guild {guild_id}")
                         return existing_message
                     except discord.NotFound:
                         # 메시지가 이미 삭제됨 → 새로 전송
+                        PANEL_EDITS.inc(path="track_start", outcome="not_found")
                         self.music_cog.last_music_messages.pop(guild_id, None)
+                    except discord.HTTPException:
+                        PANEL_EDITS.inc(path="track_start", outcome="failed")
+                        raise
 
                 message = await channel.send(view=control_layout)
                 self.music_cog.last_music_messages[guild_id] = message
@@ -261,8 +276,7 @@ class MusicHandlers:
         if not (guild and guild.voice_client):
             return
 
-        db = Database()
-        if db.get_instant_disconnect(guild_id):
+        if await AsyncDatabase().get_instant_disconnect(guild_id):
             await self._full_disconnect_cleanup(guild_id, reason)
             return
 
@@ -390,8 +404,7 @@ class MusicHandlers:
 
         # 봇만 남아있다면 연결 해제
         if len(non_bot_members) == 0:
-            db = Database()
-            if db.get_instant_disconnect(guild.id):
+            if await AsyncDatabase().get_instant_disconnect(guild.id):
                 # 즉시 퇴장
                 try:
                     await self._full_disconnect_cleanup(
@@ -439,7 +452,7 @@ class MusicHandlers:
         MESSAGE_CONTENT_INTENT 가 활성화된 경우에만 on_message 에서 호출됨.
         """
         # 봇 전용 채널 확인
-        bot_channel_id = Database().get_channel(message.guild.id)
+        bot_channel_id = await AsyncDatabase().get_channel(message.guild.id)
         if not bot_channel_id or message.channel.id != bot_channel_id:
             return
 
@@ -470,7 +483,7 @@ class MusicHandlers:
 
             # 플레이어 생성 또는 가져오기
             existing_player = self.bot.lavalink.player_manager.get(message.guild.id)
-            player = self.bot.lavalink.player_manager.create(message.guild.id)
+            player = node_pool.create_player(self.bot.lavalink, message.guild.id)
 
             # 새 플레이어면 DB 설정 적용
             if existing_player is None:
@@ -544,8 +557,7 @@ class MusicHandlers:
             )
 
             # Check autodel setting
-            db = Database()
-            if db.get_autodel(message.guild.id):
+            if await AsyncDatabase().get_autodel(message.guild.id):
                 await message.channel.send(view=notify_layout, delete_after=15)
             else:
                 await message.channel.send(view=notify_layout)
@@ -9,7 +9,9 @@ from tapi import (
     INFO_COLOR,
 )
 from tapi.utils.language import get_lan
-from tapi.utils.database import Database
+from tapi.utils.database import AsyncDatabase
+from tapi.utils.panel_scheduler import panel_scheduler
+from tapi.utils.metrics import PANEL_EDITS
 from tapi.utils.embed import format_text_with_limit, get_track_thumbnail
 from tapi.utils.v2_components import (
     make_themed_container,
@@ -180,7 +182,7 @@ class QueueSelect(ui.Select):
 
             if original_loop == 1:
                 self.player.set_loop(1)
-                Database().set_loop(self.guild_id, 1)
+                await AsyncDatabase().set_loop(self.guild_id, 1)
 
         except Exception as e:
             LOGGER.error(f"Error skipping to queue position: {e}")
@@ -325,7 +327,7 @@ class MusicButton(ui.Button):
         elif self.action == "skip":
             if player.loop == 1:
                 player.set_loop(2)
-                Database().set_loop(view.guild_id, 2)
+                await AsyncDatabase().set_loop(view.guild_id, 2)
             view.cog._save_user_locale(interaction)
             await player.skip()
             return  # on_track_start가 새 메시지를 보냄
@@ -357,16 +359,18 @@ class MusicButton(ui.Button):
         elif self.action == "repeat":
             next_loop = (player.loop + 1) % 3
             player.set_loop(next_loop)
-            Database().set_loop(view.guild_id, player.loop)
+            await AsyncDatabase().set_loop(view.guild_id, player.loop)
 
         elif self.action == "shuffle":
             player.set_shuffle(not player.shuffle)
-            Database().set_shuffle(view.guild_id, player.shuffle)
+            await AsyncDatabase().set_shuffle(view.guild_id, player.shuffle)
 
         # 레이아웃 재빌드 및 업데이트
         new_layout = MusicControlLayout(view.cog, view.guild_id)
         new_layout.build_layout(interaction, player)
         await interaction.edit_original_response(view=new_layout)
+        PANEL_EDITS.inc(path="button", outcome="sent")
+        panel_scheduler.supersede(view.guild_id)
 
         # 웹 대시보드에 상태 변경 전파
         try:
@@ -1,4 +1,5 @@
 import re
+from contextlib import aclosing
 
 import discord
 from discord import app_commands, ui
@@ -10,12 +11,12 @@ from tapi.utils.language import get_lan
 from tapi import (
     LOGGER,
     WARNING_COLOR,
-    HOST,
-    REGION,
-    PORT,
     MESSAGE_CONTENT_INTENT,
 )
-from tapi.utils.database import Database
+from tapi.utils.database import AsyncDatabase
+from tapi.utils.track_resolver import resolve_in_order
+from tapi.utils.track_cache import track_cache
+from tapi.utils.node_pool import node_pool
 from tapi.utils.v2_components import (
     make_themed_container,
     make_separator,
@@ -45,31 +46,9 @@ MAX_PLAYLIST_TRACKS = 20
 # 투표 확인 데코레이터
 async def check_vote(interaction: discord.Interaction):
     """사용자가 투표했는지 확인"""
-    db = Database()
-    if not db.has_voted(interaction.user.id):
-        # 유저 locale 감지 (ko, en, ja 지원)
-        user_locale = str(interaction.locale)
-        if user_locale.startswith("ko"):
-            lang = "ko"
-        elif user_locale.startswith("ja"):
-            lang = "ja"
-        else:
-            lang = "en"
-
-        # 언어 파일에서 메시지 가져오기
-        import json
-
-        try:
-            with open(f"tapi/languages/{lang}.json", encoding="utf-8") as f:
-                language_data = json.load(f)
-            title = language_data.get("vote_required_title", "🗳️ Vote Required!")
-            description = language_data.get(
-                "vote_required_description",
-                "To use TAPI, please vote for us first.\nJust vote once and you can use it forever!",
-            )
-        except Exception:
-            title = "🗳️ Vote Required!"
-            description = "To use TAPI, please vote for us first.\nJust vote once and you can use it forever!"
+    if not await AsyncDatabase().has_voted(interaction.user.id):
+        title = get_lan(interaction, "vote_required_title")
+        description = get_lan(interaction, "vote_required_description")
 
         # V2 투표 요청 레이아웃
         layout = ui.LayoutView(timeout=None)
@@ -164,8 +143,7 @@ class Music(commands.Cog):
     @staticmethod
     async def _setup_player_settings(player, guild_id: int):
         """플레이어 설정 초기화"""
-        db = Database()
-        settings = db.get_guild_settings(guild_id)
+        settings = await AsyncDatabase().get_guild_settings(guild_id)
 
         # 볼륨 설정
         saved_volume = settings.get("volume", 20)
@@ -238,17 +216,15 @@ class Music(commands.Cog):
             existing = interaction.client.lavalink.player_manager.get(
                 interaction.guild.id
             )
-            player = interaction.client.lavalink.player_manager.create(
-                interaction.guild.id
+            player = node_pool.create_player(
+                interaction.client.lavalink, interaction.guild.id
             )
             # 새로 생성된 플레이어만 DB 설정 적용 (기존 플레이어 볼륨 덮어쓰기 방지)
             if existing is None:
                 await Music._setup_player_settings(player, interaction.guild.id)
         except Exception as e:
             LOGGER.error(f"Failed to create player: {e}")
-            LOGGER.error(
-                f"Lavalink connection details: HOST={HOST}, PORT={PORT}, REGION={REGION}"
-            )
+            LOGGER.error(f"Lavalink nodes: {node_pool.metrics()}")
             raise
 
         # Commands that require the bot to join a voicechannel
@@ -360,7 +336,10 @@ class Music(commands.Cog):
         nofind = 0
 
         while True:
-            results = await player.node.get_tracks(current_query)
+            # 재시도는 빈 결과 캐시를 건너뛰고 다시 조회
+            results = await track_cache.get_tracks(
+                player.node, current_query, fresh=nofind > 0
+            )
 
             if results.load_type == LoadType.EMPTY or not results or not results.tracks:
                 nofind += 1
@@ -521,7 +500,7 @@ class Music(commands.Cog):
             )
 
         query = f"ytsearch:{query}"
-        results = await player.node.get_tracks(query)
+        results = await track_cache.get_tracks(player.node, query)
 
         if not results or not results.tracks:
             return await send_temp_status(
@@ -673,7 +652,7 @@ class Music(commands.Cog):
             return await send_temp_v2(interaction, layout)
 
         await player.set_volume(volume)
-        Database().set_volume(interaction.guild.id, volume)
+        await AsyncDatabase().set_volume(interaction.guild.id, volume)
 
         from tapi.utils import volumeicon
 
@@ -689,8 +668,7 @@ class Music(commands.Cog):
 
     async def _play_shared_playlist(self, interaction: discord.Interaction, code: str):
         """공유 코드로 플레이리스트를 큐에 추가"""
-        db = Database()
-        playlist = db.load_playlist_by_code(code)
+        playlist = await AsyncDatabase().load_playlist_by_code(code)
 
         if not playlist:
             text = get_lan(interaction, "playlist_share_not_found")
@@ -722,33 +700,20 @@ class Music(commands.Cog):
         loaded_count = 0
         failed_count = 0
 
-        for track_data in tracks_data:
-            if loaded_count >= remaining:
-                break
-            try:
-                uri = track_data.get("uri")
-                if not uri:
+        # 동시에 해석하되 순서대로 큐에 추가, 첫 곡이 준비되면 바로 재생
+        # (큐가 가득 차면 중단 — aclosing으로 남은 요청 즉시 취소)
+        async with aclosing(resolve_in_order(player.node, tracks_data)) as resolved:
+            async for _, track in resolved:
+                if loaded_count >= remaining:
+                    break
+                if not track:
                     failed_count += 1
                     continue
 
-                results = await player.node.get_tracks(uri)
-
-                if results and results.tracks:
-                    player.add(requester=interaction.user.id, track=results.tracks[0])
-                    loaded_count += 1
-                else:
-                    search_query = f"ytsearch:{track_data.get('title', '')} {track_data.get('author', '')}"
-                    results = await player.node.get_tracks(search_query)
-                    if results and results.tracks:
-                        player.add(
-                            requester=interaction.user.id, track=results.tracks[0]
-                        )
-                        loaded_count += 1
-                    else:
-                        failed_count += 1
-            except Exception as e:
-                LOGGER.error(f"Error resolving shared track: {e}")
-                failed_count += 1
+                player.add(requester=interaction.user.id, track=track)
+                loaded_count += 1
+                if not player.is_playing:
+                    await player.play()
 
         try:
             await loading_msg.delete()
@@ -756,8 +721,6 @@ class Music(commands.Cog):
             pass
 
         if loaded_count > 0:
-            if not player.is_playing:
-                await player.play()
             title = get_lan(interaction, "playlist_share_loaded")
             desc = get_lan(interaction, "playlist_loaded_desc").format(
                 count=loaded_count
@@ -797,6 +760,7 @@ class Music(commands.Cog):
                     "duration": player.current.duration,
                     "identifier": player.current.identifier,
                     "source_name": player.current.source_name,
+                    "encoded": player.current.track,
                 }
             )
 
@@ -814,6 +778,7 @@ class Music(commands.Cog):
                     "duration": track.duration,
                     "identifier": track.identifier,
                     "source_name": track.source_name,
+                    "encoded": track.track,
                 }
             )
 
@@ -822,8 +787,7 @@ class Music(commands.Cog):
                 interaction, "playlist_save_empty", style="error"
             )
 
-        db = Database()
-        result = db.save_playlist(interaction.user.id, tracks_data)
+        result = await AsyncDatabase().save_playlist(interaction.user.id, tracks_data)
 
         if not result:
             text = get_lan(interaction, "playlist_save_error")
@@ -857,8 +821,7 @@ class Music(commands.Cog):
         self._save_user_locale(interaction)
         await interaction.response.defer()
 
-        db = Database()
-        playlist = db.load_playlist(interaction.user.id)
+        playlist = await AsyncDatabase().load_playlist(interaction.user.id)
 
         if not playlist:
             text = get_lan(interaction, "playlist_not_found")
@@ -886,31 +849,16 @@ class Music(commands.Cog):
         loaded_count = 0
         failed_count = 0
 
-        for track_data in tracks_data:
-            try:
-                uri = track_data.get("uri")
-                if not uri:
-                    failed_count += 1
-                    continue
-
-                results = await player.node.get_tracks(uri)
-
-                if results and results.tracks:
-                    player.add(requester=interaction.user.id, track=results.tracks[0])
-                    loaded_count += 1
-                else:
-                    search_query = f"ytsearch:{track_data.get('title', '')} {track_data.get('author', '')}"
-                    results = await player.node.get_tracks(search_query)
-                    if results and results.tracks:
-                        player.add(
-                            requester=interaction.user.id, track=results.tracks[0]
-                        )
-                        loaded_count += 1
-                    else:
-                        failed_count += 1
-            except Exception as e:
-                LOGGER.error(f"Error resolving track: {e}")
+        # 동시에 해석하되 순서대로 큐에 추가, 첫 곡이 준비되면 바로 재생
+        async for _, track in resolve_in_order(player.node, tracks_data):
+            if not track:
                 failed_count += 1
+                continue
+
+            player.add(requester=interaction.user.id, track=track)
+            loaded_count += 1
+            if not player.is_playing:
+                await player.play()
 
         try:
             await loading_msg.delete()
@@ -918,9 +866,6 @@ class Music(commands.Cog):
             pass
 
         if loaded_count > 0:
-            # 첫 번째 트랙 재생 시작
-            if not player.is_playing:
-                await player.play()
             title = get_lan(interaction, "playlist_loaded")
             desc = get_lan(interaction, "playlist_loaded_desc").format(
                 count=loaded_count
@@ -938,9 +883,7 @@ class Music(commands.Cog):
 
         await send_temp_v2(interaction, layout, delete_after=5)
 
-        if not player.is_playing and loaded_count > 0:
-            await player.play()
-        elif loaded_count > 0:
+        if loaded_count > 0:
             await self._publish_web_state(interaction.guild.id, "queue_add")
 
     async def cog_app_command_error(
@@ -5,7 +5,7 @@ from discord.ext import commands
 
 from tapi.utils.language import get_lan
 from tapi import LOGGER
-from tapi.utils.database import Database
+from tapi.utils.database import AsyncDatabase
 from tapi.utils.v2_components import make_themed_container
 
 
@@ -25,10 +25,10 @@ class SettingCmd(commands.Cog):
     )
     async def setting(self, interaction: discord.Interaction, option: str):
         if option == "autodel":
-            db = Database()
-            current_state = db.get_autodel(interaction.guild.id)
+            db = AsyncDatabase()
+            current_state = await db.get_autodel(interaction.guild.id)
             new_state = not current_state
-            db.set_autodel(interaction.guild.id, new_state)
+            await db.set_autodel(interaction.guild.id, new_state)
 
             if new_state:
                 msg = get_lan(interaction, "setting_autodel_result_on")
@@ -38,10 +38,10 @@ class SettingCmd(commands.Cog):
             await interaction.response.send_message(msg, ephemeral=True)
 
         elif option == "instant_disconnect":
-            db = Database()
-            current_state = db.get_instant_disconnect(interaction.guild.id)
+            db = AsyncDatabase()
+            current_state = await db.get_instant_disconnect(interaction.guild.id)
             new_state = not current_state
-            db.set_instant_disconnect(interaction.guild.id, new_state)
+            await db.set_instant_disconnect(interaction.guild.id, new_state)
 
             if new_state:
                 msg = get_lan(interaction, "setting_instant_disconnect_result_on")
@@ -51,12 +51,12 @@ class SettingCmd(commands.Cog):
             await interaction.response.send_message(msg, ephemeral=True)
 
         elif option == "channel":
-            db = Database()
-            current_bot_channel_id = db.get_channel(interaction.guild.id)
+            db = AsyncDatabase()
+            current_bot_channel_id = await db.get_channel(interaction.guild.id)
             current_channel = interaction.channel
 
             if current_bot_channel_id == current_channel.id:
-                db.set_channel(interaction.guild.id, None)
+                await db.set_channel(interaction.guild.id, None)
                 layout = ui.LayoutView(timeout=None)
                 layout.add_item(
                     make_themed_container(
@@ -71,7 +71,7 @@ class SettingCmd(commands.Cog):
                     )
                 )
             else:
-                db.set_channel(interaction.guild.id, current_channel.id)
+                await db.set_channel(interaction.guild.id, current_channel.id)
                 layout = ui.LayoutView(timeout=None)
                 layout.add_item(
                     make_themed_container(
@@ -8,6 +8,8 @@ if not __name__.endswith("sample_config"):
     )
     quit(1)
 
+import os
+
 
 class Config(object):
     TOKEN = ""  # Bot token
@@ -24,6 +26,14 @@ class Config(object):
     PSW = ""  # Lavalink password
     REGION = "eu"  # Server region
     PORT = 2333
+    # 여러 Lavalink 노드를 쓸 때 (지정하면 HOST/PORT/PSW/REGION 대신 사용)
+    # 새 플레이어는 부하가 가장 낮은 노드에, 검색은 노드 전체에 분산된다
+    # "role": "search" 노드는 검색/URL 조회만 담당 (모두 끊기면 재생 노드로 조회)
+    # LAVALINK_NODES = [
+    #     {"host": "lavalink", "port": 2333, "password": "", "region": "eu", "name": "node-1"},
+    #     {"host": "lavalink-2", "port": 2333, "password": "", "region": "eu", "name": "node-2"},
+    #     {"host": "lavalink-search", "port": 2333, "password": "", "region": "eu", "name": "search-1", "role": "search"},
+    # ]
     LAVALINK_AUTO_UPDATE = False
     LAVALINK_PLUGINS = {
         "com.github.topi314.lavasrc:lavasrc-plugin": "https://api.github.com/repos/topi314/LavaSrc/releases",
@@ -43,3 +53,14 @@ class Config(object):
     # Supabase Database Settings
     SUPABASE_URL = ""  # Your Supabase project URL
     SUPABASE_ANON_KEY = ""  # Your Supabase anon key
+    DB_MAX_WORKERS = 4  # Supabase 호출 전용 스레드 수
+    DB_TIMEOUT = 5.0  # Supabase 호출 타임아웃 (초)
+    VOTE_CACHE_SIZE = 50000  # 투표 상태 캐시 최대 사용자 수
+    VOTE_CACHE_POSITIVE_TTL = 60 * 60 * 6  # 투표한 사용자 캐시 TTL (초)
+    VOTE_CACHE_NEGATIVE_TTL = 60 * 5  # 투표하지 않은 사용자 캐시 TTL (초)
+    STATS_BATCH_SIZE = 50  # 통계 일괄 삽입 단위 (행)
+    STATS_FLUSH_INTERVAL = 30  # 통계 플러시 최대 주기 (초)
+    STATS_QUEUE_SIZE = 10000  # 통계 대기 큐 크기 (초과분은 스풀 파일로)
+    STATS_INSERT_TIMEOUT = 15.0  # 통계 일괄 삽입 타임아웃 (초)
+    # 삽입 실패한 통계를 보관할 디렉터리 (작업 디렉터리와 무관하게 tapi/data)
+    STATS_SPOOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
@@ -1,4 +1,4 @@
-from .database import Database
+from .database import Database, AsyncDatabase
 from .language import get_lan
 from .redis_manager import RedisManager, redis_manager
 
@@ -26,6 +26,7 @@ def volumeicon(vol: int) -> str:
 
 __all__ = [
     "Database",
+    "AsyncDatabase",
     "get_lan",
     "RedisManager",
     "redis_manager",
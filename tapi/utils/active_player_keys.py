@@ -0,0 +1,117 @@
+"""활성 플레이어 길드별 Redis 키 변경 추적
+
+대시보드가 길드 하나를 그리려고 샤드 전체 JSON을 받지 않도록
+길드마다 active_player:{guild_id} 해시를 두고, 샤드별 인덱스 set에 길드 ID를 모은다.
+
+해시 필드:
+- state: 플레이어 상태 (current_track.position 제외, redis_codec으로 인코딩)
+- v: player_update 스트림 버전
+- shard_id
+- position, position_at: 재생 위치(ms)와 기록 시각(epoch ms).
+  재생 중이면 position + (now - position_at) 로 현재 위치를 계산한다.
+
+하트비트마다 전체를 다시 쓰지 않고 상태가 바뀐 길드만 HSET 한다.
+위치는 예상 위치에서 크게 벗어날 때(탐색 등)만 다시 기록하고,
+바뀌지 않은 길드는 TTL 절반이 지났을 때만 EXPIRE로 갱신한다.
+"""
+
+import json
+
+POSITION_DRIFT_MS = 2000  # 예상 위치와 이만큼 차이 나면 다시 기록
+
+
+def split_position(player: dict):
+    """플레이어 dict -> (position 제외 상태, position)"""
+    current = player.get("current_track")
+    position = 0
+    if current:
+        current = dict(current)
+        position = current.pop("position", 0) or 0
+        player = {**player, "current_track": current}
+    return player, position
+
+
+class ActivePlayerKeyTracker:
+    """샤드가 마지막으로 기록한 길드별 상태 (변경분만 쓰기 위해)"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        # guild_id -> (state JSON 해시, position, position_at, 재생 중 여부, TTL 갱신 시각)
+        self._written: dict[str, tuple] = {}
+        self._unremoved: set[str] = set()  # 하트비트 실패로 아직 못 지운 길드
+
+        self.writes = 0
+        self.refreshes = 0
+        self.skipped = 0
+
+    def plan(self, active_players: list, now: float):
+        """이번 하트비트에서 보낼 작업 계산
+
+        (writes: [(guild_id, mapping)], refresh: [guild_id], removed: [guild_id])
+        """
+        now_ms = int(now * 1000)
+        writes, refresh = [], []
+        seen = set()
+
+        for player in active_players:
+            guild_id = player["guild_id"]
+            seen.add(guild_id)
+            state, position = split_position(player)
+            digest = hash(json.dumps(state, sort_keys=True))
+            moving = player.get("is_playing") and not player.get("is_paused")
+
+            previous = self._written.get(guild_id)
+            if previous is not None and previous[0] == digest:
+                _, last_position, last_at, was_moving, refreshed_at = previous
+                expected = last_position + (now_ms - last_at if was_moving else 0)
+                if abs(position - expected) <= POSITION_DRIFT_MS:
+                    if now - refreshed_at >= self.ttl / 2:
+                        refresh.append(guild_id)
+                        self._written[guild_id] = (*previous[:4], now)
+                        self.refreshes += 1
+                    else:
+                        self.skipped += 1
+                    continue
+
+            writes.append(
+                (
+                    guild_id,
+                    {
+                        "state": state,
+                        "position": position,
+                        "position_at": now_ms,
+                    },
+                )
+            )
+            self._written[guild_id] = (digest, position, now_ms, moving, now)
+            self.writes += 1
+
+        removed = [guild_id for guild_id in self._written if guild_id not in seen]
+        for guild_id in removed:
+            del self._written[guild_id]
+        removed += [g for g in self._unremoved if g not in seen and g not in removed]
+        self._unremoved.clear()
+        return writes, refresh, removed
+
+    def forget(self, guild_ids=None):
+        """Redis에서 키가 사라졌을 때(재시작/만료) 다음 하트비트에 다시 쓰도록"""
+        if guild_ids is None:
+            self._written.clear()
+            return
+        for guild_id in guild_ids:
+            self._written.pop(guild_id, None)
+
+    def heartbeat_failed(self, removed: list):
+        """하트비트 실패: 전부 다시 쓰고, 못 지운 길드와 기록했던 길드 중
+        다음 하트비트에 없는 길드는 그때 지운다"""
+        self._unremoved.update(removed)
+        self._unremoved.update(self._written)
+        self._written.clear()
+
+    def metrics(self):
+        return {
+            "guilds": len(self._written),
+            "writes": self.writes,
+            "refreshes": self.refreshes,
+            "skipped": self.skipped,
+        }
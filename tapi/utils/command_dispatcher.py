@@ -0,0 +1,144 @@
+"""웹 명령 디스패처
+
+길드마다 메일박스(큐)를 두고 같은 길드의 명령은 들어온 순서대로 하나씩,
+다른 길드의 명령은 동시에 실행한다. 전체 동시 실행 수는 COMMAND_CONCURRENCY로 제한한다.
+명령별 타임아웃을 넘기면 실행을 취소하고 bot:response:{request_id}로 에러를 보낸다.
+"""
+
+import os
+import time
+import asyncio
+
+from tapi import LOGGER
+from tapi.utils.redis_manager import redis_manager
+from tapi.utils.metrics import (
+    WEB_COMMANDS,
+    WEB_COMMAND_SECONDS,
+    WEB_COMMAND_QUEUE_SECONDS,
+)
+
+COMMAND_CONCURRENCY = int(os.getenv("TAPI_COMMAND_CONCURRENCY", "16"))
+
+# 명령별 타임아웃 (초). Lavalink 검색이 들어가는 명령은 길게
+COMMAND_TIMEOUTS = {
+    "play": 20,
+    "search": 20,
+    "recommend": 20,
+    "resolve_track": 15,
+}
+DEFAULT_COMMAND_TIMEOUT = 5
+
+
+class CommandDispatcher:
+    """길드별 메일박스 + 전체 동시 실행 제한"""
+
+    def __init__(self, concurrency: int = COMMAND_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._mailboxes: dict[str, asyncio.Queue] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._changed = asyncio.Condition()
+        self.backlog = 0  # 대기 중 + 실행 중
+        self.running = 0
+
+        self.completed = 0
+        self.timeouts = 0
+        self.failed = 0
+        self.max_wait_ms = 0.0
+
+    def submit(self, bot, data: dict, process, on_done=None):
+        """명령을 길드 메일박스에 넣는다. 실행이 끝나면 on_done()을 await 한다.
+
+        process: async (bot, data) -> None (응답 발행 포함)
+        """
+        # 글로벌 명령(길드 없음)은 서로 순서가 없으므로 요청마다 따로
+        key = str(data.get("guild_id") or data.get("request_id") or id(data))
+        mailbox = self._mailboxes.get(key)
+        if mailbox is None:
+            mailbox = self._mailboxes[key] = asyncio.Queue()
+        mailbox.put_nowait((time.monotonic(), data, process, on_done))
+        self.backlog += 1
+
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.get_running_loop().create_task(
+                self._drain(bot, key, mailbox)
+            )
+
+    async def wait_for_capacity(self, limit: int) -> int:
+        """backlog이 limit 미만이 될 때까지 기다리고 남은 자리 수를 반환"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.backlog < limit)
+            return limit - self.backlog
+
+    async def _drain(self, bot, key: str, mailbox: asyncio.Queue):
+        try:
+            while not mailbox.empty():
+                queued_at, data, process, on_done = mailbox.get_nowait()
+                try:
+                    async with self._semaphore:
+                        wait_ms = (time.monotonic() - queued_at) * 1000
+                        self.max_wait_ms = max(self.max_wait_ms, round(wait_ms, 1))
+                        WEB_COMMAND_QUEUE_SECONDS.observe(
+                            wait_ms / 1000, command=data.get("command", "")
+                        )
+                        await self._execute(bot, data, process)
+                    if on_done:
+                        await on_done()
+                finally:
+                    self.backlog -= 1
+                    async with self._changed:
+                        self._changed.notify_all()
+        finally:
+            if self._mailboxes.get(key) is mailbox and mailbox.empty():
+                del self._mailboxes[key]
+            if self._workers.get(key) is asyncio.current_task():
+                del self._workers[key]
+
+    async def _execute(self, bot, data: dict, process):
+        command = data.get("command", "")
+        timeout = COMMAND_TIMEOUTS.get(command, DEFAULT_COMMAND_TIMEOUT)
+        self.running += 1
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            await asyncio.wait_for(process(bot, data), timeout)
+            self.completed += 1
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            outcome = "timeout"
+            LOGGER.warning(
+                f"Web command timed out after {timeout}s: {command} "
+                f"for guild {data.get('guild_id')}"
+            )
+            await self._respond_error(data, f"Timed out after {timeout}s")
+        except Exception as e:
+            self.failed += 1
+            outcome = "error"
+            LOGGER.error(f"Error processing web command {command}: {e}")
+            await self._respond_error(data, str(e))
+        finally:
+            self.running -= 1
+            WEB_COMMAND_SECONDS.observe(time.perf_counter() - started, command=command)
+            WEB_COMMANDS.inc(command=command, outcome=outcome)
+
+    @staticmethod
+    async def _respond_error(data: dict, error: str):
+        await redis_manager.publish_response(
+            data.get("request_id"), {"success": False, "error": error}
+        )
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "guilds": len(self._mailboxes),
+            "backlog": self.backlog,
+            "running": self.running,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "failed": self.failed,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+# 전역 명령 디스패처 인스턴스
+command_dispatcher = CommandDispatcher()
@@ -0,0 +1,242 @@
+"""웹 대시보드 명령 큐 (Redis Streams)
+
+Pub/Sub은 샤드가 재연결 중이면 명령이 그냥 사라지므로
+샤드별 스트림 + 컨슈머 그룹으로 받아서 처리 후 XACK 한다.
+- 길드 명령: bot:command_stream:{shard_id}
+- 글로벌 명령: bot:command_stream:global (샤드 0이 처리)
+- 항목 필드: data = 명령 JSON (Pub/Sub 명령과 같은 형태)
+
+스트림마다 컨슈머는 그 샤드 하나(shard-{id})뿐이다. 처리 중 샤드가 죽으면 항목이
+pending으로 남고, 재시작하면 같은 컨슈머 이름으로 자기 pending부터 다시 읽는다.
+XAUTOCLAIM은 실행 중에 ack 되지 않고 오래 남은 자기 항목(디스패처에 없는 것)을 다시 처리하는 용도다.
+너무 오래된 명령(COMMAND_MAX_AGE)은 실행하지 않고 만료 응답만 보낸 뒤 ack 한다.
+나이는 스트림 ID(Redis 서버 시각)와 Redis TIME으로 재므로 봇 호스트 시계와 무관하다.
+"""
+
+import os
+import json
+import time
+from functools import partial
+
+from tapi import LOGGER
+from tapi.utils.redis_manager import redis_manager
+from tapi.utils.command_dispatcher import command_dispatcher
+
+COMMAND_STREAM_PREFIX = "bot:command_stream:"
+GLOBAL_COMMAND_STREAM = "bot:command_stream:global"
+COMMAND_GROUP = "tapi"
+COMMAND_STREAM_MAXLEN = 10000  # 스트림 최대 길이 (근사치 trim)
+
+COMMAND_READ_COUNT = 32  # 디스패처에 쌓아 둘 최대 명령 수 (읽기 backpressure)
+COMMAND_BLOCK_MS = 5000
+COMMAND_CLAIM_IDLE_MS = 60 * 1000  # 이 시간 이상 ack 되지 않은 항목은 가져와서 처리
+COMMAND_CLAIM_INTERVAL = 30  # (초)
+# 이보다 오래된 명령은 실행하지 않고 만료 (초)
+COMMAND_MAX_AGE = int(os.getenv("TAPI_COMMAND_MAX_AGE", "30"))
+
+
+def command_stream_key(shard_id) -> str:
+    return f"{COMMAND_STREAM_PREFIX}{shard_id}"
+
+
+def _entry_age(entry_id: str, now_ms: int) -> float:
+    """스트림 ID(밀리초-순번)로 명령이 들어온 뒤 지난 시간(초). now_ms는 Redis 서버 시각."""
+    return (now_ms - int(entry_id.split("-", 1)[0])) / 1000
+
+
+async def _redis_now_ms(client):
+    """Redis TIME (밀리초). 실패하면 None (만료 검사를 건너뜀)."""
+    try:
+        seconds, microseconds = await client.time()
+    except Exception as e:
+        LOGGER.debug(f"Failed to read Redis TIME: {e}")
+        return None
+    return seconds * 1000 + microseconds // 1000
+
+
+async def enqueue_command(stream: str, data: dict, raw: str = None):
+    """명령을 스트림에 추가 (Pub/Sub 브리지, 테스트용 발행기에서 사용)"""
+    client = redis_manager.get_async_client()
+    if not client:
+        return None
+    return await client.xadd(
+        stream,
+        {"data": raw or json.dumps(data)},
+        maxlen=COMMAND_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+class CommandStreamConsumer:
+    """샤드 명령 스트림 컨슈머"""
+
+    def __init__(self):
+        self.streams: list[str] = []
+        self.consumer = None
+        self._process = None
+        self._inflight_ids: set = set()  # 디스패처에 넘겼지만 아직 ack 하지 않은 항목
+
+        self.received = 0
+        self.acked = 0
+        self.claimed = 0
+        self.expired = 0
+        self.failed = 0
+        self.lag: dict[str, int] = {}
+        self.pending: dict[str, int] = {}
+
+    async def run(self, bot, process):
+        """스트림을 읽고 process(bot, data)로 명령을 처리한다. 취소될 때까지 실행."""
+        shard_id = getattr(bot, "shard_id", 0) or 0
+        self.streams = [command_stream_key(shard_id)]
+        if shard_id == 0:
+            self.streams.append(GLOBAL_COMMAND_STREAM)
+        # 재시작해도 같은 이름이면 자기 pending을 그대로 이어받는다
+        self.consumer = f"shard-{shard_id}"
+        self._process = process
+
+        client = redis_manager.get_async_client()
+        for stream in self.streams:
+            await self._ensure_group(client, stream)
+
+        # 이전 실행에서 ack 하지 못한 자기 항목부터 처리
+        for stream in self.streams:
+            await self._replay_pending(bot, client, stream)
+
+        last_claim = 0.0
+        while True:
+            if time.monotonic() - last_claim >= COMMAND_CLAIM_INTERVAL:
+                last_claim = time.monotonic()
+                await self._claim_stale(bot, client)
+                await self._update_lag(client)
+
+            # 처리 대기 중인 명령이 가득 차면 더 읽지 않는다 (나머지는 스트림에 남음)
+            count = await command_dispatcher.wait_for_capacity(COMMAND_READ_COUNT)
+            response = await client.xreadgroup(
+                COMMAND_GROUP,
+                self.consumer,
+                {stream: ">" for stream in self.streams},
+                count=count,
+                block=COMMAND_BLOCK_MS,
+            )
+            for stream, entries in response or []:
+                await self._handle(bot, client, stream, entries)
+
+    @staticmethod
+    async def _ensure_group(client, stream):
+        try:
+            await client.xgroup_create(stream, COMMAND_GROUP, id="$", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _replay_pending(self, bot, client, stream):
+        last_id = "0"
+        while True:
+            response = await client.xreadgroup(
+                COMMAND_GROUP,
+                self.consumer,
+                {stream: last_id},
+                count=COMMAND_READ_COUNT,
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                return
+            last_id = entries[-1][0]
+            await self._handle(bot, client, stream, entries)
+
+    async def _claim_stale(self, bot, client):
+        """ack 되지 않고 오래 남은 자기 항목 다시 가져오기"""
+        for stream in self.streams:
+            try:
+                # Redis 7은 삭제된 ID 목록까지 3개, 6.2는 2개를 돌려준다
+                claimed = await client.xautoclaim(
+                    stream,
+                    COMMAND_GROUP,
+                    self.consumer,
+                    COMMAND_CLAIM_IDLE_MS,
+                    count=COMMAND_READ_COUNT,
+                )
+                # 디스패처 대기열에 오래 있던 자기 항목은 이미 처리 예정
+                entries = [
+                    entry for entry in claimed[1] if entry[0] not in self._inflight_ids
+                ]
+            except Exception as e:
+                LOGGER.debug(f"Command stream claim failed for {stream}: {e}")
+                continue
+            if entries:
+                self.claimed += len(entries)
+                LOGGER.info(f"Claimed {len(entries)} stale commands from {stream}")
+                await self._handle(bot, client, stream, entries)
+
+    async def _handle(self, bot, client, stream, entries):
+        """읽은 항목을 디스패처에 넘긴다. 실행이 끝나면 ack."""
+        # 스트림 ID와 같은 시계로 나이를 재기 위해 배치마다 한 번 Redis TIME
+        now_ms = await _redis_now_ms(client) if entries else None
+        for entry_id, fields in entries:
+            if entry_id in self._inflight_ids:  # 재연결 후 다시 읽은 항목
+                continue
+            if not fields:  # trim 되어 사라진 항목
+                await self._ack(client, stream, entry_id)
+                continue
+            self.received += 1
+            try:
+                data = json.loads(fields["data"])
+            except (KeyError, json.JSONDecodeError):
+                LOGGER.error(f"Invalid command stream entry {entry_id}: {fields}")
+                self.failed += 1
+                await self._ack(client, stream, entry_id)
+                continue
+
+            if now_ms is not None and _entry_age(entry_id, now_ms) > COMMAND_MAX_AGE:
+                self.expired += 1
+                await redis_manager.publish_response(
+                    data.get("request_id"), {"success": False, "error": "Expired"}
+                )
+                await self._ack(client, stream, entry_id)
+                continue
+
+            self._inflight_ids.add(entry_id)
+            command_dispatcher.submit(
+                bot,
+                data,
+                self._process,
+                # 처리 중 예외가 나도 ack (같은 명령이 계속 재시도되는 것 방지)
+                on_done=partial(self._ack, client, stream, entry_id),
+            )
+
+    async def _ack(self, client, stream, entry_id):
+        self._inflight_ids.discard(entry_id)
+        try:
+            await client.xack(stream, COMMAND_GROUP, entry_id)
+            self.acked += 1
+        except Exception as e:
+            LOGGER.warning(f"Failed to ack command {entry_id}: {e}")
+
+    async def _update_lag(self, client):
+        """컨슈머 그룹의 미처리(lag) / 미확인(pending) 항목 수"""
+        for stream in self.streams:
+            try:
+                for group in await client.xinfo_groups(stream):
+                    if group.get("name") == COMMAND_GROUP:
+                        self.lag[stream] = group.get("lag") or 0
+                        self.pending[stream] = group.get("pending") or 0
+            except Exception as e:
+                LOGGER.debug(f"Failed to read command stream info: {e}")
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "inflight": len(self._inflight_ids),
+            "received": self.received,
+            "acked": self.acked,
+            "claimed": self.claimed,
+            "expired": self.expired,
+            "failed": self.failed,
+            "lag": sum(self.lag.values()),
+            "pending": sum(self.pending.values()),
+            "dispatcher": command_dispatcher.metrics(),
+        }
+
+
+# 전역 명령 스트림 컨슈머 인스턴스
+command_stream = CommandStreamConsumer()
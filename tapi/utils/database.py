@@ -1,9 +1,13 @@
 import os
+import asyncio
+import json
 import secrets
 import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 import logging
-import time
 
 # Supabase 클라이언트
 try:
@@ -15,6 +19,29 @@ except ImportError:
     logging.warning("Supabase client not installed. Run: pip install supabase")
 
 from tapi import LOGGER
+from tapi.utils.cache import TTLCache
+from tapi.utils.stats_pipeline import StatisticsPipeline
+from tapi.utils.metrics import DB_CALL_SECONDS, DB_CALL_TIMEOUTS
+from tapi.utils.settings_store import (
+    settings_store,
+    default_guild_settings,
+    SETTINGS_INVALIDATE_CHANNEL,
+)
+
+VOTE_UPDATE_CHANNEL = "bot:vote_update"  # vote-worker가 투표 발생 시 발행
+VOTE_VALID_DAYS = 90
+
+# 통계 삽입 실패 시 행을 보관하는 스풀 디렉터리 (tapi/ 볼륨 아래라 재시작해도 유지)
+STATS_SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+def _get_config(name, default):
+    """config.py 설정값 조회 (없으면 기본값)"""
+    try:
+        from tapi.config import Development as Config
+    except ImportError:
+        return default
+    return getattr(Config, name, default)
 
 
 class Database:
@@ -22,8 +49,6 @@ class Database:
 
     _instance = None
     _client = None
-    _cache = {}  # 간단한 인메모리 캐시
-    _cache_ttl = 60  # 캐시 TTL (초)
 
     def __new__(cls):
         if cls._instance is None:
@@ -35,10 +60,13 @@ class Database:
         if not hasattr(self, "initialized"):
             self.initialize()
             self.initialized = True
-            self.stats_buffer = []  # 통계 배치 처리용
-            self.last_flush = time.time()
-            self.buffer_size = 50
-            self.flush_interval = 30  # 30초마다 플러시
+            # 투표 상태 캐시 (True: 투표함, False: 투표 안 함)
+            self.vote_cache = TTLCache(
+                maxsize=_get_config("VOTE_CACHE_SIZE", 50000),
+                ttl=_get_config("VOTE_CACHE_POSITIVE_TTL", 60 * 60 * 6),
+            )
+            self.vote_negative_ttl = _get_config("VOTE_CACHE_NEGATIVE_TTL", 60 * 5)
+            self.votes_synced = False
 
     def initialize(self):
         """Supabase 클라이언트 초기화"""
@@ -81,42 +109,6 @@ class Database:
             self.initialize()
         return self._client
 
-    def _get_cache_key(self, table, key):
-        """캐시 키 생성"""
-        return f"{table}:{key}"
-
-    def _get_from_cache(self, table, key):
-        """캐시에서 데이터 조회"""
-        cache_key = self._get_cache_key(table, key)
-        if cache_key in self._cache:
-            data, timestamp = self._cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                return data
-            else:
-                del self._cache[cache_key]
-        return None
-
-    def _set_cache(self, table, key, data):
-        """캐시에 데이터 저장"""
-        cache_key = self._get_cache_key(table, key)
-        self._cache[cache_key] = (data, time.time())
-
-    def _clear_cache(self, table=None, key=None):
-        """캐시 클리어"""
-        if table and key:
-            cache_key = self._get_cache_key(table, key)
-            self._cache.pop(cache_key, None)
-        elif table:
-            # 특정 테이블의 모든 캐시 클리어
-            keys_to_remove = [
-                k for k in self._cache.keys() if k.startswith(f"{table}:")
-            ]
-            for k in keys_to_remove:
-                del self._cache[k]
-        else:
-            # 전체 캐시 클리어
-            self._cache.clear()
-
     # ===== 길드 설정 관련 메서드 =====
 
     def set_volume(self, guild_id, volume):
@@ -161,23 +153,21 @@ class Database:
         """길드 즉시 퇴장 설정"""
         self.upsert_guild_settings(guild_id, instant_disconnect=instant_disconnect)
 
+    @staticmethod
+    def _default_guild_settings(guild_id):
+        """설정 행이 없거나 조회에 실패했을 때 사용하는 기본 길드 설정"""
+        return default_guild_settings(guild_id)
+
     def get_guild_settings(self, guild_id):
-        """길드 설정 통합 조회 (캐시 활용)"""
-        # 캐시 확인
-        cached = self._get_from_cache("guild_settings", guild_id)
-        if cached:
+        """길드 설정 통합 조회 (인메모리 저장소 우선)"""
+        # 저장소 확인
+        cached = settings_store.get(guild_id)
+        if cached is not None:
             return cached
 
         client = self.get_client()
         if not client:
-            return {
-                "guild_id": guild_id,
-                "volume": 20,
-                "loop_mode": 0,
-                "shuffle": False,
-                "autodel": True,
-                "instant_disconnect": True,
-            }
+            return self._default_guild_settings(guild_id)
 
         try:
             response = (
@@ -189,30 +179,39 @@ class Database:
             )
 
             if response and response.data:
-                self._set_cache("guild_settings", guild_id, response.data)
+                settings_store.set(guild_id, response.data)
                 return response.data
             else:
-                # 기본값
-                default_settings = {
-                    "guild_id": guild_id,
-                    "volume": 20,
-                    "loop_mode": 0,
-                    "shuffle": False,
-                    "autodel": True,
-                    "instant_disconnect": True,
-                }
-                return default_settings
+                # 행이 없는 길드도 저장소에 기록해 다음 조회부터는 네트워크를 타지 않음
+                settings_store.set(guild_id, None)
+                return self._default_guild_settings(guild_id)
 
         except Exception as e:
             LOGGER.error(f"Error getting guild settings: {e}")
-            return {
-                "guild_id": guild_id,
-                "volume": 20,
-                "loop_mode": 0,
-                "shuffle": False,
-                "autodel": True,
-                "instant_disconnect": True,
-            }
+            return self._default_guild_settings(guild_id)
+
+    def load_guild_settings(self, guild_ids, chunk_size=200):
+        """여러 길드의 설정 행을 일괄 조회. 실패 시 None 반환."""
+        client = self.get_client()
+        if not client:
+            return None
+
+        rows = []
+        guild_ids = [str(guild_id) for guild_id in guild_ids]
+        try:
+            for i in range(0, len(guild_ids), chunk_size):
+                response = (
+                    client.table("guild_settings")
+                    .select("*")
+                    .in_("guild_id", guild_ids[i : i + chunk_size])
+                    .execute()
+                )
+                if response and response.data:
+                    rows.extend(response.data)
+            return rows
+        except Exception as e:
+            LOGGER.error(f"Error bulk loading guild settings: {e}")
+            return None
 
     def upsert_guild_settings(self, guild_id, **kwargs):
         """길드 설정 UPSERT"""
@@ -227,10 +226,15 @@ class Database:
 
             response = client.table("guild_settings").upsert(data).execute()
 
-            # 캐시 무효화
-            self._clear_cache("guild_settings", guild_id)
+            row = response.data[0] if response.data else {}
+
+            # 저장소 갱신 (응답 행이 없으면 변경 필드만 반영)
+            if row:
+                settings_store.set(guild_id, row)
+            else:
+                settings_store.update(guild_id, **kwargs)
 
-            return response.data[0] if response.data else {}
+            return row
 
         except Exception as e:
             LOGGER.error(f"Error upserting guild settings: {e}")
@@ -238,8 +242,8 @@ class Database:
 
     # ===== 통계 관련 메서드 =====
 
-    def set_statistics(
-        self,
+    @staticmethod
+    def statistics_row(
         date,
         time_str,
         guild_id,
@@ -254,8 +258,8 @@ class Database:
         duration,
         success,
     ):
-        """통계 저장 (배치 처리)"""
-        stats_data = {
+        """statistics 테이블 행 생성"""
+        return {
             "date": date,
             "time": time_str,
             "guild_id": str(guild_id),
@@ -272,48 +276,55 @@ class Database:
             # created_at은 Supabase의 기본값 사용: timezone('Asia/Seoul'::text, now())
         }
 
-        # 버퍼에 추가
-        self.stats_buffer.append(stats_data)
-
-        # 버퍼가 가득 찼거나 시간이 지났으면 플러시
-        if (
-            len(self.stats_buffer) >= self.buffer_size
-            or time.time() - self.last_flush > self.flush_interval
-        ):
-            self.flush_statistics()
-
-    def flush_statistics(self):
-        """통계 버퍼 플러시 (배치 인서트)"""
-        if not self.stats_buffer:
-            return
+    def insert_statistics(self, rows):
+        """통계 행 일괄 삽입. 성공 여부 반환."""
+        if not rows:
+            return True
 
         client = self.get_client()
         if not client:
-            self.stats_buffer = []  # 연결 실패시 버퍼 클리어
-            return
+            return False
 
         try:
             # Supabase는 한 번에 대량 삽입 가능
-            client.table("statistics").insert(self.stats_buffer).execute()
-
-            LOGGER.debug(f"Flushed {len(self.stats_buffer)} statistics to Supabase")
-            self.stats_buffer = []
-            self.last_flush = time.time()
+            client.table("statistics").insert(rows).execute()
+            return True
 
         except Exception as e:
-            LOGGER.error(f"Error flushing statistics: {e}")
-            # 실패한 데이터는 버퍼에 유지 (재시도를 위해)
-            if len(self.stats_buffer) > 1000:  # 버퍼 오버플로우 방지
-                self.stats_buffer = self.stats_buffer[-500:]
+            LOGGER.error(f"Error inserting statistics: {e}")
+            return False
 
     # ===== 투표 관련 메서드 =====
 
+    def cache_vote(self, user_id, voted_at=None):
+        """투표 상태를 캐시에 기록.
+
+        voted_at이 주어지면 투표 유효기간(90일)이 끝나는 시점까지만 캐시한다.
+        """
+        ttl = None
+        if voted_at:
+            try:
+                expires = datetime.fromisoformat(voted_at) + timedelta(
+                    days=VOTE_VALID_DAYS
+                )
+                remaining = (expires - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                remaining = None
+
+            if remaining is not None:
+                if remaining <= 0:
+                    self.vote_cache.set(str(user_id), False, ttl=self.vote_negative_ttl)
+                    return
+                ttl = min(self.vote_cache.ttl, remaining)
+
+        self.vote_cache.set(str(user_id), True, ttl=ttl)
+
     def has_voted(self, user_id):
         """사용자가 3개월 이내에 투표한 적이 있는지 확인"""
-        # 캐시 확인 (캐시 TTL 동안만 유효)
-        cached = self._get_from_cache("votes", user_id)
-        if cached is True:
-            return True
+        # 캐시 확인 (투표하지 않은 사용자도 짧은 TTL로 캐시)
+        cached = self.vote_cache.get(str(user_id))
+        if cached is not None:
+            return cached
 
         client = self.get_client()
         if not client:
@@ -321,29 +332,60 @@ class Database:
 
         try:
             # 3개월 전 날짜 계산
-            three_months_ago = datetime.now(timezone.utc) - timedelta(days=90)
+            three_months_ago = datetime.now(timezone.utc) - timedelta(
+                days=VOTE_VALID_DAYS
+            )
 
             response = (
                 client.table("votes")
                 .select("id, voted_at")
                 .eq("user_id", str(user_id))
                 .gte("voted_at", three_months_ago.isoformat())
+                .order("voted_at", desc=True)
                 .limit(1)
                 .execute()
             )
 
-            has_vote = bool(response.data) if response else False
-
-            # 유효한 투표 기록이 있으면 캐시에 저장
-            if has_vote:
-                self._set_cache("votes", user_id, True)
+            if response and response.data:
+                self.cache_vote(user_id, response.data[0].get("voted_at"))
+                return True
 
-            return has_vote
+            self.vote_cache.set(str(user_id), False, ttl=self.vote_negative_ttl)
+            return False
 
         except Exception as e:
             LOGGER.error(f"Error checking vote status: {e}")
             return False
 
+    def sync_recent_votes(self, page_size=1000):
+        """유효기간 내 투표 기록을 일괄 조회해 캐시를 채운다. 동기화한 행 수 반환."""
+        client = self.get_client()
+        if not client:
+            return 0
+
+        three_months_ago = datetime.now(timezone.utc) - timedelta(days=VOTE_VALID_DAYS)
+        synced = 0
+        try:
+            while True:
+                # 오래된 순으로 읽어 같은 사용자의 최신 투표가 마지막에 반영되도록 함
+                response = (
+                    client.table("votes")
+                    .select("user_id, voted_at")
+                    .gte("voted_at", three_months_ago.isoformat())
+                    .order("voted_at")
+                    .range(synced, synced + page_size - 1)
+                    .execute()
+                )
+                rows = response.data if response else []
+                for row in rows:
+                    self.cache_vote(row["user_id"], row.get("voted_at"))
+                synced += len(rows)
+                if len(rows) < page_size:
+                    break
+        except Exception as e:
+            LOGGER.error(f"Error syncing recent votes: {e}")
+        return synced
+
     # ===== 플레이리스트 관련 메서드 =====
 
     def _generate_code(self, length=5):
@@ -463,3 +505,275 @@ class Database:
     def create_table(self):
         """테이블 생성 (Supabase에서는 SQL Editor에서 직접 실행)"""
         LOGGER.info("Tables should be created directly in Supabase SQL Editor")
+
+
+class AsyncDatabase:
+    """Database 비동기 래퍼
+
+    Supabase 클라이언트는 동기 HTTP 호출을 하므로 이벤트 루프에서 직접 부르면
+    게이트웨이 하트비트/음성 업데이트까지 멈춘다. 모든 호출을 전용 스레드 풀에서
+    실행하고, 호출별 타임아웃이 지나면 기본값을 돌려준다.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        """싱글톤 패턴으로 한 번만 초기화"""
+        if not hasattr(self, "initialized"):
+            max_workers = _get_config("DB_MAX_WORKERS", 4)
+            timeout = _get_config("DB_TIMEOUT", 5.0)
+
+            self.db = Database()
+            self.max_workers = max_workers
+            self.default_timeout = timeout
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="tapi-db"
+            )
+            self._lock = threading.Lock()
+            self._queued = 0  # 실행 대기 중인 호출 수
+            self._in_flight = 0  # 워커 스레드에서 실행 중인 호출 수
+            self.calls = 0
+            self.timeouts = 0
+            # 설정 변경 이벤트 발신자 식별용 (자기 자신이 보낸 이벤트 무시)
+            self.origin = f"shard-{os.getenv('SHARD_ID', '0')}-{os.getpid()}"
+            # 재생 통계 write-behind 파이프라인 (샤드마다 별도 스풀 파일)
+            self.stats_timeout = _get_config("STATS_INSERT_TIMEOUT", 15.0)
+            self.stats = StatisticsPipeline(
+                self.insert_statistics,
+                spool_path=os.path.join(
+                    _get_config("STATS_SPOOL_DIR", STATS_SPOOL_DIR),
+                    f"stats_spool_{os.getenv('SHARD_ID', '0')}.jsonl",
+                ),
+                batch_size=_get_config("STATS_BATCH_SIZE", 50),
+                flush_interval=_get_config("STATS_FLUSH_INTERVAL", 30),
+                max_queue=_get_config("STATS_QUEUE_SIZE", 10000),
+            )
+            self.initialized = True
+
+    @property
+    def queue_depth(self):
+        """워커를 기다리고 있는 호출 수"""
+        return self._queued
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "max_workers": self.max_workers,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "vote_cache": self.db.vote_cache.metrics(),
+            "statistics": self.stats.metrics(),
+        }
+
+    async def _run(
+        self, func, *args, timeout=None, default=None, finish=False, **kwargs
+    ):
+        """동기 DB 메서드를 스레드 풀에서 실행. 타임아웃 시 default 반환.
+
+        finish=True 면 타임아웃 때 이미 실행 중인 호출은 끝날 때까지 기다려
+        실제 결과를 반환한다 (스레드는 취소할 수 없어 실패로 보고 재시도하면 중복 쓰기).
+        """
+
+        def call():
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+        with self._lock:
+            self._queued += 1
+        self.calls += 1
+        started = time.perf_counter()
+
+        future = self._executor.submit(call)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout if timeout is not None else self.default_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            DB_CALL_TIMEOUTS.inc(method=func.__name__)
+            # 아직 시작하지 못한 호출은 큐에서 빼고 대기 수를 되돌린다
+            if future.cancelled() or future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            elif finish:
+                LOGGER.warning(
+                    f"Database call {func.__name__} timed out, waiting for it to finish"
+                )
+                return await asyncio.wrap_future(future)
+            LOGGER.warning(f"Database call {func.__name__} timed out")
+            return default
+        finally:
+            DB_CALL_SECONDS.observe(time.perf_counter() - started, method=func.__name__)
+
+    # ===== 길드 설정 관련 메서드 =====
+
+    async def preload_guild_settings(self, guild_ids, timeout=60):
+        """샤드 담당 길드의 설정을 일괄 로드해 저장소에 채운다."""
+        guild_ids = list(guild_ids)
+        rows = await self._run(self.db.load_guild_settings, guild_ids, timeout=timeout)
+        if rows is None:
+            return False
+        settings_store.load(guild_ids, rows)
+        return True
+
+    async def get_guild_settings(self, guild_id, timeout=None):
+        # 저장소에 있으면 스레드 풀을 거치지 않고 바로 반환
+        cached = settings_store.get(guild_id)
+        if cached is not None:
+            return cached
+
+        return await self._run(
+            self.db.get_guild_settings,
+            guild_id,
+            timeout=timeout,
+            default=Database._default_guild_settings(guild_id),
+        )
+
+    async def upsert_guild_settings(self, guild_id, timeout=None, **kwargs):
+        row = await self._run(
+            self.db.upsert_guild_settings,
+            guild_id,
+            timeout=timeout,
+            default={},
+            **kwargs,
+        )
+
+        # 다른 샤드(및 웹 대시보드)에 변경 전파
+        if row:
+            from tapi.utils.redis_manager import redis_manager
+
+            await redis_manager.publish(
+                SETTINGS_INVALIDATE_CHANNEL,
+                json.dumps(
+                    {
+                        "guild_id": str(guild_id),
+                        "origin": self.origin,
+                        "settings": row,
+                    }
+                ),
+            )
+        return row
+
+    async def get_channel(self, guild_id, timeout=None):
+        """봇 전용 채널 ID 가져오기. 설정되지 않은 경우 None 반환."""
+        settings = await self.get_guild_settings(guild_id, timeout=timeout)
+        channel_id = settings.get("channel_id")
+        return int(channel_id) if channel_id else None
+
+    async def get_autodel(self, guild_id, timeout=None):
+        settings = await self.get_guild_settings(guild_id, timeout=timeout)
+        return settings.get("autodel", True)
+
+    async def get_instant_disconnect(self, guild_id, timeout=None):
+        settings = await self.get_guild_settings(guild_id, timeout=timeout)
+        return settings.get("instant_disconnect", True)
+
+    async def set_volume(self, guild_id, volume, timeout=None):
+        await self.upsert_guild_settings(guild_id, timeout=timeout, volume=volume)
+
+    async def set_loop(self, guild_id, loop_mode, timeout=None):
+        await self.upsert_guild_settings(guild_id, timeout=timeout, loop_mode=loop_mode)
+
+    async def set_shuffle(self, guild_id, shuffle, timeout=None):
+        await self.upsert_guild_settings(guild_id, timeout=timeout, shuffle=shuffle)
+
+    async def set_channel(self, guild_id, channel_id, timeout=None):
+        await self.upsert_guild_settings(
+            guild_id,
+            timeout=timeout,
+            channel_id=str(channel_id) if channel_id else None,
+        )
+
+    async def set_autodel(self, guild_id, autodel, timeout=None):
+        await self.upsert_guild_settings(guild_id, timeout=timeout, autodel=autodel)
+
+    async def set_instant_disconnect(self, guild_id, instant_disconnect, timeout=None):
+        await self.upsert_guild_settings(
+            guild_id, timeout=timeout, instant_disconnect=instant_disconnect
+        )
+
+    # ===== 통계 관련 메서드 =====
+
+    def start_statistics(self):
+        """통계 플러셔 태스크 시작 (샤드 시작 시)"""
+        self.stats.start()
+
+    async def set_statistics(self, **stats):
+        """통계 행을 큐에 넣기만 한다 (삽입은 백그라운드 플러셔가 처리)"""
+        self.stats.submit(Database.statistics_row(**stats))
+
+    async def insert_statistics(self, rows, timeout=None):
+        return await self._run(
+            self.db.insert_statistics,
+            rows,
+            timeout=timeout if timeout is not None else self.stats_timeout,
+            default=False,
+            finish=True,
+        )
+
+    async def flush_statistics(self):
+        """큐에 남은 통계를 모두 플러시 (종료 시)"""
+        await self.stats.close()
+
+    # ===== 투표 관련 메서드 =====
+
+    async def has_voted(self, user_id, timeout=None):
+        # 캐시에 있으면 스레드 풀을 거치지 않고 바로 반환
+        cached = self.db.vote_cache.get(str(user_id))
+        if cached is not None:
+            return cached
+
+        return await self._run(
+            self.db.has_voted, user_id, timeout=timeout, default=False
+        )
+
+    async def sync_votes(self, timeout=120):
+        """최근 투표 기록 일괄 동기화 (샤드 시작 시 1회)"""
+        if self.db.votes_synced:
+            return
+        synced = await self._run(self.db.sync_recent_votes, timeout=timeout)
+        if synced is not None:
+            self.db.votes_synced = True
+            LOGGER.info(f"Synced {synced} recent votes into cache")
+
+    # ===== 플레이리스트 관련 메서드 =====
+
+    async def save_playlist(self, user_id, tracks, timeout=None):
+        return await self._run(
+            self.db.save_playlist, user_id, tracks, timeout=timeout, default={}
+        )
+
+    async def load_playlist(self, user_id, timeout=None):
+        return await self._run(self.db.load_playlist, user_id, timeout=timeout)
+
+    async def load_playlist_by_code(self, code, timeout=None):
+        return await self._run(self.db.load_playlist_by_code, code, timeout=timeout)
+
+    # ===== 업타임 히스토리 관련 메서드 =====
+
+    async def insert_uptime_history(
+        self, service, date_str, total_checks, up_checks, timeout=None
+    ):
+        return await self._run(
+            self.db.insert_uptime_history,
+            service,
+            date_str,
+            total_checks,
+            up_checks,
+            timeout=timeout,
+            default=False,
+        )
@@ -1,5 +1,133 @@
 import os
+import sys
 import json
+import time
+import string
+from functools import lru_cache
+
+from tapi import LOGGER
+
+LANGUAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "languages")
+DEFAULT_LANGUAGE = "en"  # 기본값은 영어
+
+# 개발용: TAPI_LANG_RELOAD=1 이면 언어 파일 변경을 감지해 자동으로 다시 불러옴
+RELOAD_ENABLED = os.getenv("TAPI_LANG_RELOAD", "0") == "1"
+RELOAD_CHECK_INTERVAL = 2  # 파일 변경 확인 주기 (초)
+
+_formatter = string.Formatter()
+
+
+class LanguageCatalog:
+    """모든 언어 파일을 한 번만 읽어 메모리에 보관하는 번역 카탈로그"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._catalog: dict[str, dict[str, str]] = {}
+        self._templates: dict[tuple[str, str], tuple] = {}
+        self._mtimes: dict[str, float] = {}
+        self._last_check = 0.0
+        self.load()
+
+    @property
+    def languages(self):
+        return self._catalog.keys()
+
+    def _scan(self) -> dict[str, float]:
+        """언어 파일 경로 -> 수정 시각"""
+        return {
+            os.path.join(self.directory, file): os.path.getmtime(
+                os.path.join(self.directory, file)
+            )
+            for file in os.listdir(self.directory)
+            if file.endswith(".json")
+        }
+
+    def load(self):
+        """언어 파일 전체 로드 (키/값은 intern 처리)"""
+        catalog = {}
+        mtimes = self._scan()
+        for path in mtimes:
+            language = sys.intern(os.path.splitext(os.path.basename(path))[0])
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            catalog[language] = {
+                sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+                for key, value in data.items()
+            }
+
+        self._catalog = catalog
+        self._templates = {}
+        self._mtimes = mtimes
+        resolve_language.cache_clear()
+
+    def _maybe_reload(self):
+        """파일 변경이 있으면 다시 로드 (RELOAD_ENABLED일 때만 호출)"""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+
+        try:
+            if self._scan() != self._mtimes:
+                self.load()
+                LOGGER.info("Language files reloaded")
+        except (OSError, ValueError) as e:
+            LOGGER.error(f"Failed to reload language files: {e}")
+
+    def get(self, language: str, key: str) -> str:
+        """번역 조회. 키가 없으면 키 자체를 반환."""
+        if RELOAD_ENABLED:
+            self._maybe_reload()
+
+        table = self._catalog.get(language) or self._catalog.get(DEFAULT_LANGUAGE, {})
+        return table.get(key, key)
+
+    def template(self, language: str, key: str) -> tuple:
+        """format용 템플릿을 미리 분해해 캐시. (literal, field, spec, conversion) 튜플 목록."""
+        cache_key = (language, key)
+        parts = self._templates.get(cache_key)
+        if parts is None:
+            parts = tuple(_formatter.parse(self.get(language, key)))
+            self._templates[cache_key] = parts
+        return parts
+
+    def format(self, language: str, key: str, **kwargs) -> str:
+        """미리 분해한 템플릿으로 번역 문자열 포맷"""
+        chunks = []
+        for literal, field, spec, conversion in self.template(language, key):
+            chunks.append(literal)
+            if field is None:
+                continue
+            if conversion or not field.isidentifier() or "{" in spec:
+                # 속성/인덱스 접근, !r 변환 등은 일반 format 경로 사용
+                return self.get(language, key).format(**kwargs)
+            value = kwargs[field]
+            chunks.append(format(value, spec) if spec else str(value))
+        return "".join(chunks)
+
+
+@lru_cache(maxsize=256)
+def resolve_language(locale: str) -> str:
+    """Discord locale -> 언어 코드 (ko/ja/en)"""
+    if locale.startswith("ko"):
+        language = "ko"
+    elif locale.startswith("ja"):
+        language = "ja"
+    else:
+        language = DEFAULT_LANGUAGE
+
+    # 언어 파일이 없으면 기본값 사용
+    if language not in catalog.languages:
+        language = DEFAULT_LANGUAGE
+    return language
+
+
+def _language_of(interaction) -> str:
+    """사용자의 Discord locale 기반 언어 코드"""
+    if hasattr(interaction, "locale"):
+        return resolve_language(str(interaction.locale))
+    # locale 속성이 없는 경우 기본값 사용
+    return DEFAULT_LANGUAGE
 
 
 def get_lan(interaction, text: str):
@@ -12,28 +140,13 @@ def get_lan(interaction, text: str):
     Returns:
         번역된 텍스트 (한국어/일본어/영어)
     """
-    default_language = "en"  # 기본값은 영어
+    return catalog.get(_language_of(interaction), text)
 
-    # 사용자의 Discord locale 자동 감지
-    if hasattr(interaction, "locale"):
-        user_locale = str(interaction.locale)
-        if user_locale.startswith("ko"):
-            language = "ko"
-        elif user_locale.startswith("ja"):
-            language = "ja"
-        else:
-            language = "en"
-    else:
-        # locale 속성이 없는 경우 기본값 사용
-        language = default_language
 
-    # 언어 파일이 존재하는지 확인
-    if not os.path.exists(f"tapi/languages/{language}.json"):
-        language = default_language
+def format_lan(interaction, text: str, **kwargs):
+    """get_lan(interaction, text).format(**kwargs) 와 동일 (미리 분해한 템플릿 사용)"""
+    return catalog.format(_language_of(interaction), text, **kwargs)
 
-    # 언어 파일 읽기
-    with open(f"tapi/languages/{language}.json", encoding="utf-8") as f:
-        language_data = json.load(f)
 
-    # 키가 없으면 기본값 반환
-    return language_data.get(text, text)
+# 모듈 import 시 한 번만 로드
+catalog = LanguageCatalog(LANGUAGES_DIR)
@@ -0,0 +1,228 @@
+"""이벤트 루프 지연 / 느린 콜백 모니터
+
+게이트웨이, Lavalink 웹소켓, Redis 리스너, 주기 작업이 모두 한 루프에서 돌기 때문에
+동기 호출 하나가 루프를 막으면 전부 같이 멈춘다. 세 가지를 본다.
+
+- 지연 샘플러: LOOP_LAG_INTERVAL 마다 sleep 하고 예정보다 늦게 깨어난 시간(lag)을 기록
+- 느린 콜백: Handle._run 을 감싸 콜백 하나가 LOOP_SLOW_CALLBACK_MS 이상 걸리면
+  어떤 코루틴/태스크였는지 기록 (asyncio debug 모드 없이)
+- 스톨 스택: 워치독 스레드가 콜백 하나가 LOOP_STALL_STACK_MS 이상 돌고 있으면
+  루프 스레드의 스택을 떠서 로그로 남긴다 (막힌 동기 호출 위치)
+
+TAPI_LOOP_SLOW_CALLBACK_MS=0 이면 콜백 계측과 워치독을 끈다.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import functools
+import traceback
+from asyncio import events
+from collections import deque
+
+from tapi import LOGGER
+
+LOOP_LAG_INTERVAL = float(os.getenv("TAPI_LOOP_LAG_INTERVAL", "0.5"))  # (초)
+LOOP_SLOW_CALLBACK_MS = float(os.getenv("TAPI_LOOP_SLOW_CALLBACK_MS", "100"))
+LOOP_STALL_STACK_MS = float(os.getenv("TAPI_LOOP_STALL_STACK_MS", "1000"))
+LOOP_LAG_SAMPLES = 240  # 백분위 계산에 쓰는 최근 샘플 수 (기본 간격으로 2분)
+LOOP_TOP_CALLBACKS = 5  # 지표로 내보낼 느린 콜백 수
+LOOP_SLOW_NAMES = 200  # 느린 콜백 이름별 집계 최대 개수
+LOOP_SLOW_LOG_INTERVAL = 10  # 느린 콜백 경고 로그 최소 간격 (초)
+
+
+def _qualname(obj) -> str:
+    # repr은 메모리 주소가 들어가 객체마다 이름이 달라지므로 타입 이름으로
+    return getattr(obj, "__qualname__", None) or type(obj).__qualname__
+
+
+def describe_callback(callback) -> str:
+    """콜백 -> 사람이 읽을 이름. 태스크 스텝이면 코루틴 이름."""
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        return _qualname(owner.get_coro())
+    if isinstance(callback, functools.partial):
+        return _qualname(callback.func)
+    return _qualname(callback)
+
+
+class LoopMonitor:
+    """이벤트 루프 지연 샘플러 + 느린 콜백 기록"""
+
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_INTERVAL,
+        slow_callback_ms: float = LOOP_SLOW_CALLBACK_MS,
+        stall_stack_ms: float = LOOP_STALL_STACK_MS,
+    ):
+        self.interval = interval
+        self.slow_callback_ms = slow_callback_ms
+        self.stall_stack_ms = stall_stack_ms
+
+        self._lag_task = None
+        self._watchdog = None
+        self._stopped = threading.Event()
+        self._original_run = None
+        self._loop_thread_id = None
+        # 루프 스레드에서 지금 실행 중인 콜백 (시작 시각, handle). 워치독이 읽는다.
+        self._current = None
+
+        self._lags: deque = deque(maxlen=LOOP_LAG_SAMPLES)
+        self.max_lag_ms = 0.0
+        self.slow_callbacks = 0
+        # 콜백 이름 -> [횟수, 총 ms, 최대 ms]
+        self._slow_by_name: dict[str, list] = {}
+        self._slow_logged_at = 0.0
+        self._slow_unlogged = 0  # 로그 간격 때문에 경고를 생략한 느린 콜백 수
+        self.stack_samples = 0
+        self.last_stall = None
+
+    def start(self, loop: asyncio.AbstractEventLoop = None):
+        """루프 스레드에서 호출. 이미 시작했으면 무시."""
+        if self._lag_task is not None:
+            return
+        loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._lag_task = loop.create_task(self._sample_lag())
+
+        if self.slow_callback_ms > 0:
+            self._patch_handle()
+            self._watchdog = threading.Thread(
+                target=self._watch, name="tapi-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._original_run is not None:
+            events.Handle._run = self._original_run
+            self._original_run = None
+        self._watchdog = None
+        self._current = None
+
+    async def _sample_lag(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max((time.perf_counter() - started - self.interval) * 1000, 0.0)
+            self._lags.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, round(lag_ms, 1))
+            if lag_ms >= self.stall_stack_ms:
+                LOGGER.warning(f"Event loop lag {lag_ms:.0f}ms")
+
+    def _patch_handle(self):
+        """모든 콜백 실행 시간을 잰다 (TimerHandle 포함)"""
+        monitor = self
+        original_run = events.Handle._run
+        self._original_run = original_run
+
+        def _run(handle):
+            started = time.perf_counter()
+            monitor._current = (started, handle)
+            try:
+                return original_run(handle)
+            finally:
+                monitor._current = None
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if elapsed_ms >= monitor.slow_callback_ms:
+                    monitor._record_slow(handle, elapsed_ms)
+
+        events.Handle._run = _run
+
+    def _record_slow(self, handle, elapsed_ms: float):
+        name = describe_callback(handle._callback)
+        self.slow_callbacks += 1
+        entry = self._slow_by_name.get(name)
+        if entry is None:
+            if len(self._slow_by_name) >= LOOP_SLOW_NAMES:
+                # 총 시간이 가장 작은 이름을 버린다
+                smallest = min(
+                    self._slow_by_name, key=lambda n: self._slow_by_name[n][1]
+                )
+                del self._slow_by_name[smallest]
+            entry = self._slow_by_name[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += elapsed_ms
+        entry[2] = max(entry[2], elapsed_ms)
+
+        # 스톨 중에는 콜백마다 로그가 쏟아지므로 간격을 둔다
+        now = time.monotonic()
+        if now - self._slow_logged_at < LOOP_SLOW_LOG_INTERVAL:
+            self._slow_unlogged += 1
+            return
+        suppressed = f" (+{self._slow_unlogged} more)" if self._slow_unlogged else ""
+        self._slow_logged_at = now
+        self._slow_unlogged = 0
+        LOGGER.warning(
+            f"Slow event loop callback {name} took {elapsed_ms:.0f}ms{suppressed}"
+        )
+
+    def _watch(self):
+        """워치독 스레드: 오래 도는 콜백의 스택을 콜백당 한 번 기록"""
+        sampled = None
+        poll = max(self.stall_stack_ms / 4000, 0.01)
+        while not self._stopped.wait(poll):
+            current = self._current
+            if current is None or current is sampled:
+                continue
+            started, handle = current
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms < self.stall_stack_ms:
+                continue
+
+            sampled = current
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=15))
+            name = describe_callback(handle._callback)
+            self.stack_samples += 1
+            self.last_stall = {
+                "callback": name,
+                "ms": round(elapsed_ms, 1),
+                "at": time.time(),
+            }
+            LOGGER.warning(
+                f"Event loop blocked by {name} for {elapsed_ms:.0f}ms+, stack:\n{stack}"
+            )
+
+    @staticmethod
+    def _percentile(lags: list, p: float) -> float:
+        if not lags:
+            return 0.0
+        return round(lags[min(int(len(lags) * p), len(lags) - 1)], 1)
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        lags = sorted(self._lags)
+        top = sorted(
+            self._slow_by_name.items(), key=lambda item: item[1][1], reverse=True
+        )[:LOOP_TOP_CALLBACKS]
+        return {
+            "lag_ms": round(self._lags[-1], 1) if self._lags else 0.0,
+            "lag_p50_ms": self._percentile(lags, 0.5),
+            "lag_p99_ms": self._percentile(lags, 0.99),
+            "max_lag_ms": self.max_lag_ms,
+            "slow_callbacks": self.slow_callbacks,
+            "top_slow": [
+                {
+                    "callback": name,
+                    "count": count,
+                    "total_ms": round(total_ms, 1),
+                    "max_ms": round(max_ms, 1),
+                }
+                for name, (count, total_ms, max_ms) in top
+            ],
+            "stack_samples": self.stack_samples,
+            "last_stall": self.last_stall,
+        }
+
+
+# 전역 이벤트 루프 모니터 인스턴스
+loop_monitor = LoopMonitor()
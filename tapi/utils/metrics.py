@@ -0,0 +1,295 @@
+"""Prometheus 호환 지표 (샤드 프로세스마다 /metrics HTTP 엔드포인트)
+
+shard_stats:{id} JSON은 대시보드용 스냅샷이고, 지연 분포는 여기서 카운터/히스토그램으로 낸다.
+prometheus_client 의존성 없이 텍스트 노출 형식(0.0.4)만 구현하고,
+HTTP 서버는 discord.py가 이미 쓰는 aiohttp로 띄운다.
+
+- TAPI_METRICS_PORT: 수신 포트 (기본 9478, 0이면 끔)
+- TAPI_METRICS_HOST: 바인드 주소 (기본 127.0.0.1, 외부 Prometheus가 긁으려면 0.0.0.0)
+"""
+
+import os
+import time
+import bisect
+
+from tapi import LOGGER
+
+METRICS_HOST = os.getenv("TAPI_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("TAPI_METRICS_PORT", "9478"))
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 기본 버킷 (Discord 응답 3초, 웹 명령 타임아웃 20초까지)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._children[key] = self._children.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._children.get(self._key(labels), 0)
+
+    def _render_child(self, key, value):
+        return [
+            f"{self.name}_total{_labels(self.labelnames, key)} {_format_value(value)}"
+        ]
+
+
+class Gauge(_Metric):
+    """현재 값"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self._children[self._key(labels)] = value
+
+    def _render_child(self, key, value):
+        return [f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (초 단위)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        child = self._children.get(key)
+        if child is None:
+            # [버킷별 개수..., +Inf 개수], 합계
+            child = self._children[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        child[0][bisect.bisect_left(self.buckets, seconds)] += 1
+        child[1] += seconds
+
+    def time(self, **labels):
+        """with 블록 실행 시간 기록"""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        child = self._children.get(self._key(labels))
+        return sum(child[0]) if child else 0
+
+    def _render_child(self, key, child):
+        counts, total = child
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(
+                f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            )
+        labels = _labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: dict):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+        return False
+
+
+class MetricsRegistry:
+    """지표 모음 + /metrics HTTP 서버"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._runner = None
+        self.scrapes = 0
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    async def start(self, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        """/metrics 서버 시작. 포트가 0이거나 바인드 실패 시 경고만 남긴다."""
+        if not port or self._runner is not None:
+            return
+        from aiohttp import web
+
+        async def handle(_request):
+            self.scrapes += 1
+            return web.Response(
+                body=self.render().encode(),
+                headers={"Content-Type": CONTENT_TYPE},
+            )
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError as e:
+            LOGGER.warning(f"Metrics endpoint disabled, cannot bind {host}:{port}: {e}")
+            await runner.cleanup()
+            return
+        self._runner = runner
+        LOGGER.info(f"Metrics endpoint listening on {host}:{port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def search_source(query: str) -> str:
+    """get_tracks 쿼리 -> 소스 라벨 (ytsearch, scsearch, spsearch, ..., url)"""
+    prefix, sep, _ = query.partition(":")
+    if sep and prefix.lower().endswith("search"):
+        return prefix.lower()
+    return "url"
+
+
+def channel_kind(channel: str) -> str:
+    """Redis 채널 -> 라벨 (bot:response:{id} 같은 요청별 채널을 하나로 묶는다)"""
+    return ":".join(channel.split(":", 2)[:2])
+
+
+# 전역 지표 레지스트리 인스턴스
+metrics_registry = MetricsRegistry()
+
+SLASH_COMMAND_SECONDS = metrics_registry.histogram(
+    "tapi_slash_command_seconds",
+    "Slash command latency from interaction check to completion",
+    ("command",),
+)
+SLASH_COMMANDS = metrics_registry.counter(
+    "tapi_slash_commands", "Slash commands handled", ("command", "outcome")
+)
+LAVALINK_GET_TRACKS_SECONDS = metrics_registry.histogram(
+    "tapi_lavalink_get_tracks_seconds",
+    "Lavalink loadtracks latency (cache misses only)",
+    ("source",),
+)
+DB_CALL_SECONDS = metrics_registry.histogram(
+    "tapi_db_call_seconds",
+    "Supabase call latency including worker queue wait",
+    ("method",),
+)
+DB_CALL_TIMEOUTS = metrics_registry.counter(
+    "tapi_db_call_timeouts", "Supabase calls that timed out", ("method",)
+)
+REDIS_PUBLISH_SECONDS = metrics_registry.histogram(
+    "tapi_redis_publish_seconds", "Redis PUBLISH latency", ("channel",)
+)
+PANEL_EDITS = metrics_registry.counter(
+    "tapi_panel_edits",
+    "Now playing panel edit outcomes (scheduled, track_start, button)",
+    ("path", "outcome"),
+)
+WEB_COMMAND_SECONDS = metrics_registry.histogram(
+    "tapi_web_command_seconds",
+    "Web dashboard command execution latency",
+    ("command",),
+)
+WEB_COMMAND_QUEUE_SECONDS = metrics_registry.histogram(
+    "tapi_web_command_queue_seconds",
+    "Time web commands wait in the guild mailbox before running",
+    ("command",),
+)
+WEB_COMMANDS = metrics_registry.counter(
+    "tapi_web_commands", "Web dashboard commands dispatched", ("command", "outcome")
+)
+PLAYER_MIGRATIONS = metrics_registry.counter(
+    "tapi_player_migrations",
+    "Players moved between Lavalink nodes",
+    ("reason", "outcome"),
+)
+PLAYER_MIGRATION_SECONDS = metrics_registry.histogram(
+    "tapi_player_migration_seconds",
+    "Time to move one player to another Lavalink node",
+    ("reason",),
+)
+SHARD_GUILDS = metrics_registry.gauge("tapi_shard_guilds", "Guilds on this shard")
+SHARD_PLAYERS = metrics_registry.gauge(
+    "tapi_shard_players", "Connected players on this shard"
+)
+SHARD_LATENCY_SECONDS = metrics_registry.gauge(
+    "tapi_shard_latency_seconds", "Discord gateway latency"
+)
@@ -0,0 +1,249 @@
+"""Lavalink 노드 풀
+
+config.LAVALINK_NODES 의 노드를 전부 등록하고 용도별로 노드를 고른다.
+- 새 플레이어: Lavalink stats(재생 중 플레이어, CPU, 프레임 누락/결손) penalty가 가장 낮은 노드.
+  stats는 1분마다 오므로 그 사이 이 샤드가 배치한 플레이어 수를 더해서
+  재시작 직후 복원처럼 한꺼번에 생기는 플레이어가 한 노드로 몰리지 않게 한다.
+- 검색(loadtracks): 플레이어 노드와 별개로 진행 중인 검색이 가장 적은 노드로 분산
+- 드레인 중인 노드(draining)는 배치/검색 대상에서 뺀다 (player_migration 참고)
+노드별 상태는 metrics()로 shard_stats 에 내보낸다.
+
+검색 전용 노드: 노드 설정에 "role": "search" 를 주면 플레이어를 두지 않고
+검색/URL 조회(loadtracks)만 보낸다. 느린 검색이 오디오 프레임 전송과 경쟁하지 않도록
+검색 노드 전체에 동시 요청 수(TAPI_SEARCH_CONCURRENCY)와 제한 시간(TAPI_SEARCH_TIMEOUT)을 두고,
+검색 노드가 모두 끊겼거나 연결 오류가 나면 재생 노드로 보낸다.
+검색 노드가 없으면 예전처럼 재생 노드에서 제한 없이 조회한다.
+"""
+
+import os
+import asyncio
+from collections import Counter
+from contextlib import contextmanager
+
+import aiohttp
+from lavalink.errors import ClientError
+
+from tapi import LOGGER, LAVALINK_NODES
+
+SEARCH_ROLE = "search"
+PLAYBACK_ROLE = "playback"
+SEARCH_CONCURRENCY = int(os.getenv("TAPI_SEARCH_CONCURRENCY", "8"))
+SEARCH_TIMEOUT = float(os.getenv("TAPI_SEARCH_TIMEOUT", "10"))  # 대기 포함 (초)
+
+
+def is_search_node(node) -> bool:
+    return node.tags.get("role") == SEARCH_ROLE
+
+
+class NodePool:
+    """Lavalink 노드 등록 + 플레이어 배치 / 검색 분산"""
+
+    def __init__(
+        self,
+        nodes: list = LAVALINK_NODES,
+        search_concurrency: int = SEARCH_CONCURRENCY,
+        search_timeout: float = SEARCH_TIMEOUT,
+    ):
+        self.configs = list(nodes)
+        self.client = None
+        # 노드 이름 -> [배치 당시 stats 객체, 그 뒤 배치한 플레이어 수]
+        self._pending: dict[str, list] = {}
+        self._searching = Counter()  # 노드별 진행 중인 검색
+        self.draining: set[str] = set()  # 드레인 중인 노드 이름
+        self.search_timeout = search_timeout
+        self._search_slots = asyncio.Semaphore(search_concurrency)
+
+        self.placements = Counter()
+        self.searches = Counter()
+        self.search_timeouts = 0
+        self.search_fallbacks = 0  # 검색 노드 대신 재생 노드로 보낸 조회
+
+    def register(self, client):
+        """설정된 노드를 lavalink.Client 에 추가 (이미 있는 이름은 건너뜀)"""
+        self.client = client
+        existing = {node.name for node in client.node_manager.nodes}
+        added = 0
+        for config in self.configs:
+            name = config.get("name") or f"{config['host']}:{config['port']}"
+            if name in existing:
+                continue
+            added += 1
+            client.add_node(
+                config["host"],
+                int(config["port"]),
+                config["password"],
+                config.get("region", "eu"),
+                name,
+                ssl=config.get("ssl", False),
+                tags={"role": config.get("role", PLAYBACK_ROLE)},
+            )
+        if added:
+            LOGGER.info(f"Lavalink node pool: {len(client.node_manager.nodes)} nodes")
+
+        # 노드 장애 시 플레이어 이전 (순환 import 방지)
+        from tapi.utils.player_migration import player_migrator
+
+        player_migrator.install(client)
+
+    # --- 플레이어 배치 ---
+
+    def _pending_players(self, node) -> int:
+        entry = self._pending.get(node.name)
+        # 새 stats가 오면 이미 반영된 것으로 본다
+        if entry is None or entry[0] is not node.stats:
+            return 0
+        return entry[1]
+
+    def score(self, node) -> float:
+        return node.penalty + self._pending_players(node)
+
+    def placement_node(self, client, region: str = None, exclude=()):
+        """새 플레이어를 둘 노드. 해당 지역에 노드가 없으면 전체에서 고른다."""
+        nodes = [
+            n
+            for n in client.node_manager.available_nodes
+            if n not in exclude
+            and n.name not in self.draining
+            and not is_search_node(n)
+        ]
+        regional = [n for n in nodes if n.region == region] if region else []
+        nodes = regional or nodes
+        if not nodes:
+            return None
+        return min(nodes, key=self.score)
+
+    def create_player(self, client, guild_id: int, region: str = None):
+        """player_manager.create 대신 사용. 이미 있으면 그대로 반환."""
+        player = client.player_manager.get(guild_id)
+        if player is not None:
+            return player
+
+        node = self.placement_node(client, region)
+        # 사용 가능한 노드가 없으면 lavalink 기본 선택에 맡긴다
+        player = client.player_manager.create(guild_id, node=node)
+        if node is not None:
+            self.record_placement(node)
+        return player
+
+    def record_placement(self, node):
+        entry = self._pending.get(node.name)
+        if entry is None or entry[0] is not node.stats:
+            entry = self._pending[node.name] = [node.stats, 0]
+        entry[1] += 1
+        self.placements[node.name] += 1
+
+    # --- 검색 분산 ---
+
+    def _least_searching(self, nodes):
+        return min(nodes, key=lambda n: (self._searching[n.name], n.penalty))
+
+    def search_tier(self, client) -> list:
+        """사용 가능한 검색 전용 노드"""
+        return [
+            n
+            for n in client.node_manager.available_nodes
+            if is_search_node(n) and n.name not in self.draining
+        ]
+
+    def search_node(self, fallback):
+        """loadtracks를 보낼 재생 노드. 진행 중인 검색이 적은 노드, 같으면 penalty 순."""
+        client = getattr(fallback, "client", None) or self.client
+        nodes = client.node_manager.available_nodes if client else []
+        nodes = [n for n in nodes if not is_search_node(n)]
+        # 드레인 중인 노드만 남았으면 그래도 쓴다
+        nodes = [n for n in nodes if n.name not in self.draining] or nodes
+        if len(nodes) <= 1:
+            return nodes[0] if nodes else fallback
+        return self._least_searching(nodes)
+
+    async def get_tracks(self, fallback, query: str):
+        """node.get_tracks 대신 사용. 검색 노드 우선, 안 되면 재생 노드."""
+        client = getattr(fallback, "client", None) or self.client
+        tier = self.search_tier(client) if client else []
+        if tier:
+            node = self._least_searching(tier)
+            try:
+                return await asyncio.wait_for(
+                    self._search_on_tier(node, query), self.search_timeout
+                )
+            except asyncio.TimeoutError:
+                # 느린 것은 재생 노드로 넘기지 않는다 (그게 오디오를 끊던 원인)
+                self.search_timeouts += 1
+                raise
+            except (aiohttp.ClientError, ClientError) as e:
+                LOGGER.warning(f"Search node {node.name} failed, using playback: {e}")
+
+            self.search_fallbacks += 1
+        elif self.has_search_tier():
+            self.search_fallbacks += 1
+
+        node = self.search_node(fallback)
+        with self.searching(node):
+            return await node.get_tracks(query)
+
+    async def _search_on_tier(self, node, query: str):
+        async with self._search_slots:
+            with self.searching(node):
+                return await node.get_tracks(query)
+
+    def has_search_tier(self) -> bool:
+        return any(c.get("role") == SEARCH_ROLE for c in self.configs)
+
+    @contextmanager
+    def searching(self, node):
+        """검색 진행 중 표시 (with 블록)"""
+        self._searching[node.name] += 1
+        self.searches[node.name] += 1
+        try:
+            yield node
+        finally:
+            self._searching[node.name] -= 1
+
+    def metrics(self):
+        """모니터링용 지표 반환 (노드별 상태)"""
+        if self.client is None:
+            return []
+        players = Counter(
+            player.node.name for player in self.client.player_manager.values()
+        )
+        nodes = []
+        for node in self.client.node_manager.nodes:
+            stats = node.stats
+            available = node.available
+            nodes.append(
+                {
+                    "name": node.name,
+                    "region": node.region,
+                    "available": available,
+                    "draining": node.name in self.draining,
+                    "role": node.tags.get("role", PLAYBACK_ROLE),
+                    "players": players[node.name],  # 이 샤드의 플레이어
+                    "node_players": stats.players,  # 노드 전체 (모든 샤드)
+                    "node_playing": stats.playing_players,
+                    "cpu_system": round(stats.system_load, 3),
+                    "cpu_lavalink": round(stats.lavalink_load, 3),
+                    "frames_nulled": stats.frames_nulled,
+                    "frames_deficit": stats.frames_deficit,
+                    "memory_used_mb": round(stats.memory_used / 1024 / 1024, 1),
+                    "uptime_s": stats.uptime // 1000,
+                    "penalty": round(node.penalty, 1) if available else None,
+                    "stats_fake": stats.is_fake,
+                    "placements": self.placements[node.name],
+                    "searching": self._searching[node.name],
+                    "searches": self.searches[node.name],
+                }
+            )
+        return nodes
+
+    def search_metrics(self):
+        """검색 노드 계층 지표 반환"""
+        return {
+            "search_nodes": len(self.search_tier(self.client)) if self.client else 0,
+            "inflight": sum(self._searching.values()),
+            "timeouts": self.search_timeouts,
+            "fallbacks": self.search_fallbacks,
+        }
+
+
+# 전역 Lavalink 노드 풀 인스턴스
+node_pool = NodePool()
@@ -0,0 +1,169 @@
+"""Now Playing 패널 편집 스케줄러
+
+버튼/명령/웹 명령이 몰리면 같은 메시지에 edit가 연달아 나가 채널 레이트리밋에 걸린다.
+길드별로 대기 중인 편집을 하나로 합치고(debounce), 실제 편집 시점의 최신 상태로
+한 번만 다시 그린다. 곡 변경 편집(on_track_start)은 바로 나가고 대기 중인 편집을 대체한다.
+"""
+
+import time
+import asyncio
+
+import discord
+
+from tapi import LOGGER
+from tapi.utils.metrics import PANEL_EDITS
+
+PANEL_DEBOUNCE = 0.75  # 대기 중인 편집을 모으는 시간 (초)
+PANEL_MIN_INTERVAL = 1.0  # 같은 패널 편집 사이 최소 간격 (초)
+
+
+class PanelUpdateScheduler:
+    """길드별 패널 편집 합치기 + 레이트리밋 대기"""
+
+    def __init__(
+        self, debounce: float = PANEL_DEBOUNCE, min_interval: float = PANEL_MIN_INTERVAL
+    ):
+        self.debounce = debounce
+        self.min_interval = min_interval
+        # guild_id -> 요청한 사용자 (언어/requester 기본값)
+        self._pending: dict[int, int] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._last_edit: dict[int, float] = {}
+        self._blocked_until: dict[int, float] = {}  # 429 Retry-After
+
+        self.requested = 0
+        self.merged = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+
+    def request(self, bot, guild_id: int, user_id: int = 0):
+        """패널 갱신 요청. 이미 대기 중이면 합쳐진다."""
+        self.requested += 1
+        task = self._tasks.get(guild_id)
+        running = task is not None and not task.done()
+        if guild_id in self._pending and running:
+            self.merged += 1
+            PANEL_EDITS.inc(path="scheduled", outcome="merged")
+            return
+
+        self._pending[guild_id] = user_id
+        if not running:
+            self._tasks[guild_id] = asyncio.get_running_loop().create_task(
+                self._run(bot, guild_id)
+            )
+
+    def supersede(self, guild_id: int):
+        """곡 변경/버튼 응답으로 패널을 방금 직접 다시 그렸을 때 호출.
+
+        대기 중인 편집은 더 오래된 상태이므로 버린다.
+        """
+        if self._pending.pop(guild_id, None) is not None:
+            self.dropped += 1
+            PANEL_EDITS.inc(path="scheduled", outcome="dropped")
+        self._last_edit[guild_id] = time.monotonic()
+
+    def cancel(self, guild_id: int):
+        """패널 삭제(정지/퇴장) 시 대기 중인 편집 취소"""
+        if self._pending.pop(guild_id, None) is not None:
+            self.dropped += 1
+            PANEL_EDITS.inc(path="scheduled", outcome="dropped")
+        task = self._tasks.pop(guild_id, None)
+        if task and not task.done():
+            task.cancel()
+        self._last_edit.pop(guild_id, None)
+        self._blocked_until.pop(guild_id, None)
+
+    def _delay(self, guild_id: int) -> float:
+        now = time.monotonic()
+        ready_at = max(
+            now + self.debounce,
+            self._last_edit.get(guild_id, 0) + self.min_interval,
+            self._blocked_until.get(guild_id, 0),
+        )
+        return ready_at - now
+
+    async def _run(self, bot, guild_id: int):
+        try:
+            while guild_id in self._pending:
+                await asyncio.sleep(self._delay(guild_id))
+                # supersede/cancel로 그 사이 비었을 수 있음
+                if guild_id not in self._pending:
+                    break
+                # 지금부터 들어오는 요청은 다음 편집으로
+                user_id = self._pending.pop(guild_id)
+                try:
+                    await self._edit(bot, guild_id, user_id)
+                except Exception as e:
+                    # 레이아웃 생성 등 예상 못한 오류도 다음 요청은 계속 처리
+                    self.failed += 1
+                    PANEL_EDITS.inc(path="scheduled", outcome="failed")
+                    LOGGER.error(f"Unexpected error editing now playing panel: {e}")
+        finally:
+            if self._tasks.get(guild_id) is asyncio.current_task():
+                self._tasks.pop(guild_id, None)
+                # 남은 요청이 있으면 태스크 없이 "merged"로만 쌓이지 않게 비운다
+                self._pending.pop(guild_id, None)
+
+    async def _edit(self, bot, guild_id: int, user_id: int):
+        """현재 플레이어 상태로 패널을 다시 그려 편집"""
+        cog = bot.get_cog("Music")
+        if not cog or not hasattr(cog, "last_music_messages"):
+            return
+        message = cog.last_music_messages.get(guild_id)
+        if message is None:
+            return
+
+        player = bot.lavalink.player_manager.get(guild_id)
+        if not player or not player.current:
+            return
+
+        from tapi.modules.music_views import MusicControlLayout
+        from tapi.utils.v2_components import FakeInteraction
+
+        control_layout = MusicControlLayout(cog, guild_id)
+        requester_id = player.current.requester or user_id
+        user_locale = cog.user_locales.get(requester_id, "en")
+        fake_interaction = FakeInteraction(requester_id, guild_id, user_locale)
+        control_layout.build_layout(fake_interaction, player)
+
+        self._last_edit[guild_id] = time.monotonic()
+        try:
+            await message.edit(view=control_layout)
+            self.sent += 1
+            PANEL_EDITS.inc(path="scheduled", outcome="sent")
+        except (discord.NotFound, discord.Forbidden):
+            # 메시지가 삭제되었거나 권한 없음 → stale 참조 제거
+            self.failed += 1
+            PANEL_EDITS.inc(path="scheduled", outcome="not_found")
+            if cog.last_music_messages.get(guild_id) is message:
+                cog.last_music_messages.pop(guild_id, None)
+        except discord.HTTPException as e:
+            if e.status == 429:
+                # 버킷이 비었음 → Retry-After 만큼 미루고 최신 상태로 다시 시도
+                self.rate_limited += 1
+                PANEL_EDITS.inc(path="scheduled", outcome="rate_limited")
+                retry_after = float(e.response.headers.get("Retry-After", 1))
+                self._blocked_until[guild_id] = time.monotonic() + retry_after
+                self._pending.setdefault(guild_id, user_id)
+            else:
+                self.failed += 1
+                PANEL_EDITS.inc(path="scheduled", outcome="failed")
+                LOGGER.debug(f"Failed to edit now playing panel: {e}")
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "pending": len(self._pending),
+            "requested": self.requested,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited": self.rate_limited,
+        }
+
+
+# 전역 패널 편집 스케줄러 인스턴스
+panel_scheduler = PanelUpdateScheduler()
@@ -0,0 +1,296 @@
+"""Lavalink 노드 장애 / 드레인 시 플레이어 이전
+
+노드 웹소켓이 끊기면 그 노드의 플레이어를 node_pool 배치 규칙으로 다른 노드에 나눠 옮긴다.
+lavalink.py 기본 failover(NodeManager._handle_node_disconnect)는 한 노드로 하나씩 옮기고
+시간도 남기지 않으므로 이 모듈의 처리로 바꾼다.
+- 이전 내용: 재생 중인 곡, 위치, 일시정지, 볼륨, 필터는 player.change_node가 새 노드에 보내고
+  큐, 반복, 셔플은 봇 쪽 플레이어 객체에 있으므로 그대로 유지된다
+- 이전에 실패하면 다음 노드로 바로 다시 시도하고, 드레인은 받아 줄 노드가 없으면 원래 노드로 되돌린다
+- 그래도 옮길 노드가 없으면 기다렸다가 재생 노드가 준비(NodeReadyEvent)되면 옮긴다 (waited)
+- 드레인: 운영자가 노드를 새 플레이어/검색 대상에서 빼고 기존 플레이어를 옮긴다 (무중단 업그레이드용)
+  모든 샤드에 적용하려면 Redis로 발행:
+    PUBLISH bot:node_drain '{"node": "node-1"}'
+    PUBLISH bot:node_drain '{"node": "node-1", "action": "undrain"}'
+  또는 python -m tapi.utils.player_migration drain node-1
+
+- TAPI_MIGRATION_CONCURRENCY: 동시에 옮기는 플레이어 수 (기본 8)
+- TAPI_MIGRATION_TIMEOUT: 플레이어 하나 이전 제한 시간 (초, 기본 10)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+
+import lavalink
+from lavalink.events import NodeReadyEvent
+from lavalink.nodemanager import NodeManager
+
+from tapi import LOGGER
+from tapi.utils.metrics import PLAYER_MIGRATIONS, PLAYER_MIGRATION_SECONDS
+from tapi.utils.node_pool import node_pool
+
+NODE_DRAIN_CHANNEL = "bot:node_drain"
+MIGRATION_CONCURRENCY = int(os.getenv("TAPI_MIGRATION_CONCURRENCY", "8"))
+MIGRATION_TIMEOUT = float(os.getenv("TAPI_MIGRATION_TIMEOUT", "10"))
+
+
+class PlayerMigrator:
+    """노드 단위 플레이어 이전 + 이전 시간 기록"""
+
+    def __init__(
+        self,
+        concurrency: int = MIGRATION_CONCURRENCY,
+        timeout: float = MIGRATION_TIMEOUT,
+    ):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._installed_client = None
+        self._original_disconnect = None
+        self._waiting: dict[int, tuple] = {}  # guild_id -> (플레이어, 원인, 시작 시각)
+
+        self.migrated = 0
+        self.failed = 0
+        self.waited = 0
+        self.last_migration = None
+
+    def install(self, client):
+        """노드 끊김 처리를 교체하고 NodeReadyEvent를 구독한다 (클라이언트당 한 번)"""
+        if self._installed_client is client:
+            return
+        self._installed_client = client
+        client.add_event_hooks(self)
+
+        if self._original_disconnect is None:
+            # NodeManager는 __slots__ 라서 인스턴스가 아니라 클래스에서 바꾼다
+            self._original_disconnect = NodeManager._handle_node_disconnect
+            migrator = self
+
+            async def _handle_node_disconnect(manager, node):
+                await migrator.migrate_node(manager.client, node, "lost")
+
+            NodeManager._handle_node_disconnect = _handle_node_disconnect
+
+    def uninstall(self):
+        if self._original_disconnect is not None:
+            NodeManager._handle_node_disconnect = self._original_disconnect
+            self._original_disconnect = None
+        self._installed_client = None
+
+    # --- 이전 ---
+
+    async def migrate_node(self, client, node, reason: str) -> dict:
+        """node 의 플레이어를 전부 다른 노드로 옮긴다"""
+        players = list(node.players)
+        if not players:
+            return self._summary(node, reason, [], 0, 0.0)
+
+        LOGGER.warning(
+            f"Migrating {len(players)} players off Lavalink node {node.name} ({reason})"
+        )
+        started = time.perf_counter()
+
+        if reason == "lost":
+            for player in players:
+                try:
+                    # 위치 고정 + 이전 끝날 때까지 내부 일시정지
+                    await player.node_unavailable()
+                except Exception as e:
+                    LOGGER.debug(f"node_unavailable failed for {player.guild_id}: {e}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        durations = []
+        failed = waiting = rolled_back = 0
+
+        async def move(player):
+            nonlocal failed, waiting, rolled_back
+            tried = [node]
+            async with semaphore:
+                while True:
+                    # 플레이어마다 다시 골라야 배치 수가 반영되어 여러 노드로 나뉜다
+                    target = node_pool.placement_node(
+                        client, node.region, exclude=tried
+                    )
+                    if target is None:
+                        break
+                    node_pool.record_placement(target)
+                    elapsed = await self.migrate_player(player, target, reason, node)
+                    if elapsed is not None:
+                        durations.append(elapsed)
+                        return
+                    failed += 1
+                    tried.append(target)  # 실패한 노드는 빼고 다음 노드로
+
+                # 받아 줄 노드가 없음: 드레인이면 아직 살아 있는 원래 노드로 되돌린다
+                if reason != "lost" and node.available:
+                    if await self._rollback(player, node, reason):
+                        rolled_back += 1
+                        return
+            # 다음 노드 준비 때 다시 시도
+            self._waiting[player.guild_id] = (player, reason, time.perf_counter())
+            waiting += 1
+
+        await asyncio.gather(*(move(player) for player in players))
+        summary = self._summary(
+            node, reason, durations, failed, time.perf_counter() - started
+        )
+        summary["waiting"] = waiting
+        summary["rolled_back"] = rolled_back
+        self.last_migration = summary
+        LOGGER.warning(f"Lavalink node {node.name} migration finished: {summary}")
+        return summary
+
+    async def migrate_player(self, player, target, reason: str, source=None):
+        """플레이어 하나를 target 노드로. 걸린 시간(초), 실패하면 None"""
+        source = source or player.node
+        started = time.perf_counter()
+        if reason != "lost" and player.node is source:
+            # 위치를 고정하고 살아 있는 노드는 먼저 멈춰서
+            # 두 노드가 같은 음성 세션에 붙지 않게 한다
+            await player.node_unavailable()
+            try:
+                await source.destroy_player(player.guild_id)
+            except Exception as e:
+                LOGGER.debug(f"Failed to destroy {player.guild_id} on source: {e}")
+        position = player.position
+        try:
+            await asyncio.wait_for(player.change_node(target), self.timeout)
+        except Exception as e:
+            self._hold(player, position)
+            self.failed += 1
+            PLAYER_MIGRATIONS.inc(reason=reason, outcome="failed")
+            LOGGER.error(
+                f"Failed to migrate player {player.guild_id} "
+                f"from {source.name} to {target.name}: {e!r}"
+            )
+            return None
+
+        elapsed = time.perf_counter() - started
+        self.migrated += 1
+        PLAYER_MIGRATIONS.inc(reason=reason, outcome="ok")
+        PLAYER_MIGRATION_SECONDS.observe(elapsed, reason=reason)
+        return elapsed
+
+    async def _rollback(self, player, source, reason: str) -> bool:
+        """드레인 실패 시 원래 노드로 되돌려 재생을 이어 간다"""
+        position = player.position
+        try:
+            await asyncio.wait_for(player.change_node(source), self.timeout)
+        except Exception as e:
+            self._hold(player, position)
+            LOGGER.error(f"Failed to roll back player {player.guild_id}: {e!r}")
+            return False
+        PLAYER_MIGRATIONS.inc(reason=reason, outcome="rolled_back")
+        LOGGER.warning(
+            f"Player {player.guild_id} stays on {source.name}, no node could take it"
+        )
+        return True
+
+    @staticmethod
+    def _hold(player, position: int):
+        """change_node가 실패해도 finally에서 내부 일시정지를 풀기 때문에
+        다시 위치를 고정해 재시도 때 멈춘 지점부터 이어지게 한다"""
+        player._last_position = position
+        player._internal_pause = True
+
+    @lavalink.listener(NodeReadyEvent)
+    async def on_node_ready(self, event: NodeReadyEvent):
+        """노드가 준비되면 기다리던 플레이어를 배치 규칙대로 옮긴다 (검색 전용 노드 제외)"""
+        if not self._waiting:
+            return
+        client = event.node.client
+        waiting, self._waiting = self._waiting, {}
+        for guild_id, (player, reason, started) in waiting.items():
+            if client.player_manager.get(guild_id) is not player:
+                continue  # 기다리는 동안 정리된 플레이어
+            target = node_pool.placement_node(client, player.node.region)
+            if target is None:
+                self._waiting[guild_id] = (player, reason, started)
+                continue
+            node_pool.record_placement(target)
+            if await self.migrate_player(player, target, reason) is None:
+                self._waiting[guild_id] = (player, reason, started)
+            else:
+                self.waited += 1
+                LOGGER.info(
+                    f"Player {guild_id} moved to {target.name} after waiting "
+                    f"{time.perf_counter() - started:.1f}s for a Lavalink node"
+                )
+
+    @staticmethod
+    def _summary(node, reason, durations, failed, elapsed) -> dict:
+        durations = sorted(durations)
+        return {
+            "node": node.name,
+            "reason": reason,
+            "migrated": len(durations),
+            "failed": failed,
+            "p50_ms": (
+                round(durations[len(durations) // 2] * 1000, 1) if durations else 0.0
+            ),
+            "max_ms": round(durations[-1] * 1000, 1) if durations else 0.0,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "at": time.time(),
+        }
+
+    # --- 드레인 ---
+
+    async def drain(self, client, name: str) -> dict:
+        """노드를 배치/검색 대상에서 빼고 플레이어를 옮긴다"""
+        node = next((n for n in client.node_manager.nodes if n.name == name), None)
+        if node is None:
+            raise ValueError(f"Unknown Lavalink node: {name}")
+        node_pool.draining.add(name)
+        return await self.migrate_node(client, node, "drain")
+
+    @staticmethod
+    def undrain(name: str):
+        node_pool.draining.discard(name)
+        LOGGER.info(f"Lavalink node {name} is accepting players again")
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "migrated": self.migrated,
+            "failed": self.failed,
+            "waited": self.waited,
+            "waiting": len(self._waiting),
+            "draining": sorted(node_pool.draining),
+            "last": self.last_migration,
+        }
+
+
+async def handle_node_drain(bot, data: dict):
+    """bot:node_drain 이벤트: 이 샤드의 플레이어를 드레인/복귀"""
+    name = data.get("node")
+    if not name or not bot.lavalink:
+        return
+    if data.get("action") == "undrain":
+        player_migrator.undrain(name)
+        return
+    try:
+        await player_migrator.drain(bot.lavalink, name)
+    except ValueError as e:
+        LOGGER.warning(str(e))
+
+
+async def _publish_drain(action: str, name: str):
+    from tapi.utils.redis_manager import redis_manager
+
+    await redis_manager.publish(
+        NODE_DRAIN_CHANNEL, json.dumps({"node": name, "action": action})
+    )
+    await redis_manager.close()
+
+
+# 전역 플레이어 이전 인스턴스
+player_migrator = PlayerMigrator()
+
+
+if __name__ == "__main__":
+    # python -m tapi.utils.player_migration drain|undrain <node>
+    if len(sys.argv) != 3 or sys.argv[1] not in ("drain", "undrain"):
+        sys.exit("usage: python -m tapi.utils.player_migration drain|undrain <node>")
+    asyncio.run(_publish_drain(sys.argv[1], sys.argv[2]))
+    print(f"Published {sys.argv[1]} for Lavalink node {sys.argv[2]}")
@@ -0,0 +1,79 @@
+"""활성 플레이어 레지스트리
+
+주기 작업(샤드 상태, 음성 정리, 종료 공지, 재생 상태 저장)이 self.guilds 전체를 돌며
+player_manager.get 을 부르지 않도록, 음성 연결/플레이어가 있는 길드 ID만 모아 둔다.
+AudioConnection.connect/_destroy 와 Lavalink 이벤트에서 갱신하고,
+이벤트가 빠졌을 때를 대비해 reconcile() 로 player_manager/voice_clients 와 맞춘다.
+"""
+
+
+class ActivePlayerRegistry:
+    """음성 연결 또는 Lavalink 플레이어가 있는 길드 ID 집합"""
+
+    def __init__(self):
+        self._guild_ids: set[int] = set()
+        self.added = 0
+        self.removed = 0
+        self.reconciled = 0
+
+    def add(self, guild_id: int):
+        if guild_id not in self._guild_ids:
+            self._guild_ids.add(guild_id)
+            self.added += 1
+
+    def discard(self, guild_id: int):
+        if guild_id in self._guild_ids:
+            self._guild_ids.discard(guild_id)
+            self.removed += 1
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._guild_ids
+
+    def __len__(self) -> int:
+        return len(self._guild_ids)
+
+    def players(self, bot) -> list:
+        """(guild, player) 목록. player는 없을 수 있다 (음성 연결만 남은 경우).
+
+        순회 중 await 해도 되도록 목록으로 반환하고, 길드/플레이어/음성 연결이
+        모두 사라진 항목은 정리한다.
+        """
+        lavalink = getattr(bot, "lavalink", None)
+        result = []
+        for guild_id in list(self._guild_ids):
+            guild = bot.get_guild(guild_id)
+            player = lavalink.player_manager.get(guild_id) if lavalink else None
+            if guild is None or (player is None and guild.voice_client is None):
+                self.discard(guild_id)
+                continue
+            result.append((guild, player))
+        return result
+
+    def reconcile(self, bot) -> int:
+        """player_manager 와 voice_clients 기준으로 빠진 길드를 추가. 추가된 수 반환.
+
+        둘 다 실제 연결 수에 비례하므로 길드 전체를 도는 것보다 훨씬 싸다.
+        """
+        guild_ids = {vc.guild.id for vc in bot.voice_clients if vc.guild}
+        lavalink = getattr(bot, "lavalink", None)
+        if lavalink:
+            guild_ids.update(lavalink.player_manager.players)
+
+        missing = guild_ids - self._guild_ids
+        for guild_id in missing:
+            self.add(guild_id)
+        self.reconciled += len(missing)
+        return len(missing)
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "players": len(self._guild_ids),
+            "added": self.added,
+            "removed": self.removed,
+            "reconciled": self.reconciled,
+        }
+
+
+# 전역 활성 플레이어 레지스트리 인스턴스
+player_registry = ActivePlayerRegistry()
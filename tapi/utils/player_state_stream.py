@@ -0,0 +1,154 @@
+"""bot:player_update 델타 인코딩
+
+길드별로 마지막으로 발행한 상태와 버전을 기억해 두고, 바뀐 필드와
+큐 splice 연산만 발행한다. 일정 버전/시간마다, 또는 대시보드가 재동기화를
+요청하면 전체 상태(snapshot)를 보낸다.
+
+snapshot: {"guild_id", "event", "type": "snapshot", "v", "state"}
+delta:    {"guild_id", "event", "type": "delta", "v", "base", "changes", "removed", "queue_ops"}
+
+- changes: 최상위 필드 중 바뀐 값. current_track은 같은 곡이면 바뀐 하위 필드만 (병합)
+- removed: 이전 상태에는 있었지만 사라진 최상위 필드 이름
+- queue_ops: [index, delete_count, [추가할 트랙...]] 목록. 순서대로 적용한다.
+  트랙은 모든 필드로 비교하므로 같은 곡의 필드가 바뀌어도 교체 연산이 나간다.
+- get_state는 현재 상태를 발행해 새 기준으로 삼고 그 상태와 버전을 반환한다.
+- 대시보드는 base가 자신이 가진 버전과 다르면 bot:player_resync로 snapshot을 요청한다.
+"""
+
+import time
+from difflib import SequenceMatcher
+
+PLAYER_RESYNC_CHANNEL = "bot:player_resync"
+
+SNAPSHOT_EVERY = 50  # 이 버전 수마다 snapshot
+SNAPSHOT_INTERVAL = 60  # 마지막 snapshot 후 이 시간(초)이 지나면 snapshot
+
+
+def _track_key(track: dict):
+    return track.get("uri")
+
+
+def _track_fields(track: dict):
+    return tuple(sorted(track.items()))
+
+
+def diff_queue(old: list, new: list) -> list:
+    """old -> new 로 만드는 splice 연산 목록"""
+    matcher = SequenceMatcher(
+        None,
+        [_track_fields(t) for t in old],
+        [_track_fields(t) for t in new],
+        autojunk=False,
+    )
+    ops = []
+    # 뒤에서부터 적용하면 앞쪽 인덱스가 바뀌지 않으므로 역순으로 내보냄
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == "equal":
+            continue
+        ops.append([i1, i2 - i1, new[j1:j2]])
+    return ops
+
+
+def apply_queue_ops(queue: list, ops: list) -> list:
+    """diff_queue 결과 적용 (대시보드 구현 참고용)"""
+    queue = list(queue)
+    for index, delete_count, items in ops:
+        queue[index : index + delete_count] = items
+    return queue
+
+
+def _diff_current(old, new):
+    """current_track 변경분. 같은 곡이면 바뀐 하위 필드만."""
+    if old is None or new is None or _track_key(old) != _track_key(new):
+        return new
+    if not old.keys() <= new.keys():
+        return new  # 병합으로는 하위 필드를 지울 수 없음
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+class PlayerStateStream:
+    """길드별 상태 버전 관리 + 델타 계산"""
+
+    def __init__(self):
+        self._states: dict[str, dict] = {}  # guild_id -> 마지막 발행 상태
+        self._versions: dict[str, int] = {}
+        self._snapshot_at: dict[str, float] = {}
+        self.snapshots = 0
+        self.deltas = 0
+
+    def request_snapshot(self, guild_id):
+        """다음 발행을 snapshot으로 (재동기화 요청)"""
+        self._states.pop(str(guild_id), None)
+
+    def reset(self, guild_id):
+        """연결 종료 시 상태 제거 (버전은 계속 증가)"""
+        guild_id = str(guild_id)
+        self._states.pop(guild_id, None)
+        self._snapshot_at.pop(guild_id, None)
+
+    def version(self, guild_id) -> int:
+        return self._versions.get(str(guild_id), 0)
+
+    def encode(self, guild_id, event: str, state: dict) -> dict:
+        """발행할 메시지 생성 (상태 버전 증가)"""
+        guild_id = str(guild_id)
+        previous = self._states.get(guild_id)
+        version = self._versions.get(guild_id, 0) + 1
+        self._versions[guild_id] = version
+        self._states[guild_id] = state
+
+        now = time.monotonic()
+        needs_snapshot = (
+            previous is None
+            or version % SNAPSHOT_EVERY == 0
+            or now - self._snapshot_at.get(guild_id, 0) > SNAPSHOT_INTERVAL
+        )
+
+        if not needs_snapshot:
+            changes = {}
+            removed = [key for key in previous if key not in state]
+            for key, value in state.items():
+                if key == "queue" or previous.get(key) == value:
+                    continue
+                if key == "current_track":
+                    value = _diff_current(previous.get(key), value)
+                changes[key] = value
+
+            queue_ops = diff_queue(previous.get("queue", []), state.get("queue", []))
+            inserted = sum(len(items) for _, _, items in queue_ops)
+            # 큐 대부분이 바뀌었으면 snapshot이 더 작다
+            needs_snapshot = inserted > max(len(state.get("queue", [])) // 2, 10)
+
+        if needs_snapshot:
+            self._snapshot_at[guild_id] = now
+            self.snapshots += 1
+            return {
+                "guild_id": guild_id,
+                "event": event,
+                "type": "snapshot",
+                "v": version,
+                "state": state,
+            }
+
+        self.deltas += 1
+        return {
+            "guild_id": guild_id,
+            "event": event,
+            "type": "delta",
+            "v": version,
+            "base": version - 1,
+            "changes": changes,
+            "removed": removed,
+            "queue_ops": queue_ops,
+        }
+
+    def metrics(self):
+        return {
+            "guilds": len(self._states),
+            "snapshots": self.snapshots,
+            "deltas": self.deltas,
+        }
+
+
+# 전역 플레이어 상태 스트림 인스턴스
+player_state_stream = PlayerStateStream()
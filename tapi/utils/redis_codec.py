@@ -0,0 +1,99 @@
+"""Redis 페이로드 코덱
+
+샤드 상태, 활성 플레이어, 재생 상태, bot:player_update, bot:response:* 를
+TAPI_REDIS_CODEC 으로 고른 코덱으로 직렬화한다.
+
+- json (기본): 표준 json, 접두사 없음 (기존 대시보드와 그대로 호환)
+- orjson: b"J1:" + JSON (orjson으로 인코딩, 내용은 JSON과 같음)
+- msgpack: b"M1:" + msgpack 바이너리
+
+읽는 쪽은 접두사(콘텐츠 타입 + 버전)를 보고 디코드하므로
+샤드마다 코덱이 달라도 되고, 웹 대시보드는 지원하는 코덱부터 전환하면 된다.
+"""
+
+import os
+import json
+
+from tapi import LOGGER
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_PREFIX = b"J1:"
+MSGPACK_PREFIX = b"M1:"
+
+
+class Codec:
+    """이름 / 접두사 / 인코더"""
+
+    def __init__(self, name: str, prefix: bytes, dumps):
+        self.name = name
+        self.prefix = prefix
+        self._dumps = dumps
+
+    def encode(self, obj):
+        data = self._dumps(obj)
+        if not self.prefix:
+            return data
+        if isinstance(data, str):
+            data = data.encode()
+        return self.prefix + data
+
+    def __repr__(self):
+        return f"<Codec {self.name}>"
+
+
+def _orjson_dumps(obj) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(obj) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def available_codecs() -> dict:
+    """설치된 라이브러리로 사용할 수 있는 코덱"""
+    codecs = {"json": Codec("json", b"", json.dumps)}
+    if orjson is not None:
+        codecs["orjson"] = Codec("orjson", JSON_PREFIX, _orjson_dumps)
+    if msgpack is not None:
+        codecs["msgpack"] = Codec("msgpack", MSGPACK_PREFIX, _msgpack_dumps)
+    return codecs
+
+
+def get_codec(name: str = None) -> Codec:
+    """이름으로 코덱 선택. 라이브러리가 없으면 json으로 대체."""
+    name = name or os.getenv("TAPI_REDIS_CODEC", "json")
+    codecs = available_codecs()
+    if name not in codecs:
+        LOGGER.warning(f"Redis codec '{name}' is not available, falling back to json")
+        name = "json"
+    return codecs[name]
+
+
+def decode(raw):
+    """접두사를 보고 디코드 (접두사 없으면 기존 JSON). None은 그대로."""
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        # decode_responses 클라이언트로 읽은 값 (JSON만 가능)
+        if raw.startswith("J1:"):
+            raw = raw[3:]
+        return json.loads(raw)
+
+    if raw.startswith(MSGPACK_PREFIX):
+        if msgpack is None:
+            raise ValueError("msgpack payload received but msgpack is not installed")
+        return msgpack.unpackb(raw[len(MSGPACK_PREFIX) :], raw=False)
+    if raw.startswith(JSON_PREFIX):
+        raw = raw[len(JSON_PREFIX) :]
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -1,15 +1,61 @@
-"""Redis Pub/Sub 리스너 - 웹 대시보드 명령 수신 처리"""
+"""웹 대시보드 명령 수신 처리
 
+명령은 길드를 담당하는 샤드의 Redis 스트림으로 들어온다 (command_stream 참고).
+- 길드 명령: bot:command_stream:{shard_id}  (shard_id = (guild_id >> 22) % shard_count)
+- 글로벌 명령: bot:command_stream:global  (샤드 0이 처리)
+
+Pub/Sub으로 발행하는 대시보드 호환 (브리지, 받은 명령을 담당 샤드 스트림에 추가):
+- bot:command:{shard_id}, bot:command:global
+- 이전 대시보드가 보내는 bot:command 는 샤드 0이 받는다.
+"""
+
+import os
 import json
 import asyncio
 from tapi import LOGGER
 from tapi.utils.redis_manager import redis_manager
+from tapi.utils.command_stream import (
+    command_stream,
+    command_stream_key,
+    enqueue_command,
+    GLOBAL_COMMAND_STREAM,
+)
 from tapi.utils.web_command_handler import (
     dispatch_command,
     get_player_state,
     GLOBAL_COMMANDS,
 )
 
+LEGACY_COMMAND_CHANNEL = "bot:command"
+COMMAND_CHANNEL_PREFIX = "bot:command:"
+GLOBAL_COMMAND_CHANNEL = "bot:command:global"
+
+# bot:command 로 발행하는 이전 대시보드 호환 (모두 전환되면 끌 수 있음)
+COMMAND_BRIDGE = os.getenv("TAPI_COMMAND_BRIDGE", "1") == "1"
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Discord 샤드 공식"""
+    return (guild_id >> 22) % max(shard_count or 1, 1)
+
+
+def command_channel(command: str, guild_id: int, shard_count: int) -> str:
+    """명령을 발행할 Pub/Sub 채널 (호환용)"""
+    if command in GLOBAL_COMMANDS:
+        return GLOBAL_COMMAND_CHANNEL
+    return f"{COMMAND_CHANNEL_PREFIX}{shard_for_guild(guild_id, shard_count)}"
+
+
+def command_stream_for(command: str, guild_id: int, shard_count: int) -> str:
+    """명령을 추가할 스트림"""
+    if command in GLOBAL_COMMANDS:
+        return GLOBAL_COMMAND_STREAM
+    return command_stream_key(shard_for_guild(guild_id, shard_count))
+
+
+def _shard_info(bot):
+    return getattr(bot, "shard_id", 0) or 0, getattr(bot, "shard_count", 1) or 1
+
 
 async def start_command_listener(bot):
     """웹 대시보드 명령을 수신하는 백그라운드 태스크를 시작합니다."""
@@ -20,26 +66,41 @@ async def start_command_listener(bot):
     await bot.wait_until_ready()
     LOGGER.info("Starting web command listener...")
 
+    await asyncio.gather(
+        _keep_running("command stream", command_stream.run, bot, _process_command),
+        _keep_running("command bridge", _listen_for_commands, bot),
+    )
+
+
+async def _keep_running(name: str, func, *args):
+    """연결이 끊기면 다시 시작"""
     while True:
         try:
-            await _listen_for_commands(bot)
+            await func(*args)
         except asyncio.CancelledError:
-            LOGGER.info("Web command listener cancelled")
+            LOGGER.info(f"Web {name} listener cancelled")
             break
         except Exception as e:
-            LOGGER.error(f"Web command listener error: {e}")
-            await asyncio.sleep(5)  # 재연결 대기
+            LOGGER.error(f"Web {name} listener error: {e}")
+        await asyncio.sleep(5)  # 재연결 대기
 
 
 async def _listen_for_commands(bot):
-    """Redis Pub/Sub에서 명령을 수신하고 처리합니다."""
+    """Pub/Sub으로 들어온 명령을 담당 샤드 스트림으로 옮깁니다 (호환 브리지)."""
     pubsub = redis_manager.create_async_pubsub()
     if not pubsub:
         LOGGER.error("Failed to create async pubsub")
         return
 
-    await pubsub.subscribe("bot:command")
-    LOGGER.info("Subscribed to bot:command channel")
+    shard_id, _ = _shard_info(bot)
+    channels = [f"{COMMAND_CHANNEL_PREFIX}{shard_id}"]
+    if shard_id == 0:
+        channels.append(GLOBAL_COMMAND_CHANNEL)
+        if COMMAND_BRIDGE:
+            channels.append(LEGACY_COMMAND_CHANNEL)
+
+    await pubsub.subscribe(*channels)
+    LOGGER.info(f"Subscribed to command channels: {', '.join(channels)}")
 
     try:
         async for message in pubsub.listen():
@@ -48,16 +109,24 @@ async def _listen_for_commands(bot):
 
             try:
                 data = json.loads(message["data"])
-                await _process_command(bot, data)
+                await _bridge_command(bot, data, message["data"])
             except json.JSONDecodeError:
                 LOGGER.error(f"Invalid JSON in command: {message['data']}")
             except Exception as e:
-                LOGGER.error(f"Error processing command: {e}")
+                LOGGER.error(f"Error bridging command: {e}")
     finally:
-        await pubsub.unsubscribe("bot:command")
+        await pubsub.unsubscribe(*channels)
         await pubsub.close()
 
 
+async def _bridge_command(bot, data: dict, raw: str):
+    """Pub/Sub 명령을 담당 샤드의 스트림에 추가"""
+    _, shard_count = _shard_info(bot)
+    command = data.get("command", "")
+    guild_id = int(data.get("guild_id", 0))
+    await enqueue_command(command_stream_for(command, guild_id, shard_count), data, raw)
+
+
 async def _process_command(bot, data: dict):
     """수신된 명령을 처리합니다."""
     guild_id = int(data.get("guild_id", 0))
@@ -68,16 +137,12 @@ async def _process_command(bot, data: dict):
 
     is_global = command in GLOBAL_COMMANDS
 
-    # 글로벌 명령은 첫 번째 샤드만 처리 (shard_id == 0 또는 단일 샤드)
-    if is_global:
-        shard_id = getattr(bot, "shard_id", 0) or 0
-        if shard_id != 0:
-            return
-    else:
-        # 이 샤드가 해당 길드를 관리하는지 확인
-        guild = bot.get_guild(guild_id)
-        if not guild:
-            return  # 다른 샤드가 처리
+    # 담당 샤드로 라우팅되었는데 길드가 없으면 봇이 없는 길드
+    if not is_global and not bot.get_guild(guild_id):
+        await redis_manager.publish_response(
+            request_id, {"success": False, "error": "Guild not found"}
+        )
+        return
 
     LOGGER.info(f"Web command: {command} for guild {guild_id} by user {user_id}")
 
@@ -85,8 +150,7 @@ async def _process_command(bot, data: dict):
     result = await dispatch_command(bot, command, guild_id, user_id, params)
 
     # 응답 발행
-    response_channel = f"bot:response:{request_id}"
-    await redis_manager.publish(response_channel, json.dumps(result))
+    await redis_manager.publish_response(request_id, result)
 
     if not result.get("success"):
         LOGGER.info(f"Web command failed: {command} - {result.get('error', 'unknown')}")
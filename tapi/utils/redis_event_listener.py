@@ -0,0 +1,115 @@
+"""Redis Pub/Sub 리스너 - 샤드 간 캐시 동기화 이벤트 수신 처리"""
+
+import json
+import asyncio
+from tapi import LOGGER
+from tapi.utils.database import Database, AsyncDatabase, VOTE_UPDATE_CHANNEL
+from tapi.utils.redis_manager import redis_manager
+from tapi.utils.player_state_stream import player_state_stream, PLAYER_RESYNC_CHANNEL
+from tapi.utils.web_command_handler import get_player_state
+from tapi.utils.settings_store import settings_store, SETTINGS_INVALIDATE_CHANNEL
+from tapi.utils.player_migration import handle_node_drain, NODE_DRAIN_CHANNEL
+
+
+async def start_event_listener(bot):
+    """캐시 동기화 이벤트를 수신하는 백그라운드 태스크를 시작합니다."""
+    if not redis_manager.available:
+        LOGGER.warning("Redis not available, cache event listener disabled")
+        return
+
+    await bot.wait_until_ready()
+    LOGGER.info("Starting cache event listener...")
+
+    while True:
+        try:
+            await _listen_for_events(bot)
+        except asyncio.CancelledError:
+            LOGGER.info("Cache event listener cancelled")
+            break
+        except Exception as e:
+            LOGGER.error(f"Cache event listener error: {e}")
+            await asyncio.sleep(5)  # 재연결 대기
+
+
+async def _listen_for_events(bot):
+    """등록된 채널을 구독하고 이벤트를 핸들러로 전달합니다."""
+    pubsub = redis_manager.create_async_pubsub()
+    if not pubsub:
+        LOGGER.error("Failed to create async pubsub")
+        return
+
+    channels = list(EVENT_HANDLERS)
+    await pubsub.subscribe(*channels)
+    LOGGER.info(f"Subscribed to cache event channels: {', '.join(channels)}")
+
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+
+            handler = EVENT_HANDLERS.get(message["channel"])
+            if not handler:
+                continue
+
+            try:
+                data = json.loads(message["data"])
+                await handler(bot, data)
+            except json.JSONDecodeError:
+                LOGGER.error(f"Invalid JSON in cache event: {message['data']}")
+            except Exception as e:
+                LOGGER.error(f"Error processing cache event: {e}")
+    finally:
+        await pubsub.unsubscribe(*channels)
+        await pubsub.close()
+
+
+async def handle_settings_invalidate(bot, data: dict):
+    """길드 설정 변경 이벤트 처리.
+
+    settings가 함께 오면 그대로 반영하고, guild_id만 오면(웹 대시보드 등)
+    이 샤드가 담당하는 길드일 때 다시 불러온다.
+    """
+    db = AsyncDatabase()
+    if data.get("origin") == db.origin:
+        return
+
+    guild_id = int(data.get("guild_id", 0))
+    if not guild_id:
+        return
+
+    settings = data.get("settings")
+    if settings:
+        settings_store.set(guild_id, settings)
+        return
+
+    settings_store.invalidate(guild_id)
+    if bot.get_guild(guild_id):
+        await db.preload_guild_settings([guild_id], timeout=None)
+
+
+async def handle_vote_update(bot, data: dict):
+    """vote-worker가 발행한 투표 이벤트를 캐시에 즉시 반영"""
+    user_id = data.get("user_id")
+    if not user_id:
+        return
+    Database().cache_vote(user_id, data.get("voted_at"))
+
+
+async def handle_player_resync(bot, data: dict):
+    """대시보드가 델타를 놓쳤을 때 해당 길드의 전체 상태를 다시 발행"""
+    guild_id = int(data.get("guild_id", 0))
+    if not guild_id or not bot.get_guild(guild_id):
+        return  # 다른 샤드 담당
+
+    player_state_stream.request_snapshot(guild_id)
+    state = get_player_state(bot, guild_id)
+    await redis_manager.publish_player_update(guild_id, "resync", state)
+
+
+# 채널 -> 핸들러
+EVENT_HANDLERS = {
+    SETTINGS_INVALIDATE_CHANNEL: handle_settings_invalidate,
+    VOTE_UPDATE_CHANNEL: handle_vote_update,
+    PLAYER_RESYNC_CHANNEL: handle_player_resync,
+    NODE_DRAIN_CHANNEL: handle_node_drain,
+}
@@ -1,6 +1,11 @@
 import json
 import os
+import time
 from tapi import LOGGER
+from tapi.utils.player_state_stream import player_state_stream
+from tapi.utils.active_player_keys import ActivePlayerKeyTracker
+from tapi.utils.redis_codec import get_codec, decode
+from tapi.utils.metrics import REDIS_PUBLISH_SECONDS, channel_kind
 
 try:
     import redis
@@ -11,330 +16,498 @@ except ImportError:
     REDIS_AVAILABLE = False
     LOGGER.warning("Redis is not available. Some features may be disabled.")
 
+# 샤드 하나가 동시에 사용하는 최대 Redis 연결 수 (Pub/Sub 리스너 포함)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))
+REDIS_POOL_TIMEOUT = 5  # 풀이 가득 찼을 때 연결을 기다리는 시간 (초)
+# 이전 대시보드용 active_players:{shard} 전체 JSON도 함께 기록
+ACTIVE_PLAYERS_BLOB = os.getenv("TAPI_ACTIVE_PLAYERS_BLOB", "0") == "1"
+
+# 업타임 기록 스크립트 (모든 서비스를 원자적으로 한 번에)
+# KEYS: 서비스마다 [bitmap, seen, count]
+# ARGV: [check_index, ttl, 서비스별 is_up(0/1)...]
+UPTIME_RECORD_SCRIPT = """
+local index = ARGV[1]
+local ttl = tonumber(ARGV[2])
+for i = 1, #KEYS / 3 do
+    local bitmap, seen, count = KEYS[i * 3 - 2], KEYS[i * 3 - 1], KEYS[i * 3]
+    redis.call('SETBIT', bitmap, index, ARGV[i + 2])
+    -- 해당 check_index가 처음 기록되는 경우에만 카운트 증가
+    -- (봇 재시작 등으로 같은 슬롯이 중복 기록되는 것 방지)
+    if redis.call('SADD', seen, index) == 1 then
+        redis.call('INCR', count)
+    end
+    -- TTL은 키가 새로 생성된 경우에만
+    for _, key in ipairs({bitmap, seen, count}) do
+        if redis.call('TTL', key) < 0 then
+            redis.call('EXPIRE', key, ttl)
+        end
+    end
+end
+return #KEYS / 3
+"""
+
 
 class RedisManager:
+    """비동기 Redis 매니저 (공유 커넥션 풀 + 파이프라인)"""
+
     def __init__(self):
         self.redis_host = os.getenv("REDIS_HOST", "localhost")
         self.redis_port = 6379
         self.redis_db = 0
-        self.redis_client = None
+        self._pool = None
         self._async_client = None
+        self._binary_pool = None
+        self._binary_client = None
+        self._uptime_script = None
         self.shard_stats_key_prefix = "shard_stats:"
-        self.active_players_key_prefix = "active_players:"
+        self.active_players_key_prefix = "active_players:"  # (호환용) 샤드 전체 JSON
+        self.active_players_index_prefix = "active_player_index:"  # 샤드별 길드 ID set
+        self.active_player_key_prefix = "active_player:"  # 길드별 해시
         self.bot_guilds_key_prefix = "bot_guilds:"
         self.playback_state_key_prefix = "playback_state:"  # 점검 시 재생 상태 저장용
         self.shard_status_ttl = 60 * 10  # 10분
         self.active_player_ttl = 60  # 1분 (자주 업데이트되므로 짧게)
         self.playback_state_ttl = 60 * 10  # 10분 (점검 동안 유지)
         self.available = REDIS_AVAILABLE
+        self.active_player_keys = ActivePlayerKeyTracker(self.active_player_ttl)
+        self.codec = get_codec()
+
+        # 지표
+        self.heartbeats = 0
+        self.errors = 0
+        self.last_heartbeat_ms = 0.0
 
-    def connect(self):
+    async def connect(self):
         """Redis 서버에 연결합니다."""
         if not self.available:
             LOGGER.warning("Redis is not available. Skipping connection.")
             return False
 
         try:
-            self.redis_client = redis.Redis(
-                host=self.redis_host,
-                port=self.redis_port,
-                db=self.redis_db,
-                decode_responses=True,  # 응답을 자동으로 UTF-8로 디코딩
-            )
-            self.redis_client.ping()
+            await self.get_async_client().ping()
             LOGGER.info("Successfully connected to Redis.")
             return True
         except redis.exceptions.ConnectionError as e:
             LOGGER.error(f"Failed to connect to Redis: {e}")
-            self.redis_client = None
             return False
         except Exception as e:
             LOGGER.error(f"Unexpected error connecting to Redis: {e}")
-            self.redis_client = None
             return False
 
-    def get_client(self):
-        """Redis 클라이언트 인스턴스를 반환합니다."""
-        if not self.redis_client:
-            self.connect()
-        return self.redis_client
+    def get_async_client(self):
+        """공유 커넥션 풀을 쓰는 비동기 Redis 클라이언트를 반환합니다."""
+        if not self.available:
+            return None
+        if not self._async_client:
+            # 풀이 가득 차면 에러 대신 반납을 기다린다
+            self._pool = aioredis.BlockingConnectionPool(
+                host=self.redis_host,
+                port=self.redis_port,
+                db=self.redis_db,
+                decode_responses=True,  # 응답을 자동으로 UTF-8로 디코딩
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+            )
+            self._async_client = aioredis.Redis(connection_pool=self._pool)
+        return self._async_client
 
-    def update_shard_status(self, shard_id: int, data: dict):
-        """특정 샤드의 상태 정보를 업데이트하고 TTL을 설정합니다."""
+    def get_binary_client(self):
+        """코덱으로 인코딩된 값을 읽는 클라이언트 (응답을 bytes 그대로 반환)"""
+        if not self.available:
+            return None
+        if not self._binary_client:
+            self._binary_pool = aioredis.BlockingConnectionPool(
+                host=self.redis_host,
+                port=self.redis_port,
+                db=self.redis_db,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+            )
+            self._binary_client = aioredis.Redis(connection_pool=self._binary_pool)
+        return self._binary_client
+
+    def encode(self, obj):
+        """설정된 코덱으로 직렬화 (redis_codec 참고)"""
+        return self.codec.encode(obj)
+
+    async def close(self):
+        """커넥션 풀을 닫습니다."""
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._uptime_script = None
+        if self._binary_client:
+            await self._binary_client.aclose()
+            self._binary_client = None
+        for pool in (self._pool, self._binary_pool):
+            if pool:
+                await pool.disconnect()
+        self._pool = None
+        self._binary_pool = None
+
+    # --- 샤드 상태 ---
+
+    async def publish_shard_heartbeat(
+        self, shard_id: int, shard_data: dict, active_players: list, guild_ids: list
+    ):
+        """샤드 상태 / 활성 플레이어 / 길드 목록을 한 번의 왕복으로 기록합니다.
+
+        활성 플레이어는 상태가 바뀐 길드의 해시만 다시 쓴다 (active_player_keys 참고).
+        """
         if not self.available:
-            LOGGER.debug("Redis not available, skipping shard status update")
+            LOGGER.debug("Redis not available, skipping shard heartbeat")
             return
 
-        client = self.get_client()
-        if client:
-            try:
-                key = f"{self.shard_stats_key_prefix}{shard_id}"
-                client.set(key, json.dumps(data), ex=self.shard_status_ttl)
-            except redis.exceptions.RedisError as e:
-                LOGGER.error(f"Failed to update shard status in Redis: {e}")
-            except Exception as e:
-                LOGGER.error(f"Unexpected error updating shard status: {e}")
+        client = self.get_async_client()
+        tracker = self.active_player_keys
+        index_key = f"{self.active_players_index_prefix}{shard_id}"
+        writes, refresh, removed = tracker.plan(active_players, time.time())
+        try:
+            started = time.perf_counter()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(
+                    f"{self.shard_stats_key_prefix}{shard_id}",
+                    self.encode(shard_data),
+                    ex=self.shard_status_ttl,
+                )
+                pipe.set(
+                    f"{self.bot_guilds_key_prefix}{shard_id}",
+                    json.dumps(guild_ids),
+                    ex=self.active_player_ttl,
+                )
+                for guild_id, mapping in writes:
+                    key = f"{self.active_player_key_prefix}{guild_id}"
+                    mapping["state"] = self.encode(mapping["state"])
+                    mapping["v"] = player_state_stream.version(guild_id)
+                    mapping["shard_id"] = shard_id
+                    pipe.hset(key, mapping=mapping)
+                    pipe.expire(key, self.active_player_ttl)
+                # 응답 위치: 위의 SET 2개 + 쓰기마다 2개 뒤부터 TTL 갱신 결과
+                for guild_id in refresh:
+                    pipe.expire(
+                        f"{self.active_player_key_prefix}{guild_id}",
+                        self.active_player_ttl,
+                    )
+                if removed:
+                    pipe.delete(
+                        *(f"{self.active_player_key_prefix}{g}" for g in removed)
+                    )
+                    pipe.srem(index_key, *removed)
+                if writes:
+                    pipe.sadd(index_key, *(guild_id for guild_id, _ in writes))
+                pipe.expire(index_key, self.active_player_ttl)
+                if ACTIVE_PLAYERS_BLOB:
+                    # 이전 대시보드 호환용 샤드 전체 JSON
+                    pipe.set(
+                        f"{self.active_players_key_prefix}{shard_id}",
+                        self.encode(active_players),
+                        ex=self.active_player_ttl,
+                    )
+                replies = await pipe.execute()
 
-    def get_all_shard_statuses(self) -> dict:
-        """모든 샤드의 상태 정보를 가져옵니다."""
-        if not self.available:
-            LOGGER.debug("Redis not available, returning empty shard statuses")
-            return {}
+            # Redis 재시작 등으로 키가 사라졌으면 다음 하트비트에 다시 쓴다
+            refreshed = replies[2 + len(writes) * 2 :][: len(refresh)]
+            tracker.forget(
+                [guild_id for guild_id, ok in zip(refresh, refreshed) if not ok]
+            )
 
-        client = self.get_client()
-        if client:
-            try:
-                shard_keys = []
-                cursor = "0"
-                while cursor != 0:
-                    cursor, keys = client.scan(
-                        cursor=cursor,
-                        match=f"{self.shard_stats_key_prefix}*",
-                        count=100,
-                    )
-                    shard_keys.extend(keys)
-
-                if not shard_keys:
-                    return {}
-
-                raw_data = client.mget(shard_keys)
-                statuses = {}
-                for i, key in enumerate(shard_keys):
-                    shard_id_str = key.split(":")[-1]
-                    if raw_data[i]:
-                        statuses[int(shard_id_str)] = json.loads(raw_data[i])
-                return statuses
-            except redis.exceptions.RedisError as e:
-                LOGGER.error(f"Failed to get all shard statuses from Redis: {e}")
-                return {}
-            except (ValueError, IndexError) as e:
-                LOGGER.error(f"Error parsing shard status from Redis: {e}")
-                return {}
-            except Exception as e:
-                LOGGER.error(f"Unexpected error getting shard statuses: {e}")
-                return {}
-        return {}
+            self.heartbeats += 1
+            self.last_heartbeat_ms = round((time.perf_counter() - started) * 1000, 2)
+            LOGGER.debug(
+                f"Shard {shard_id} active players: {len(writes)} written, "
+                f"{len(refresh)} refreshed, {len(removed)} removed"
+            )
+        except redis.exceptions.RedisError as e:
+            self.errors += 1
+            tracker.heartbeat_failed(removed)
+            LOGGER.error(f"Failed to publish shard heartbeat to Redis: {e}")
+        except Exception as e:
+            self.errors += 1
+            tracker.heartbeat_failed(removed)
+            LOGGER.error(f"Unexpected error publishing shard heartbeat: {e}")
 
-    def update_active_players(self, shard_id: int, active_players_data: list):
-        """활성 플레이어 정보를 Redis에 업데이트합니다."""
+    async def get_active_player(self, guild_id) -> dict:
+        """길드 하나의 활성 플레이어 상태 (position은 현재 시각 기준으로 보정). 없으면 None."""
         if not self.available:
-            LOGGER.debug("Redis not available, skipping active players update")
-            return
+            return None
 
-        client = self.get_client()
-        if client:
-            try:
-                key = f"{self.active_players_key_prefix}{shard_id}"
-                client.set(
-                    key, json.dumps(active_players_data), ex=self.active_player_ttl
-                )
-                LOGGER.debug(
-                    f"Updated {len(active_players_data)} active players for shard {shard_id}"
-                )
-            except redis.exceptions.RedisError as e:
-                LOGGER.error(f"Failed to update active players in Redis: {e}")
-            except Exception as e:
-                LOGGER.error(f"Unexpected error updating active players: {e}")
+        client = self.get_binary_client()
+        try:
+            data = await client.hgetall(f"{self.active_player_key_prefix}{guild_id}")
+            if not data:
+                return None
+            player = decode(data[b"state"])
+            if player.get("current_track"):
+                position = int(data.get(b"position", 0))
+                if player.get("is_playing") and not player.get("is_paused"):
+                    position += int(time.time() * 1000) - int(data[b"position_at"])
+                player["current_track"]["position"] = position
+            player["v"] = int(data.get(b"v", 0))
+            return player
+        except Exception as e:
+            LOGGER.error(f"Failed to get active player from Redis: {e}")
+            return None
 
-    def update_bot_guilds(self, shard_id: int, guild_ids: list):
-        """봇이 속한 길드 ID 목록을 Redis에 저장합니다."""
+    async def get_active_guild_ids(self, shard_id: int) -> set:
+        """샤드의 활성 플레이어 길드 ID 목록"""
         if not self.available:
-            return
+            return set()
 
-        client = self.get_client()
-        if client:
-            try:
-                key = f"{self.bot_guilds_key_prefix}{shard_id}"
-                client.set(key, json.dumps(guild_ids), ex=self.active_player_ttl)
-            except Exception as e:
-                LOGGER.error(f"Failed to update bot guilds in Redis: {e}")
+        client = self.get_async_client()
+        try:
+            return await client.smembers(
+                f"{self.active_players_index_prefix}{shard_id}"
+            )
+        except Exception as e:
+            LOGGER.error(f"Failed to get active guild ids from Redis: {e}")
+            return set()
 
-    def save_playback_state(self, shard_id: int, playback_states: list):
-        """점검 전 재생 상태를 Redis에 저장합니다."""
+    async def update_shard_status(self, shard_id: int, data: dict):
+        """특정 샤드의 상태 정보를 업데이트하고 TTL을 설정합니다."""
+        await self._set(
+            f"{self.shard_stats_key_prefix}{shard_id}",
+            self.encode(data),
+            self.shard_status_ttl,
+        )
+
+    async def update_bot_guilds(self, shard_id: int, guild_ids: list):
+        """봇이 속한 길드 ID 목록을 Redis에 저장합니다."""
+        await self._set(
+            f"{self.bot_guilds_key_prefix}{shard_id}",
+            json.dumps(guild_ids),
+            self.active_player_ttl,
+        )
+
+    async def get_all_shard_statuses(self) -> dict:
+        """모든 샤드의 상태 정보를 가져옵니다."""
         if not self.available:
-            LOGGER.debug("Redis not available, skipping playback state save")
-            return
+            LOGGER.debug("Redis not available, returning empty shard statuses")
+            return {}
 
-        client = self.get_client()
-        if client:
-            try:
-                key = f"{self.playback_state_key_prefix}{shard_id}"
-                client.set(key, json.dumps(playback_states), ex=self.playback_state_ttl)
-                LOGGER.info(
-                    f"Saved playback state for {len(playback_states)} players on shard {shard_id}"
+        client = self.get_binary_client()
+        try:
+            shard_keys = [
+                key
+                async for key in client.scan_iter(
+                    match=f"{self.shard_stats_key_prefix}*", count=100
                 )
-            except redis.exceptions.RedisError as e:
-                LOGGER.error(f"Failed to save playback state in Redis: {e}")
-            except Exception as e:
-                LOGGER.error(f"Unexpected error saving playback state: {e}")
+            ]
+            if not shard_keys:
+                return {}
+            return _parse_shard_statuses(shard_keys, await client.mget(shard_keys))
+        except redis.exceptions.RedisError as e:
+            LOGGER.error(f"Failed to get all shard statuses from Redis: {e}")
+        except (ValueError, IndexError) as e:
+            LOGGER.error(f"Error parsing shard status from Redis: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error getting shard statuses: {e}")
+        return {}
 
-    def get_playback_states(self, shard_id: int) -> list:
+    # --- 재생 상태 (점검 전후) ---
+
+    async def save_playback_state(self, shard_id: int, playback_states: list):
+        """점검 전 재생 상태를 Redis에 저장합니다."""
+        key = f"{self.playback_state_key_prefix}{shard_id}"
+        if await self._set(key, self.encode(playback_states), self.playback_state_ttl):
+            LOGGER.info(
+                f"Saved playback state for {len(playback_states)} players on shard {shard_id}"
+            )
+
+    async def get_playback_states(self, shard_id: int) -> list:
         """점검 후 저장된 재생 상태를 가져옵니다."""
         if not self.available:
             LOGGER.debug("Redis not available, returning empty playback states")
             return []
 
-        client = self.get_client()
-        if client:
-            try:
-                key = f"{self.playback_state_key_prefix}{shard_id}"
-                data = client.get(key)
-                if data:
-                    states = json.loads(data)
-                    LOGGER.info(
-                        f"Retrieved playback state for {len(states)} players on shard {shard_id}"
-                    )
-                    return states
-                return []
-            except redis.exceptions.RedisError as e:
-                LOGGER.error(f"Failed to get playback state from Redis: {e}")
-                return []
-            except (ValueError, json.JSONDecodeError) as e:
-                LOGGER.error(f"Error parsing playback state from Redis: {e}")
-                return []
-            except Exception as e:
-                LOGGER.error(f"Unexpected error getting playback state: {e}")
+        client = self.get_binary_client()
+        try:
+            data = await client.get(f"{self.playback_state_key_prefix}{shard_id}")
+            if not data:
                 return []
+            states = decode(data)
+            LOGGER.info(
+                f"Retrieved playback state for {len(states)} players on shard {shard_id}"
+            )
+            return states
+        except redis.exceptions.RedisError as e:
+            LOGGER.error(f"Failed to get playback state from Redis: {e}")
+        except ValueError as e:
+            LOGGER.error(f"Error parsing playback state from Redis: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error getting playback state: {e}")
         return []
 
-    def clear_playback_state(self, shard_id: int):
+    async def clear_playback_state(self, shard_id: int):
         """복원 완료 후 재생 상태를 삭제합니다."""
         if not self.available:
             return
 
-        client = self.get_client()
-        if client:
-            try:
-                key = f"{self.playback_state_key_prefix}{shard_id}"
-                client.delete(key)
-                LOGGER.debug(f"Cleared playback state for shard {shard_id}")
-            except redis.exceptions.RedisError as e:
-                LOGGER.error(f"Failed to clear playback state in Redis: {e}")
-            except Exception as e:
-                LOGGER.error(f"Unexpected error clearing playback state: {e}")
+        client = self.get_async_client()
+        try:
+            await client.delete(f"{self.playback_state_key_prefix}{shard_id}")
+            LOGGER.debug(f"Cleared playback state for shard {shard_id}")
+        except redis.exceptions.RedisError as e:
+            LOGGER.error(f"Failed to clear playback state in Redis: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error clearing playback state: {e}")
+
+    async def _set(self, key: str, value, ttl: int) -> bool:
+        if not self.available:
+            LOGGER.debug(f"Redis not available, skipping update of {key}")
+            return False
+
+        client = self.get_async_client()
+        try:
+            await client.set(key, value, ex=ttl)
+            return True
+        except redis.exceptions.RedisError as e:
+            self.errors += 1
+            LOGGER.error(f"Failed to update {key} in Redis: {e}")
+        except Exception as e:
+            self.errors += 1
+            LOGGER.error(f"Unexpected error updating {key}: {e}")
+        return False
 
     # --- Uptime 모니터링 (비트맵) ---
 
     UPTIME_CHECK_PREFIX = "uptime:checks:"
     UPTIME_COUNT_PREFIX = "uptime:check_count:"
+    UPTIME_SEEN_PREFIX = "uptime:seen:"
     UPTIME_AGGREGATED_PREFIX = "uptime:aggregated:"
     UPTIME_TTL = 60 * 60 * 48  # 2일
 
-    def record_uptime_check(self, service: str, date_str: str, check_index: int, is_up: bool):
-        """업타임 체크 결과를 Redis 비트맵에 기록합니다."""
-        if not self.available:
-            return
+    def _uptime_keys(self, service: str, date_str: str) -> list:
+        return [
+            f"{self.UPTIME_CHECK_PREFIX}{service}:{date_str}",
+            f"{self.UPTIME_SEEN_PREFIX}{service}:{date_str}",
+            f"{self.UPTIME_COUNT_PREFIX}{service}:{date_str}",
+        ]
+
+    async def record_uptime_checks(
+        self, date_str: str, check_index: int, results: dict
+    ) -> bool:
+        """모든 서비스의 업타임 체크 결과를 스크립트 한 번(한 번의 왕복)으로 기록합니다.
+
+        results: {service: is_up}
+        """
+        if not self.available or not results:
+            return False
 
-        client = self.get_client()
-        if client:
-            try:
-                bitmap_key = f"{self.UPTIME_CHECK_PREFIX}{service}:{date_str}"
-                count_key = f"{self.UPTIME_COUNT_PREFIX}{service}:{date_str}"
-                seen_key = f"uptime:seen:{service}:{date_str}"
-
-                if is_up:
-                    client.setbit(bitmap_key, check_index, 1)
-                else:
-                    client.setbit(bitmap_key, check_index, 0)
-
-                # 해당 check_index가 처음 기록되는 경우에만 카운트 증가
-                # (봇 재시작 등으로 같은 슬롯이 중복 기록되는 것 방지)
-                newly_added = client.sadd(seen_key, check_index)
-                if newly_added:
-                    client.incr(count_key)
-
-                # TTL 설정 (키가 새로 생성된 경우)
-                if client.ttl(bitmap_key) < 0:
-                    client.expire(bitmap_key, self.UPTIME_TTL)
-                if client.ttl(count_key) < 0:
-                    client.expire(count_key, self.UPTIME_TTL)
-                if client.ttl(seen_key) < 0:
-                    client.expire(seen_key, self.UPTIME_TTL)
-            except Exception as e:
-                LOGGER.error(f"Failed to record uptime check: {e}")
+        client = self.get_async_client()
+        try:
+            if self._uptime_script is None:
+                self._uptime_script = client.register_script(UPTIME_RECORD_SCRIPT)
+
+            keys = []
+            args = [check_index, self.UPTIME_TTL]
+            for service, is_up in results.items():
+                keys.extend(self._uptime_keys(service, date_str))
+                args.append(1 if is_up else 0)
+            # EVALSHA, 서버에 스크립트가 없으면 자동으로 EVAL로 재시도
+            await self._uptime_script(keys=keys, args=args)
+            return True
+        except Exception as e:
+            LOGGER.error(f"Failed to record uptime checks: {e}")
+            return False
 
-    def get_uptime_summary(self, service: str, date_str: str) -> dict:
-        """특정 날짜의 업타임 요약을 반환합니다."""
-        if not self.available:
-            return {"up_checks": 0, "total_checks": 0}
+    async def record_uptime_check(
+        self, service: str, date_str: str, check_index: int, is_up: bool
+    ):
+        """업타임 체크 결과를 Redis 비트맵에 기록합니다."""
+        await self.record_uptime_checks(date_str, check_index, {service: is_up})
 
-        client = self.get_client()
-        if client:
-            try:
-                bitmap_key = f"{self.UPTIME_CHECK_PREFIX}{service}:{date_str}"
-                count_key = f"{self.UPTIME_COUNT_PREFIX}{service}:{date_str}"
+    async def get_uptime_summaries(self, services: list, dates: list) -> dict:
+        """여러 날짜 x 서비스의 업타임 요약을 파이프라인 한 번으로 반환합니다.
 
-                up_checks = client.bitcount(bitmap_key)
-                total_checks = client.get(count_key)
-                total_checks = int(total_checks) if total_checks else 0
+        {date_str: {service: {"up_checks", "total_checks"}}}
+        """
+        empty = {
+            date_str: {
+                service: {"up_checks": 0, "total_checks": 0} for service in services
+            }
+            for date_str in dates
+        }
+        if not self.available or not services or not dates:
+            return empty
 
-                return {"up_checks": up_checks, "total_checks": total_checks}
-            except Exception as e:
-                LOGGER.error(f"Failed to get uptime summary: {e}")
-        return {"up_checks": 0, "total_checks": 0}
+        client = self.get_async_client()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for date_str in dates:
+                    for service in services:
+                        pipe.bitcount(f"{self.UPTIME_CHECK_PREFIX}{service}:{date_str}")
+                        pipe.get(f"{self.UPTIME_COUNT_PREFIX}{service}:{date_str}")
+                replies = iter(await pipe.execute())
+            return {
+                date_str: {
+                    service: {
+                        "up_checks": next(replies),
+                        "total_checks": int(next(replies) or 0),
+                    }
+                    for service in services
+                }
+                for date_str in dates
+            }
+        except Exception as e:
+            LOGGER.error(f"Failed to get uptime summaries: {e}")
+        return empty
+
+    async def get_uptime_summary(self, service: str, date_str: str) -> dict:
+        """특정 날짜의 업타임 요약을 반환합니다."""
+        summaries = await self.get_uptime_summaries([service], [date_str])
+        return summaries[date_str][service]
 
-    def is_uptime_aggregated(self, date_str: str) -> bool:
+    async def is_uptime_aggregated(self, date_str: str) -> bool:
         """해당 날짜의 업타임이 이미 집계되었는지 확인합니다."""
         if not self.available:
             return True
 
-        client = self.get_client()
-        if client:
-            try:
-                return bool(client.get(f"{self.UPTIME_AGGREGATED_PREFIX}{date_str}"))
-            except Exception:
-                return True
-        return True
+        client = self.get_async_client()
+        try:
+            return bool(await client.get(f"{self.UPTIME_AGGREGATED_PREFIX}{date_str}"))
+        except Exception:
+            return True
 
-    def mark_uptime_aggregated(self, date_str: str):
+    async def mark_uptime_aggregated(self, date_str: str):
         """해당 날짜의 업타임 집계 완료를 표시합니다."""
         if not self.available:
             return
 
-        client = self.get_client()
-        if client:
-            try:
-                client.set(
-                    f"{self.UPTIME_AGGREGATED_PREFIX}{date_str}", "1",
-                    ex=60 * 60 * 72  # 3일
-                )
-            except Exception as e:
-                LOGGER.error(f"Failed to mark uptime aggregated: {e}")
+        client = self.get_async_client()
+        try:
+            await client.set(
+                f"{self.UPTIME_AGGREGATED_PREFIX}{date_str}",
+                "1",
+                ex=60 * 60 * 72,  # 3일
+            )
+        except Exception as e:
+            LOGGER.error(f"Failed to mark uptime aggregated: {e}")
 
     # --- Async Pub/Sub (웹 대시보드 양방향 통신) ---
 
-    def get_async_client(self):
-        """비동기 Redis 클라이언트를 반환합니다."""
-        if not self.available:
-            return None
-        if not self._async_client:
-            self._async_client = aioredis.Redis(
-                host=self.redis_host,
-                port=self.redis_port,
-                db=self.redis_db,
-                decode_responses=True,
-            )
-        return self._async_client
-
-    async def publish(self, channel: str, message: str):
+    async def publish(self, channel: str, message):
         """Redis 채널에 메시지를 발행합니다."""
         client = self.get_async_client()
         if client:
             try:
-                await client.publish(channel, message)
+                with REDIS_PUBLISH_SECONDS.time(channel=channel_kind(channel)):
+                    await client.publish(channel, message)
             except Exception as e:
                 LOGGER.error(f"Failed to publish to {channel}: {e}")
 
     async def publish_player_update(self, guild_id: int, event: str, state: dict):
-        """플레이어 상태 변경을 웹 대시보드에 발행합니다."""
-        message = json.dumps(
-            {
-                "guild_id": str(guild_id),
-                "event": event,
-                "state": state,
-            }
-        )
-        await self.publish("bot:player_update", message)
+        """플레이어 상태 변경을 웹 대시보드에 발행합니다 (이전 발행분과의 델타).
+
+        발행한 상태 버전을 반환한다.
+        """
+        update = player_state_stream.encode(guild_id, event, state)
+        await self.publish("bot:player_update", self.encode(update))
+        return update["v"]
+
+    async def publish_response(self, request_id: str, result: dict):
+        """웹 명령 응답을 bot:response:{request_id} 로 발행합니다."""
+        if request_id:
+            await self.publish(f"bot:response:{request_id}", self.encode(result))
 
     def create_async_pubsub(self):
         """비동기 Pub/Sub 인스턴스를 생성합니다."""
@@ -343,6 +516,29 @@ class RedisManager:
             return client.pubsub()
         return None
 
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        pool = self._pool
+        return {
+            "pool_in_use": len(pool._in_use_connections) if pool else 0,
+            "pool_max": REDIS_MAX_CONNECTIONS,
+            "heartbeats": self.heartbeats,
+            "last_heartbeat_ms": self.last_heartbeat_ms,
+            "errors": self.errors,
+            "codec": self.codec.name,
+            "active_players": self.active_player_keys.metrics(),
+        }
+
+
+def _parse_shard_statuses(shard_keys: list, raw_data: list) -> dict:
+    statuses = {}
+    for key, raw in zip(shard_keys, raw_data):
+        if raw:
+            if isinstance(key, bytes):
+                key = key.decode()
+            statuses[int(key.split(":")[-1])] = decode(raw)
+    return statuses
+
 
 # 전역 Redis 매니저 인스턴스 생성
 redis_manager = RedisManager()
@@ -0,0 +1,89 @@
+"""길드 설정 인메모리 저장소
+
+샤드 시작 시 담당 길드의 guild_settings 행을 한 번에 불러와 메모리에서 서빙한다.
+설정 변경은 Redis(bot:settings_invalidate)로 전파되어 모든 샤드가 폴링 없이 동기화된다.
+"""
+
+SETTINGS_INVALIDATE_CHANNEL = "bot:settings_invalidate"
+
+
+def default_guild_settings(guild_id):
+    """설정 행이 없거나 조회에 실패했을 때 사용하는 기본 길드 설정"""
+    return {
+        "guild_id": guild_id,
+        "volume": 20,
+        "loop_mode": 0,
+        "shuffle": False,
+        "autodel": True,
+        "instant_disconnect": True,
+    }
+
+
+class GuildSettingsStore:
+    """guild_id -> 설정 행. 로드된 길드에 행이 없으면 기본값을 의미한다."""
+
+    def __init__(self):
+        self._settings: dict[int, dict] = {}
+        self._loaded: set[int] = set()
+        self.preloaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._loaded)
+
+    def get(self, guild_id):
+        """메모리에 있는 설정 반환. 아직 로드되지 않은 길드면 None."""
+        guild_id = int(guild_id)
+        if guild_id not in self._loaded:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        settings = self._settings.get(guild_id)
+        if settings is None:
+            settings = default_guild_settings(guild_id)
+            self._settings[guild_id] = settings
+        return settings
+
+    def set(self, guild_id, settings):
+        """설정 행 저장 (None이면 기본값 사용)"""
+        guild_id = int(guild_id)
+        self._loaded.add(guild_id)
+        if settings:
+            self._settings[guild_id] = settings
+        else:
+            self._settings.pop(guild_id, None)
+
+    def update(self, guild_id, **fields):
+        """로드된 설정에 변경 필드를 반영"""
+        current = self.get(guild_id)
+        if current is None:
+            return
+        merged = dict(current)
+        merged.update(fields)
+        self._settings[int(guild_id)] = merged
+
+    def load(self, guild_ids, rows):
+        """일괄 로드 결과 반영. guild_ids 중 행이 없는 길드는 기본값으로 간주."""
+        for guild_id in guild_ids:
+            self._loaded.add(int(guild_id))
+        for row in rows:
+            self._settings[int(row["guild_id"])] = row
+
+    def invalidate(self, guild_id):
+        """설정 제거 (다음 조회 시 다시 불러옴)"""
+        guild_id = int(guild_id)
+        self._loaded.discard(guild_id)
+        self._settings.pop(guild_id, None)
+
+    def metrics(self):
+        return {
+            "guilds": len(self._loaded),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# 전역 설정 저장소 인스턴스
+settings_store = GuildSettingsStore()
@@ -0,0 +1,261 @@
+"""재생 통계 write-behind 파이프라인
+
+on_track_start 경로에서는 큐에 넣기만 하고, 백그라운드 플러셔 태스크가
+크기/시간 기준으로 모아서 Supabase에 일괄 삽입한다.
+삽입에 실패한 배치는 로컬 스풀 파일(JSONL, append-only)에 기록해 두었다가
+백엔드가 복구되거나 샤드가 다시 시작될 때 재전송하므로 행이 유실되지 않는다.
+"""
+
+import os
+import json
+import time
+import asyncio
+
+from tapi import LOGGER
+
+_CLOSE = object()  # close()가 플러셔를 깨우는 표식
+
+
+class StatisticsPipeline:
+    """통계 행 배치 플러셔 + 디스크 스풀"""
+
+    def __init__(
+        self,
+        insert,
+        spool_path: str,
+        batch_size: int = 50,
+        flush_interval: float = 30,
+        max_queue: int = 10000,
+    ):
+        self.insert = insert  # async (rows) -> bool
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task = None
+        self._closing = False
+        self._spool_lock = asyncio.Lock()
+        # 재전송했지만 스풀 파일에서 지우지 못한 앞부분 행 수 (다음 재전송 때 건너뜀)
+        self._spool_sent = 0
+
+        # 지표
+        self.spool_depth = self._count_spool()
+        self.submitted = 0
+        self.flushed = 0
+        self.failed_batches = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    # ===== 생산자 =====
+
+    def submit(self, row: dict):
+        """통계 행 추가 (논블로킹). 큐가 가득 차면 스풀로 보낸다."""
+        self.submitted += 1
+        try:
+            self.queue.put_nowait(row)
+        except asyncio.QueueFull:
+            LOGGER.warning("Statistics queue full, spooling row to disk")
+            asyncio.get_running_loop().create_task(self._spool([row]))
+
+    # ===== 플러셔 =====
+
+    def start(self):
+        """백그라운드 플러셔 시작 (이미 실행 중이면 무시)"""
+        if self._task and not self._task.done():
+            return
+        self._closing = False
+        self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        # 이전 실행/장애 때 남은 스풀부터 재전송
+        await self.drain_spool()
+
+        while True:
+            batch = []
+            try:
+                await self._next_batch(batch)
+                if batch:
+                    await self._flush(batch)
+                elif self.spool_depth and not self._closing:
+                    await self.drain_spool()
+            except asyncio.CancelledError:
+                # 꺼낸 채 삽입하지 못한 행은 스풀로 (close()가 아닌 외부 취소 대비)
+                if batch:
+                    await asyncio.shield(self._spool(batch))
+                raise
+            except Exception as e:
+                LOGGER.error(f"Statistics flusher error: {e}")
+                if batch:
+                    await self._spool(batch)
+                await asyncio.sleep(5)
+            if self._closing:
+                return
+
+    async def _next_batch(self, batch: list):
+        """batch_size개, flush_interval, close() 중 먼저 오는 때까지 batch에 모은다."""
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._closing:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if row is _CLOSE:
+                break
+            batch.append(row)
+
+    async def _flush(self, rows: list) -> bool:
+        """배치 삽입. 실패하면 스풀에 기록. 성공하면 밀린 스풀도 재전송."""
+        started = time.perf_counter()
+        ok = await self.insert(rows)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.last_batch_size = len(rows)
+        self.last_flush_ms = round(elapsed_ms, 2)
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+
+        if not ok:
+            self.failed_batches += 1
+            await self._spool(rows)
+            return False
+
+        self.flushed += len(rows)
+        LOGGER.debug(f"Flushed {len(rows)} statistics in {elapsed_ms:.1f}ms")
+        if self.spool_depth:
+            await self.drain_spool()
+        return True
+
+    async def close(self):
+        """플러셔 중지 후 큐에 남은 행을 모두 플러시 (실패분은 스풀)"""
+        self._closing = True
+        if self._task:
+            # 취소하지 않고 깨워서 들고 있던 배치까지 플러시하고 끝나게 한다
+            try:
+                self.queue.put_nowait(_CLOSE)
+            except asyncio.QueueFull:
+                pass  # 큐가 차 있으면 대기 없이 배치가 차므로 깨울 필요 없음
+            try:
+                await self._task
+            except Exception as e:
+                LOGGER.error(f"Statistics flusher error on close: {e}")
+            self._task = None
+
+        rows = []
+        while not self.queue.empty():
+            row = self.queue.get_nowait()
+            if row is not _CLOSE:
+                rows.append(row)
+
+        for i in range(0, len(rows), self.batch_size):
+            await self._flush(rows[i : i + self.batch_size])
+
+    # ===== 스풀 =====
+
+    def _count_spool(self) -> int:
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                return sum(1 for line in f if line.strip())
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            LOGGER.error(f"Failed to read statistics spool: {e}")
+            return 0
+
+    def _append_lines(self, rows: list):
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        with open(self.spool_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_lines(self) -> list:
+        rows = []
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # 비정상 종료로 잘린 마지막 줄 등은 건너뜀
+                        LOGGER.warning("Skipping corrupt statistics spool line")
+        except FileNotFoundError:
+            pass
+        return rows
+
+    def _rewrite(self, rows: list):
+        """남은 행으로 스풀 파일 교체 (비었으면 삭제)"""
+        if not rows:
+            try:
+                os.remove(self.spool_path)
+            except FileNotFoundError:
+                pass
+            return
+
+        tmp_path = f"{self.spool_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+
+    async def _spool(self, rows: list):
+        async with self._spool_lock:
+            try:
+                await asyncio.to_thread(self._append_lines, rows)
+                self.spool_depth += len(rows)
+                LOGGER.warning(
+                    f"Spooled {len(rows)} statistics to disk (depth {self.spool_depth})"
+                )
+            except OSError as e:
+                LOGGER.error(f"Failed to spool statistics, {len(rows)} rows lost: {e}")
+
+    async def drain_spool(self):
+        """스풀에 쌓인 행을 배치 단위로 재전송. 실패하면 남은 행은 그대로 둔다."""
+        async with self._spool_lock:
+            if not self.spool_depth:
+                return
+
+            rows = await asyncio.to_thread(self._read_lines)
+            rows = rows[self._spool_sent :]
+            sent = 0
+            while sent < len(rows):
+                chunk = rows[sent : sent + self.batch_size]
+                if not await self.insert(chunk):
+                    break
+                sent += len(chunk)
+
+            self.flushed += sent
+            self.spool_depth = len(rows) - sent
+            try:
+                await asyncio.to_thread(self._rewrite, rows[sent:])
+                self._spool_sent = 0
+            except OSError as e:
+                # 보낸 행이 파일에 남아 있으므로 다음 재전송 때 다시 보내지 않게 위치를 기억
+                self._spool_sent += sent
+                LOGGER.error(f"Failed to rewrite statistics spool: {e}")
+                return
+            if sent:
+                LOGGER.info(
+                    f"Replayed {sent} spooled statistics ({self.spool_depth} remaining)"
+                )
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "spool_depth": self.spool_depth,
+            "submitted": self.submitted,
+            "flushed": self.flushed,
+            "failed_batches": self.failed_batches,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+        }
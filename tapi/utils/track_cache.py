@@ -0,0 +1,257 @@
+"""Lavalink loadtracks 결과 캐시
+
+같은 검색어/URL이 여러 길드와 샤드에서 반복 조회되므로
+인프로세스 LRU(1차) + Redis(2차, 샤드 공유)에 결과를 보관한다.
+- 소스별 TTL (검색/믹스/재생목록은 짧게, 단일 곡 URL은 길게)
+- 결과가 없는 조회도 짧게 캐시 (네거티브 캐싱)
+- 동시에 들어온 같은 조회는 하나의 요청으로 합침
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+
+from lavalink.server import LoadResult, LoadType
+
+from tapi import LOGGER
+from tapi.utils.cache import TTLCache
+from tapi.utils.metrics import LAVALINK_GET_TRACKS_SECONDS, search_source
+from tapi.utils.node_pool import node_pool
+from tapi.utils.redis_manager import redis_manager
+
+TRACK_CACHE_SIZE = 5000  # 인프로세스 캐시 최대 항목 수
+TRACK_CACHE_REDIS = os.getenv("TAPI_TRACK_CACHE_REDIS", "1") == "1"
+TRACK_CACHE_KEY_PREFIX = "track_cache:"
+REDIS_TIMEOUT = 0.25  # Redis 조회가 느리면 그냥 Lavalink로 (초)
+
+# 소스별 TTL (초)
+SOURCE_TTLS = {
+    "search": 60 * 30,
+    "mix": 60 * 10,  # 유튜브 믹스(list=RD)는 매번 구성이 바뀜
+    "playlist": 60 * 30,
+    "youtube": 60 * 60 * 6,
+    "spotify": 60 * 60 * 6,
+    "soundcloud": 60 * 60 * 6,
+    "other": 60 * 60,
+}
+NEGATIVE_TTL = 60  # 결과 없음 캐시 TTL (초)
+
+SEARCH_PREFIXES = ("ytsearch:", "ytmsearch:", "scsearch:", "spsearch:", "amsearch:")
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화. 검색어는 대소문자/공백 차이를 무시한다."""
+    query = query.strip()
+    lowered = query.lower()
+    if lowered.startswith(SEARCH_PREFIXES):
+        return " ".join(lowered.split())
+    return query
+
+
+def query_source(query: str) -> str:
+    """쿼리 -> SOURCE_TTLS 키"""
+    lowered = query.lower()
+    if lowered.startswith(SEARCH_PREFIXES):
+        return "search"
+    if "list=rd" in lowered:
+        return "mix"
+    if "list=" in lowered or "/playlist" in lowered or "/album" in lowered:
+        return "playlist"
+    if "youtube.com" in lowered or "youtu.be" in lowered:
+        return "youtube"
+    if "spotify" in lowered:
+        return "spotify"
+    if "soundcloud" in lowered:
+        return "soundcloud"
+    return "other"
+
+
+def _serialize(result: LoadResult):
+    """LoadResult -> Lavalink 응답 형태의 dict (에러 결과는 None)"""
+    load_type = result.load_type
+    if load_type == LoadType.TRACK:
+        data = result.tracks[0].raw
+    elif load_type == LoadType.PLAYLIST:
+        data = {
+            "info": {
+                "name": result.playlist_info.name,
+                "selectedTrack": result.playlist_info.selected_track,
+            },
+            "pluginInfo": result.plugin_info or {},
+            "tracks": [track.raw for track in result.tracks],
+        }
+    elif load_type == LoadType.SEARCH:
+        data = [track.raw for track in result.tracks]
+    elif load_type == LoadType.EMPTY:
+        data = {}
+    else:
+        return None
+    return {"loadType": load_type.value, "data": data}
+
+
+class TrackCache:
+    """loadtracks 결과 캐시 (LRU + Redis, 요청 합치기)"""
+
+    def __init__(self, maxsize: int = TRACK_CACHE_SIZE):
+        # 트랙 객체는 큐마다 requester 등이 바뀌므로 dict로 보관하고 조회 때마다 새로 만든다
+        self._local = TTLCache(maxsize=maxsize, ttl=SOURCE_TTLS["other"])
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._background: set = set()
+        self._miss_latency: dict[str, float] = {}  # 소스별 평균 loadtracks 지연 (ms)
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_ms = 0.0
+
+    async def get_tracks(self, node, query: str, fresh: bool = False) -> LoadResult:
+        """node.get_tracks(query)와 동일. fresh면 캐시를 건너뛰고 다시 조회한다."""
+        key = normalize_query(query)
+        source = query_source(key)
+
+        if not fresh:
+            data = self._local.get(key)
+            if data is not None:
+                self.local_hits += 1
+                return self._hit(data, source)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                data, result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # 먼저 요청한 쪽이 취소된 경우 직접 다시 조회
+                return await self.get_tracks(node, query, fresh)
+            return LoadResult.from_dict(data) if data is not None else result
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = None if fresh else await self._get_redis(key)
+            if data is not None:
+                self.redis_hits += 1
+                self._local.set(key, data, ttl=self._ttl(data, source))
+                result = self._hit(data, source)
+            else:
+                result = await self._fetch(node, query, key, source)
+                data = _serialize(result)
+            future.set_result((data, result))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 기다리는 쪽이 없어도 경고가 남지 않도록
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        return result
+
+    async def _fetch(self, node, query, key, source) -> LoadResult:
+        """Lavalink에 실제 조회 후 캐시에 저장"""
+        self.misses += 1
+        started = time.perf_counter()
+        result = await node_pool.get_tracks(node, query)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        LAVALINK_GET_TRACKS_SECONDS.observe(
+            elapsed_ms / 1000, source=search_source(query)
+        )
+
+        # 소스별 평균 지연 (지수 이동 평균) - 캐시 적중 시 절약한 시간 추정용
+        previous = self._miss_latency.get(source)
+        self._miss_latency[source] = (
+            elapsed_ms if previous is None else previous * 0.8 + elapsed_ms * 0.2
+        )
+
+        data = _serialize(result)
+        if data is not None:
+            ttl = self._ttl(data, source)
+            self._local.set(key, data, ttl=ttl)
+            self._set_redis(key, data, ttl)
+        return result
+
+    def _hit(self, data, source) -> LoadResult:
+        if not data["data"]:
+            self.negative_hits += 1
+        self.saved_ms += self._miss_latency.get(source, 0.0)
+        return LoadResult.from_dict(data)
+
+    @staticmethod
+    def _ttl(data, source) -> int:
+        return SOURCE_TTLS[source] if data["data"] else NEGATIVE_TTL
+
+    # ===== Redis 2차 캐시 =====
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return TRACK_CACHE_KEY_PREFIX + hashlib.sha1(key.encode()).hexdigest()
+
+    async def _get_redis(self, key):
+        if not TRACK_CACHE_REDIS:
+            return None
+        client = redis_manager.get_async_client()
+        if not client:
+            return None
+        try:
+            raw = await asyncio.wait_for(
+                client.get(self._redis_key(key)), REDIS_TIMEOUT
+            )
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            LOGGER.debug(f"Track cache Redis lookup failed: {e}")
+            return None
+
+    def _set_redis(self, key, data, ttl):
+        """Redis 저장은 응답을 기다리지 않는다."""
+        if not TRACK_CACHE_REDIS:
+            return
+        client = redis_manager.get_async_client()
+        if not client:
+            return
+
+        async def store():
+            try:
+                await asyncio.wait_for(
+                    client.set(self._redis_key(key), json.dumps(data), ex=ttl),
+                    REDIS_TIMEOUT * 4,
+                )
+            except Exception as e:
+                LOGGER.debug(f"Track cache Redis store failed: {e}")
+
+        task = asyncio.get_running_loop().create_task(store())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def hit_ratio(self) -> float:
+        hits = self.local_hits + self.redis_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def metrics(self):
+        """모니터링용 지표 반환"""
+        return {
+            "size": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hit_ratio(), 4),
+            "saved_ms": round(self.saved_ms, 1),
+            "avg_miss_ms": {
+                source: round(latency, 1)
+                for source, latency in self._miss_latency.items()
+            },
+        }
+
+
+# 전역 트랙 캐시 인스턴스
+track_cache = TrackCache()
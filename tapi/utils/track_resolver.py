@@ -0,0 +1,123 @@
+"""저장된 트랙 목록(플레이리스트/재생 상태 복원)을 Lavalink 트랙으로 동시에 해석"""
+
+import os
+import asyncio
+
+from lavalink import decode_track
+
+from tapi import LOGGER
+from tapi.utils.track_cache import track_cache
+
+# 동시에 보내는 Lavalink loadtracks 요청 수
+RESOLVE_CONCURRENCY = int(os.getenv("TAPI_RESOLVE_CONCURRENCY", "5"))
+
+
+def decode_saved_track(track_data: dict):
+    """저장된 encoded 값을 로컬에서 디코드 (Lavalink 요청 없음). 실패 시 None."""
+    encoded = track_data.get("encoded")
+    if not encoded:
+        return None
+    try:
+        return decode_track(encoded)
+    except Exception:
+        return None
+
+
+async def decode_in_batch(node, tracks_data: list) -> list:
+    """로컬 디코드에 실패한 encoded 값들을 decodetracks 한 번으로 디코드.
+
+    track_data 순서대로 트랙 또는 None 목록 반환.
+    """
+    if not tracks_data:
+        return []
+    try:
+        tracks = await node.decode_tracks([d["encoded"] for d in tracks_data])
+    except Exception as e:
+        LOGGER.warning(f"Batch decodetracks failed: {e}")
+        return [None] * len(tracks_data)
+
+    if len(tracks) != len(tracks_data):
+        return [None] * len(tracks_data)
+    return tracks
+
+
+async def resolve_track(node, track_data: dict, search_fallback: bool = True):
+    """저장된 트랙 정보 -> Lavalink 트랙. 실패 시 None.
+
+    uri로 찾지 못하면 search_fallback일 때 제목/아티스트로 유튜브 검색한다.
+    """
+    uri = track_data.get("uri")
+    if not uri:
+        return None
+
+    results = await track_cache.get_tracks(node, uri)
+    if results and results.tracks:
+        return results.tracks[0]
+
+    if not search_fallback:
+        return None
+
+    search_query = (
+        f"ytsearch:{track_data.get('title', '')} {track_data.get('author', '')}"
+    )
+    results = await track_cache.get_tracks(node, search_query)
+    if results and results.tracks:
+        return results.tracks[0]
+    return None
+
+
+async def resolve_in_order(
+    node, tracks_data, search_fallback: bool = True, concurrency: int = None
+):
+    """트랙 목록을 최대 concurrency개씩 동시에 해석하고 원래 순서대로 yield.
+
+    저장된 encoded 값이 있으면 먼저 디코드하고(로컬 -> decodetracks 일괄),
+    디코드하지 못한 트랙만 uri로 다시 검색한다.
+    (track_data, track 또는 None) 을 앞에서부터 하나씩 내보내므로
+    첫 곡이 해석되는 즉시 재생을 시작하고 나머지는 완료되는 대로 큐에 넣을 수 있다.
+    중간에 순회를 멈추면 남은 요청은 취소된다.
+    """
+    tracks_data = list(tracks_data)
+    decoded = [decode_saved_track(track_data) for track_data in tracks_data]
+
+    # 로컬 디코드 실패분 (플러그인 전용 포맷 등)은 서버에 한 번에 디코드 요청
+    pending = [
+        i
+        for i, track_data in enumerate(tracks_data)
+        if decoded[i] is None and track_data.get("encoded")
+    ]
+    if pending:
+        batch = await decode_in_batch(node, [tracks_data[i] for i in pending])
+        for i, track in zip(pending, batch):
+            decoded[i] = track
+
+    searched = sum(1 for track in decoded if track is None)
+    if tracks_data:
+        LOGGER.debug(
+            f"Resolving {len(tracks_data)} tracks: "
+            f"{len(tracks_data) - searched} decoded, {searched} via loadtracks"
+        )
+
+    semaphore = asyncio.Semaphore(concurrency or RESOLVE_CONCURRENCY)
+
+    async def resolve(track_data):
+        async with semaphore:
+            try:
+                return await resolve_track(node, track_data, search_fallback)
+            except Exception as e:
+                LOGGER.warning(f"Error resolving track {track_data.get('uri')}: {e}")
+                return None
+
+    async def ready(track):
+        return track
+
+    tasks = [
+        asyncio.ensure_future(ready(track) if track else resolve(track_data))
+        for track_data, track in zip(tracks_data, decoded)
+    ]
+    try:
+        for track_data, task in zip(tracks_data, tasks):
+            yield track_data, await task
+    finally:
+        for task in tasks:
+            task.cancel()
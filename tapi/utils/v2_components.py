@@ -12,8 +12,9 @@ from tapi import (
     INFO_COLOR,
     MUSIC_COLOR,
 )
-from tapi.utils.language import get_lan
+from tapi.utils.language import get_lan, format_lan
 from tapi.utils.embed import get_track_thumbnail, format_text_with_limit
+from tapi.utils.panel_scheduler import panel_scheduler
 
 
 # ---- Shared Component Factories ----
@@ -194,10 +195,9 @@ async def send_temp_v2(interaction, layout_view, delete_after=3, refresh_control
 
         # 설정 확인 후 삭제 여부 결정
         if interaction.guild:
-            from tapi.utils.database import Database
+            from tapi.utils.database import AsyncDatabase
 
-            db = Database()
-            if db.get_autodel(interaction.guild.id):
+            if await AsyncDatabase().get_autodel(interaction.guild.id):
                 await message.delete(delay=delete_after)
         else:
             await message.delete(delay=delete_after)
@@ -214,9 +214,10 @@ async def send_temp_status(
     interaction, key, delete_after=3, style="default", **format_kwargs
 ):
     """언어 키로 V2 상태 메시지 전송"""
-    text = get_lan(interaction, key)
     if format_kwargs:
-        text = text.format(**format_kwargs)
+        text = format_lan(interaction, key, **format_kwargs)
+    else:
+        text = get_lan(interaction, key)
     layout = StatusLayout(title_text=text, style=style)
     return await send_temp_v2(interaction, layout, delete_after)
 
@@ -225,36 +226,11 @@ async def send_temp_status(
 
 
 async def _refresh_now_playing(interaction):
-    """Now Playing 패널을 현재 플레이어 상태로 갱신"""
+    """Now Playing 패널을 현재 플레이어 상태로 갱신 (스케줄러가 합쳐서 편집)"""
     try:
-        cog = interaction.client.get_cog("Music")
-        if not cog or not hasattr(cog, "last_music_messages"):
-            return
-
-        guild_id = interaction.guild.id
-        if guild_id not in cog.last_music_messages:
-            return
-
-        player = interaction.client.lavalink.player_manager.get(guild_id)
-        if not player or not player.current:
-            return
-
-        old_message = cog.last_music_messages[guild_id]
-
-        from tapi.modules.music_views import MusicControlLayout
-
-        control_layout = MusicControlLayout(cog, guild_id)
-
-        requester_id = (
-            player.current.requester if player.current else interaction.user.id
+        panel_scheduler.request(
+            interaction.client, interaction.guild.id, interaction.user.id
         )
-        user_locale = cog.user_locales.get(requester_id, "en")
-        fake_interaction = FakeInteraction(requester_id, guild_id, user_locale)
-        control_layout.build_layout(fake_interaction, player)
-
-        await old_message.edit(view=control_layout)
-    except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-        pass
     except Exception as e:
         LOGGER.debug(f"Error refreshing now playing panel: {e}")
 
@@ -273,6 +249,7 @@ async def sync_discord_message(bot, guild_id: int, command: str, user_id: int =
 
         # stop: 메시지 삭제 + 참조 제거
         if command == "stop":
+            panel_scheduler.cancel(guild_id)
             if guild_id in cog.last_music_messages:
                 try:
                     await cog.last_music_messages[guild_id].delete()
@@ -286,34 +263,8 @@ async def sync_discord_message(bot, guild_id: int, command: str, user_id: int =
         if command == "skip":
             return
 
-        # 메시지가 없으면 할 일 없음
-        if guild_id not in cog.last_music_messages:
-            return
-
-        player = bot.lavalink.player_manager.get(guild_id)
-        if not player or not player.current:
-            return
-
-        # _refresh_now_playing과 동일한 패턴
-        old_message = cog.last_music_messages[guild_id]
+        # 나머지: 패널 편집 (스케줄러가 합쳐서 편집)
+        panel_scheduler.request(bot, guild_id, user_id)
 
-        from tapi.modules.music_views import MusicControlLayout
-
-        control_layout = MusicControlLayout(cog, guild_id)
-
-        requester_id = player.current.requester if player.current else user_id
-        user_locale = cog.user_locales.get(requester_id, "en")
-        fake_interaction = FakeInteraction(requester_id, guild_id, user_locale)
-        control_layout.build_layout(fake_interaction, player)
-
-        await old_message.edit(view=control_layout)
-
-    except (discord.NotFound, discord.Forbidden):
-        # 메시지가 삭제되었거나 권한 없음 → stale 참조 제거
-        cog = bot.get_cog("Music")
-        if cog and hasattr(cog, "last_music_messages"):
-            cog.last_music_messages.pop(guild_id, None)
-    except discord.HTTPException:
-        pass
     except Exception as e:
         LOGGER.debug(f"Error syncing discord message for web command '{command}': {e}")
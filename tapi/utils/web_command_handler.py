@@ -1,8 +1,9 @@
 """웹 대시보드에서 전달된 명령을 처리합니다."""
 
 from tapi import LOGGER
-from tapi.utils.database import Database
+from tapi.utils.database import AsyncDatabase
 from tapi.utils.embed import get_track_thumbnail
+from tapi.utils.track_cache import track_cache
 
 
 def validate_user_in_voice(bot, guild_id: int, user_id: int):
@@ -102,7 +103,7 @@ async def handle_skip(bot, guild_id: int, user_id: int, **_params):
     player = bot.lavalink.player_manager.get(guild_id)
     if player.loop == 1:
         player.set_loop(2)
-        Database().set_loop(guild_id, 2)
+        await AsyncDatabase().set_loop(guild_id, 2)
     await player.skip()
     return {"success": True}
 
@@ -124,7 +125,7 @@ async def handle_skip_to(bot, guild_id: int, user_id: int, index: int = 0, **_pa
     # 반복 모드가 한곡반복이면 전체반복으로 변경
     if player.loop == 1:
         player.set_loop(2)
-        Database().set_loop(guild_id, 2)
+        await AsyncDatabase().set_loop(guild_id, 2)
     await player.play(track)
     return {"success": True}
 
@@ -149,7 +150,7 @@ async def handle_volume(bot, guild_id: int, user_id: int, volume: int = 50, **_p
     player = bot.lavalink.player_manager.get(guild_id)
     volume = max(0, min(100, volume))
     await player.set_volume(volume)
-    Database().set_volume(guild_id, volume)
+    await AsyncDatabase().set_volume(guild_id, volume)
     return {"success": True, "data": {"volume": volume}}
 
 
@@ -161,7 +162,7 @@ async def handle_repeat(bot, guild_id: int, user_id: int, **_params):
     player = bot.lavalink.player_manager.get(guild_id)
     new_loop = (player.loop + 1) % 3
     player.set_loop(new_loop)
-    Database().set_loop(guild_id, new_loop)
+    await AsyncDatabase().set_loop(guild_id, new_loop)
     return {"success": True, "data": {"loop": new_loop}}
 
 
@@ -172,7 +173,7 @@ async def handle_shuffle(bot, guild_id: int, user_id: int, **_params):
 
     player = bot.lavalink.player_manager.get(guild_id)
     player.set_shuffle(not player.shuffle)
-    Database().set_shuffle(guild_id, player.shuffle)
+    await AsyncDatabase().set_shuffle(guild_id, player.shuffle)
     return {"success": True, "data": {"shuffle": player.shuffle}}
 
 
@@ -185,7 +186,7 @@ async def handle_search(bot, guild_id: int, user_id: int, query: str = "", **_pa
     if not query:
         return {"success": False, "error": "No query provided"}
 
-    results = await player.node.get_tracks(f"ytsearch:{query}")
+    results = await track_cache.get_tracks(player.node, f"ytsearch:{query}")
     if not results or not results.tracks:
         return {"success": False, "error": "No results found"}
 
@@ -237,7 +238,7 @@ async def handle_play(bot, guild_id: int, user_id: int, query: str = "", **_para
     if not query.startswith("http"):
         query = f"ytsearch:{query}"
 
-    results = await player.node.get_tracks(query)
+    results = await track_cache.get_tracks(player.node, query)
     if not results or not results.tracks:
         return {"success": False, "error": "No results found"}
 
@@ -316,8 +317,12 @@ async def handle_seek(bot, guild_id: int, user_id: int, position: int = 0, **_pa
 
 async def handle_get_state(bot, guild_id: int, user_id: int, **_params):
     """플레이어 상태를 반환합니다 (voice 검증 불필요)."""
+    from tapi.utils.redis_manager import redis_manager
+
     state = get_player_state(bot, guild_id)
-    return {"success": True, "data": state}
+    # 현재 상태를 발행해 새 기준으로 삼아야 이후 bot:player_update 델타를 이어 붙일 수 있다
+    version = await redis_manager.publish_player_update(guild_id, "get_state", state)
+    return {"success": True, "data": {**state, "v": version}}
 
 
 async def handle_recommend(bot, guild_id: int, user_id: int, **_params):
@@ -333,7 +338,7 @@ async def handle_recommend(bot, guild_id: int, user_id: int, **_params):
     mix_url = f"https://www.youtube.com/watch?v={video_id}&list=RD{video_id}"
 
     try:
-        results = await player.node.get_tracks(mix_url)
+        results = await track_cache.get_tracks(player.node, mix_url)
         if not results or not results.tracks:
             return {"success": False, "error": "No recommendations found"}
 
@@ -378,7 +383,7 @@ async def handle_resolve_track(
 
     node = nodes[0]
     try:
-        results = await node.get_tracks(url)
+        results = await track_cache.get_tracks(node, url)
         if not results or not results.tracks:
             return {"success": False, "error": "No tracks found"}
 
@@ -392,6 +397,7 @@ async def handle_resolve_track(
                 "duration": track.duration,
                 "identifier": track.identifier,
                 "source_name": getattr(track, "source_name", "unknown"),
+                "encoded": track.track,
             },
         }
     except Exception as e: